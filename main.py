@@ -1,13 +1,14 @@
-from src.game.env import SnakeEnv
+from src.game.wrappers import make_env
 from src.agent.agents import RandomSnakeAgent, DQNSnakeAgent
 from src.config import config as app_config
 from src.utils.logger import logger
 
 
 def main():
-    env = SnakeEnv(app_config)
+    env = make_env(app_config)
     # agent = RandomSnakeAgent(app_config)
     agent = DQNSnakeAgent(app_config)
+    env.set_observation_buffers(agent.make_observation_buffers(env.unwrapped.observation_space))
     training_config = app_config.get_training_config()
     model_config = app_config.get_model_config()
     max_episodes = training_config["MAX_TRAINING_EPISODES"]
@@ -22,22 +23,28 @@ def main():
         episode_reward = 0
         steps = 0
         logger.info(f"Episode {episode}/{max_episodes}")
-        logger.debug(f"Initial state: {info}")
+        logger.debug("Initial state: {}", info)
         
-        for step in range(1, max_steps_per_episode + 1):
+        # Steps count game ticks, an agent decision covers ACTION_REPEAT of them
+        decision = 0
+        while steps < max_steps_per_episode:
+            decision += 1
             action = agent.select_action(obs, episode)
-            obs, reward, terminated, truncated, info = env.step(action)
+            next_obs, reward, terminated, truncated, info = env.step(action)
+            agent.on_step(obs, action, reward, next_obs, terminated)
+            obs = next_obs
             episode_reward += reward
-            steps += 1
+            steps += info.get("ticks", 1)
             
             loss = agent.optimize_model()
-            if loss is not None and step % training_config["PRINT_LOSS_EVERY"] == 0:
-                logger.info(f"Step {step}, Loss: {loss:.4f}, Epsilon: {agent.current_epsilon:.4f}")
+            if loss is not None and decision % training_config["PRINT_LOSS_EVERY"] == 0:
+                logger.info(f"Step {steps}, Loss: {loss:.4f}, Epsilon: {agent.current_epsilon:.4f}")
                 
             env.render()
             if terminated or truncated:
                 break
                 
+        agent.on_episode_end(episode)
         total_rewards.append(episode_reward)
         episode_lengths.append(steps)
         
@@ -46,7 +53,7 @@ def main():
         
         logger.info(f"Episode {episode} finished after {steps} steps")
         logger.info(f"Total reward: {episode_reward}")
-        logger.debug(f"Final state: {info}")
+        logger.debug("Final state: {}", info)
         
         if episode % episodes_per_checkpoint == 0:
             logger.info(f"Saving checkpoint at episode {episode}")
@@ -58,6 +65,7 @@ def main():
     logger.info(f"Average episode length: {sum(episode_lengths) / len(episode_lengths):.2f}")
     logger.info(f"Max reward: {max(total_rewards):.2f}")
     logger.info(f"Max episode length: {max(episode_lengths)}")
+    agent.close()
     env.close()
 
 
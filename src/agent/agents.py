@@ -1,17 +1,25 @@
 import random
 import os
 from abc import ABC, abstractmethod
-from typing import Optional
+from typing import Optional, List
 from datetime import datetime
 import numpy as np
 import pandas as pd
 import torch
 import torch.nn as nn
 import torch.optim as optim
+from gym import spaces
 from src.agent.models import ConvDQN
-from src.agent.replay_buffer import ReplayBuffer, Transition
+from src.agent.replay_buffer import (ArrayReplayBuffer, FrameReplayBuffer, MemmapReplayBuffer,
+                                     PrioritizedArrayReplayBuffer, PrioritizedFrameReplayBuffer,
+                                     PrioritizedMemmapReplayBuffer)
 from src.config import ConfigManager
-from src.utils.logger import logger
+from src.game.observation import model_input_shape
+from src.utils.logger import logger, DebugSampler
+
+
+# Per-step debug output is sampled, and skipped outright unless this module logs at DEBUG
+_step_debug = DebugSampler(__name__)
 
 
 class BaseSnakeAgent(ABC):
@@ -109,8 +117,7 @@ class DQNSnakeAgent(BaseSnakeAgent):
             'epsilon_values': []
         }
         
-        image_height, image_width = self.model_config["IMAGE_INPUT_SIZE"]
-        input_shape = (3, image_height, image_width)
+        input_shape = model_input_shape(self.model_config, self.config.get_ui_config())
         
         self.policy_net = ConvDQN(num_classes=self.action_space_n, input_shape=input_shape).to(self.device)
         self.target_net = ConvDQN(num_classes=self.action_space_n, input_shape=input_shape).to(self.device)
@@ -127,7 +134,35 @@ class DQNSnakeAgent(BaseSnakeAgent):
         if not os.path.exists(self.metrics_dir):
             os.makedirs(self.metrics_dir)
         
-        self.memory = ReplayBuffer(self.train_config["REPLAY_MEMORY_SIZE"])
+        # Observations are stored in the env's dtype: uint8 images, float32 grid planes
+        observation_dtype = np.float32 if self.model_config.get("OBSERVATION_MODE", "RGB") == "GRID" else np.uint8
+        buffer_kwargs = dict(observation_shape=input_shape, observation_dtype=observation_dtype, device=self.device,
+                             n_step=self.train_config.get("N_STEP", 1), gamma=self.train_config["GAMMA"])
+        prioritized = self.train_config.get("PRIORITIZED_REPLAY", False)
+        if prioritized:
+            buffer_kwargs.update(alpha=self.train_config.get("PER_ALPHA", 0.6),
+                                 beta_start=self.train_config.get("PER_BETA_START", 0.4),
+                                 beta_steps=self.train_config.get("PER_BETA_STEPS", 100_000))
+        replay_buffer = self.train_config.get("REPLAY_BUFFER", "ARRAY")
+        frame_stack = self.model_config.get("FRAME_STACK", 1)
+        if frame_stack > 1 and replay_buffer == "ARRAY":
+            # ARRAY would copy 2 x FRAME_STACK frames per transition, FRAME keeps one per step
+            logger.info("FRAME_STACK is {}, storing replay frames once with the FRAME buffer", frame_stack)
+            replay_buffer = "FRAME"
+        elif frame_stack > 1 and replay_buffer == "MEMMAP":
+            logger.warning("The MEMMAP buffer stores all {} stacked frames of the state and the next state "
+                           "of every transition", frame_stack)
+        if replay_buffer == "FRAME":
+            # Every frame once, in episode order; stacks and next states are rebuilt when sampling
+            buffer_class = PrioritizedFrameReplayBuffer if prioritized else FrameReplayBuffer
+            buffer_kwargs["frame_stack"] = frame_stack
+        elif replay_buffer == "MEMMAP":
+            # On disk, resumed from an earlier run in the same folder
+            buffer_class = PrioritizedMemmapReplayBuffer if prioritized else MemmapReplayBuffer
+            buffer_kwargs["folder"] = self.data_config["REPLAY_FOLDER_PATH"]
+        else:
+            buffer_class = PrioritizedArrayReplayBuffer if prioritized else ArrayReplayBuffer
+        self.memory = buffer_class(self.train_config["REPLAY_MEMORY_SIZE"], **buffer_kwargs)
         
         self.batch_size = self.train_config["BATCH_SIZE"]
         self.gamma = self.train_config["GAMMA"]
@@ -139,6 +174,25 @@ class DQNSnakeAgent(BaseSnakeAgent):
         self.steps_done = 0
         self.current_epsilon = self.epsilon_start
     
+    def make_observation_buffers(self, observation_space: spaces.Box, count: int = 2) -> List[np.ndarray]:
+        """
+        Preallocates observation arrays for ``SnakeEnv.set_observation_buffers``.
+        Each array shares memory with a torch tensor (pinned when training on
+        CUDA), so ``select_action`` wraps it without copying.
+        Args:
+            observation_space: The env's observation space
+            count: Number of buffers the env cycles through
+        Returns:
+            List[np.ndarray]: Contiguous CHW arrays backed by torch tensors
+        """
+        buffers = []
+        for _ in range(count):
+            tensor = torch.from_numpy(np.zeros(observation_space.shape, dtype=observation_space.dtype))
+            if self.device.type == "cuda":
+                tensor = tensor.pin_memory()
+            buffers.append(tensor.numpy())
+        return buffers
+    
     def select_action(self, state: np.ndarray, episode: int) -> int:
         if episode <= 1:
             self.current_epsilon = self.epsilon_start
@@ -150,17 +204,21 @@ class DQNSnakeAgent(BaseSnakeAgent):
         
         self.steps_done += 1
         
-        logger.debug(f"State shape: {state.shape}, Epsilon: {self.current_epsilon:.4f}, Steps: {self.steps_done}")
+        log_step = _step_debug()
+        if log_step:
+            logger.debug("State shape: {}, Epsilon: {:.4f}, Steps: {}", state.shape, self.current_epsilon, self.steps_done)
         
         if random.random() > self.current_epsilon:
             try:
                 with torch.no_grad():
-                    state_tensor = torch.FloatTensor(state).unsqueeze(0).to(self.device)
-                    logger.debug(f"Input tensor shape: {state_tensor.shape}")
+                    # from_numpy shares the observation buffer, only the dtype cast copies
+                    state_tensor = torch.from_numpy(np.ascontiguousarray(state)).to(
+                        self.device, non_blocking=True).unsqueeze(0).float()
                     q_values = self.policy_net(state_tensor)
-                    logger.debug(f"Q-values: {q_values}")
                     action = q_values.max(1)[1].item()
-                    logger.debug(f"Selected action (exploit): {action}")
+                    if log_step:
+                        logger.opt(lazy=True).debug("Q-values: {}, selected action (exploit): {}",
+                                                    lambda: q_values.squeeze(0).tolist(), lambda: action)
                     return action
             except Exception as e:
                 logger.error(f"Error in action selection: {e}")
@@ -169,7 +227,8 @@ class DQNSnakeAgent(BaseSnakeAgent):
                 return action
         else:
             action = random.randrange(self.action_space_n)
-            logger.debug(f"Selected action (explore): {action}")
+            if log_step:
+                logger.debug("Selected action (explore): {}", action)
             return action
     
     def on_step(self, 
@@ -178,47 +237,36 @@ class DQNSnakeAgent(BaseSnakeAgent):
                 reward: float, 
                 next_state: np.ndarray, 
                 done: bool) -> None:
-        state_tensor = torch.FloatTensor(state).to(self.device)
-        next_state_tensor = torch.FloatTensor(next_state).to(self.device) if not done else None
-        action_tensor = torch.tensor([action], device=self.device)
-        reward_tensor = torch.tensor([reward], device=self.device, dtype=torch.float32)
-        self.memory.push(state_tensor, action_tensor, next_state_tensor, reward_tensor)
-        self.optimize_model()
+        # Copied into the buffer's preallocated arrays, so the env may reuse its observation buffers
+        self.memory.push(state, action, next_state, reward, done)
     
     def optimize_model(self) -> Optional[float]:
         if len(self.memory) < self.batch_size:
             return None
         
-        transitions = self.memory.sample(self.batch_size)
-        batch = Transition(*zip(*transitions))
-        
-        non_final_mask = torch.tensor(
-            tuple(map(lambda s: s is not None, batch.next_state)),
-            device=self.device, 
-            dtype=torch.bool
-        )
-        
-        non_final_next_states = torch.cat([s for s in batch.next_state if s is not None])
+        batch = self.memory.sample(self.batch_size)
         
-        state_batch = torch.cat(batch.state).to(self.device)
-        action_batch = torch.cat(batch.action).to(self.device)
-        reward_batch = torch.cat(batch.reward).to(self.device)
+        state_action_values = self.policy_net(batch.states).gather(1, batch.actions.unsqueeze(1))
         
+        # Terminal transitions do not bootstrap
         with torch.no_grad():
-            state_action_values = self.policy_net(state_batch).gather(1, action_batch.unsqueeze(1))
+            next_state_values = self.target_net(batch.next_states).max(1)[0]
+        next_state_values = next_state_values.masked_fill(batch.dones, 0.0)
         
-        next_state_values = torch.zeros(self.batch_size, device=self.device)
-        if non_final_next_states.size(0) > 0:
-            with torch.no_grad():
-                next_state_values[non_final_mask] = self.target_net(non_final_next_states).max(1)[0]
+        # n-step batches bootstrap with gamma ** (steps taken), shorter where the episode ended early
+        discounts = batch.discounts if batch.discounts is not None else self.gamma
+        expected_state_action_values = (next_state_values * discounts) + batch.rewards
         
-        expected_state_action_values = (next_state_values * self.gamma) + reward_batch
-        
-        criterion = nn.SmoothL1Loss()
-        loss = criterion(
+        criterion = nn.SmoothL1Loss(reduction="none")
+        losses = criterion(
             state_action_values, 
             expected_state_action_values.unsqueeze(1)
-        )
+        ).squeeze(1)
+        # Prioritized batches correct their sampling bias with importance-sampling weights
+        loss = (losses * batch.weights).mean() if batch.weights is not None else losses.mean()
+        if batch.indices is not None:
+            td_errors = (expected_state_action_values - state_action_values.squeeze(1)).detach()
+            self.memory.update_priorities(batch.indices, td_errors.cpu().numpy())
         
         self.optimizer.zero_grad()
         loss.backward()
@@ -235,7 +283,11 @@ class DQNSnakeAgent(BaseSnakeAgent):
     def update_target_network(self) -> None:
         self.target_net.load_state_dict(self.policy_net.state_dict())
     
+    def close(self) -> None:
+        self.memory.close()
+
     def on_episode_end(self, episode: int) -> None:
+        self.memory.end_episode()
         if episode % self.target_update_frequency == 0:
             self.update_target_network()
             logger.info(f"Target network updated at episode {episode}")
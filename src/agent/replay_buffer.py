@@ -1,5 +1,12 @@
 import random
 import collections
+import json
+import os
+from pathlib import Path
+from typing import Optional, Any, Tuple, NamedTuple, Union
+import numpy as np
+import torch
+from src.utils.lazy_frames import LazyFrames
 
 
 Transition = collections.namedtuple('Transition',
@@ -18,4 +25,518 @@ class ReplayBuffer:
         return random.sample(self.memory, batch_size)
 
     def __len__(self):
-        return len(self.memory)
\ No newline at end of file
+        return len(self.memory)
+
+
+def _write_observation(row: np.ndarray, observation) -> None:
+    if isinstance(observation, LazyFrames):
+        observation.copy_to(row)
+    else:
+        row[...] = observation
+
+
+class ReplayBatch(NamedTuple):
+    """A sampled batch, as tensors on the training device."""
+    states: torch.Tensor
+    actions: torch.Tensor
+    rewards: torch.Tensor
+    next_states: torch.Tensor
+    dones: torch.Tensor
+    # Prioritized buffers only: importance-sampling weights and the sampled slots
+    weights: Optional[torch.Tensor] = None
+    indices: Optional[np.ndarray] = None
+    # n-step buffers only: discount of each next state, gamma ** (steps summed into the reward)
+    discounts: Optional[torch.Tensor] = None
+
+
+class ArrayReplayBuffer:
+    """
+    Transitions in preallocated contiguous arrays, written at a circular index.
+    Observations keep their dtype (uint8 for RGB images), so a frame takes a
+    quarter of the memory of a float32 tensor. Terminal transitions are
+    flagged in ``dones``; their next state row is zeroed.
+
+    ``sample`` draws indices uniformly (with replacement) and gathers the
+    whole batch with one fancy-indexing copy per array.
+
+    With ``n_step`` > 1 a sampled transition is followed through the next
+    pushes of its episode: its reward becomes the ``gamma``-discounted sum
+    of up to ``n_step`` rewards and its next state that of the last one.
+    Episodes end at terminal transitions, at ``end_episode`` and at the
+    newest push, so call ``end_episode`` after a truncated episode.
+    """
+    def __init__(self,
+                 capacity: int,
+                 observation_shape: Tuple[int, ...],
+                 observation_dtype: Any = np.uint8,
+                 device: Union[str, torch.device] = "cpu",
+                 seed: Optional[int] = None,
+                 n_step: int = 1,
+                 gamma: float = 0.99):
+        if n_step < 1:
+            raise ValueError(f"n_step must be at least 1, got {n_step}")
+        self.capacity = capacity
+        self.device = torch.device(device)
+        self.rng = np.random.default_rng(seed)
+        self.n_step = n_step
+        self.gamma = gamma
+        self._next_idx = 0
+        self._size = 0
+        self._allocate(tuple(observation_shape), np.dtype(observation_dtype))
+
+    def _allocate(self, observation_shape: Tuple[int, ...], observation_dtype: np.dtype) -> None:
+        # np.zeros leaves pages unmapped until they are written
+        self.states = np.zeros((self.capacity, *observation_shape), dtype=observation_dtype)
+        self.next_states = np.zeros((self.capacity, *observation_shape), dtype=observation_dtype)
+        self.actions = np.zeros(self.capacity, dtype=np.int64)
+        self.rewards = np.zeros(self.capacity, dtype=np.float32)
+        self.dones = np.zeros(self.capacity, dtype=bool)
+        self.episode_ends = np.zeros(self.capacity, dtype=bool)
+
+    def push(self, state, action: int, next_state, reward: float, done: bool) -> None:
+        """Save a transition. ``next_state`` may be ``None`` when ``done``."""
+        i = self._next_idx
+        self.episode_ends[i] = False
+        _write_observation(self.states[i], state)
+        if done or next_state is None:
+            self.next_states[i] = 0
+        else:
+            _write_observation(self.next_states[i], next_state)
+        self.actions[i] = action
+        self.rewards[i] = reward
+        self.dones[i] = done
+        self._next_idx = (i + 1) % self.capacity
+        self._size = min(self._size + 1, self.capacity)
+        self._on_transition(i)
+
+    def _on_transition(self, slot: int) -> None:
+        """Called when ``slot`` receives a new transition."""
+
+    def _on_invalidate(self, slots: np.ndarray) -> None:
+        """Called when ``slots`` stop holding sampleable transitions."""
+
+    def end_episode(self) -> None:
+        """Called between episodes, so n-step returns do not run into the next one."""
+        if self._size:
+            self.episode_ends[(self._next_idx - 1) % self.capacity] = True
+
+    def occupied_slots(self) -> np.ndarray:
+        """Slots holding sampleable transitions."""
+        return np.arange(self._size)
+
+    def close(self) -> None:
+        """Called when training ends, for buffers backed by files."""
+
+    def sample_indices(self, batch_size: int) -> np.ndarray:
+        return self.rng.integers(0, self._size, size=batch_size)
+
+    def _to_device(self, array: np.ndarray, dtype: torch.dtype) -> torch.Tensor:
+        return torch.from_numpy(array).to(self.device, non_blocking=True).to(dtype)
+
+    def _successors(self, slots: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Slots of the transitions that follow ``slots``, and whether their episode goes on there."""
+        successors = (slots + 1) % self.capacity
+        newest = (self._next_idx - 1) % self.capacity
+        return successors, ~self.dones[slots] & ~self.episode_ends[slots] & (slots != newest)
+
+    def _n_step(self, indices: np.ndarray) -> Tuple[np.ndarray, np.ndarray, Optional[np.ndarray]]:
+        """
+        Follows the whole batch up to ``n_step - 1`` transitions ahead at once.
+        Returns:
+            Tuple: Slot of the last transition, discounted reward sum and
+            discount of the bootstrap (None for one-step returns)
+        """
+        rewards = self.rewards[indices].astype(np.float32)
+        if self.n_step == 1:
+            return indices, rewards, None
+        last = indices
+        discounts = np.full(len(indices), self.gamma, dtype=np.float32)
+        active = np.ones(len(indices), dtype=bool)
+        for _ in range(self.n_step - 1):
+            successors, continues = self._successors(last)
+            active &= continues
+            if not active.any():
+                break
+            last = np.where(active, successors, last)
+            rewards += np.where(active, discounts * self.rewards[successors], 0.0).astype(np.float32)
+            discounts = np.where(active, discounts * self.gamma, discounts).astype(np.float32)
+        return last, rewards, discounts
+
+    def _discounts_to_device(self, discounts: Optional[np.ndarray]) -> Optional[torch.Tensor]:
+        return None if discounts is None else self._to_device(discounts, torch.float32)
+
+    def gather(self, indices: np.ndarray) -> ReplayBatch:
+        last, rewards, discounts = self._n_step(indices)
+        return ReplayBatch(states=self._to_device(self.states[indices], torch.float32),
+                           actions=self._to_device(self.actions[indices], torch.int64),
+                           rewards=self._to_device(rewards, torch.float32),
+                           next_states=self._to_device(self.next_states[last], torch.float32),
+                           dones=self._to_device(self.dones[last], torch.bool),
+                           discounts=self._discounts_to_device(discounts))
+
+    def sample(self, batch_size: int) -> ReplayBatch:
+        return self.gather(self.sample_indices(batch_size))
+
+    def __len__(self) -> int:
+        return self._size
+
+
+class FrameReplayBuffer(ArrayReplayBuffer):
+    """
+    Replay storage that keeps every observed frame once, in episode order,
+    and rebuilds ``(s, a, r, s', done)`` from indices at sample time: the
+    next state of slot ``i`` is the frame in slot ``i + 1``. With
+    ``frame_stack`` > 1 only the newest frame of each stacked observation is
+    stored and stacks are rebuilt from the preceding slots, repeating an
+    episode's first frame like ``FrameStack`` does after a reset.
+
+    A push continues the stored episode when its ``state`` is the previous
+    push's ``next_state`` object (as in a plain ``obs = next_obs`` loop);
+    otherwise it starts a new episode segment. Terminal transitions store no
+    next frame and sample a zero next state. Slots whose frame history was
+    overwritten by the circular write index are never sampled.
+    """
+    def __init__(self,
+                 capacity: int,
+                 observation_shape: Tuple[int, ...],
+                 observation_dtype: Any = np.uint8,
+                 device: Union[str, torch.device] = "cpu",
+                 seed: Optional[int] = None,
+                 frame_stack: int = 1,
+                 n_step: int = 1,
+                 gamma: float = 0.99):
+        channels, *rest = observation_shape
+        if channels % frame_stack:
+            raise ValueError(f"{channels} observation channels cannot hold {frame_stack} stacked frames")
+        if capacity <= frame_stack:
+            raise ValueError(f"Capacity must exceed the frame stack depth {frame_stack}, got {capacity}")
+        if n_step < 1:
+            raise ValueError(f"n_step must be at least 1, got {n_step}")
+        self.capacity = capacity
+        self.device = torch.device(device)
+        self.rng = np.random.default_rng(seed)
+        self.n_step = n_step
+        self.gamma = gamma
+        self.frame_stack = frame_stack
+        self.frame_channels = channels // frame_stack
+        self.frames = np.zeros((capacity, self.frame_channels, *rest), dtype=observation_dtype)
+        self.actions = np.zeros(capacity, dtype=np.int64)
+        self.rewards = np.zeros(capacity, dtype=np.float32)
+        self.dones = np.zeros(capacity, dtype=bool)
+        # episode_starts: first frame of an episode segment; valid: slot holds a sampleable transition
+        self.episode_starts = np.zeros(capacity, dtype=bool)
+        self.valid = np.zeros(capacity, dtype=bool)
+        self._next_idx = 0
+        self._size = 0
+        self._filled = 0
+        self._last_next_state = None
+        self._pending_idx: Optional[int] = None
+
+    def _newest_frame(self, observation) -> np.ndarray:
+        if isinstance(observation, LazyFrames):
+            return observation.frames[-1]
+        return np.asarray(observation)[-self.frame_channels:]
+
+    def _write_frame(self, observation, episode_start: bool) -> int:
+        i = self._next_idx
+        # The new frame breaks the stack history of the next frame_stack slots
+        stale = (i + np.arange(self.frame_stack)) % self.capacity
+        self._size -= int(self.valid[stale].sum())
+        self.valid[stale] = False
+        self._on_invalidate(stale)
+        self.frames[i] = self._newest_frame(observation)
+        self.episode_starts[i] = episode_start
+        self._next_idx = (i + 1) % self.capacity
+        self._filled = min(self._filled + 1, self.capacity)
+        return i
+
+    def push(self, state, action: int, next_state, reward: float, done: bool) -> None:
+        """Save a transition. ``next_state`` may be ``None`` when ``done``."""
+        if self._pending_idx is not None and state is self._last_next_state:
+            i = self._pending_idx
+        else:
+            i = self._write_frame(state, episode_start=True)
+        self.actions[i] = action
+        self.rewards[i] = reward
+        self.dones[i] = done
+        if done or next_state is None:
+            self._pending_idx = self._last_next_state = None
+        else:
+            self._pending_idx = self._write_frame(next_state, episode_start=False)
+            self._last_next_state = next_state
+        self.valid[i] = True
+        self._size += 1
+        self._on_transition(i)
+
+    def end_episode(self) -> None:
+        # The next push starts a new segment even if its state object happens to be reused
+        self._pending_idx = self._last_next_state = None
+
+    def occupied_slots(self) -> np.ndarray:
+        return np.nonzero(self.valid)[0]
+
+    def sample_indices(self, batch_size: int) -> np.ndarray:
+        if self._size == 0:
+            raise ValueError("Cannot sample from a replay buffer without complete transitions")
+        # Redraw the few slots that are pending or lost their frame history
+        indices = self.rng.integers(0, self._filled, size=batch_size)
+        invalid = ~self.valid[indices]
+        while invalid.any():
+            indices[invalid] = self.rng.integers(0, self._filled, size=int(invalid.sum()))
+            invalid = ~self.valid[indices]
+        return indices
+
+    def _stack_indices(self, indices: np.ndarray) -> np.ndarray:
+        """(B, frame_stack) frame slots, oldest first, stopping at episode starts."""
+        stacked = np.empty((len(indices), self.frame_stack), dtype=np.int64)
+        current = indices
+        stacked[:, -1] = current
+        for j in range(self.frame_stack - 2, -1, -1):
+            current = np.where(self.episode_starts[current], current, (current - 1) % self.capacity)
+            stacked[:, j] = current
+        return stacked
+
+    def _stacked_frames(self, indices: np.ndarray) -> np.ndarray:
+        frames = self.frames[self._stack_indices(indices)]
+        return frames.reshape(len(indices), self.frame_stack * self.frame_channels, *frames.shape[3:])
+
+    def _successors(self, slots: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        # The next frame of a transition is the state of the next one, unless the episode ended
+        successors = (slots + 1) % self.capacity
+        return successors, ~self.dones[slots] & self.valid[successors] & ~self.episode_starts[successors]
+
+    def gather(self, indices: np.ndarray) -> ReplayBatch:
+        last, rewards, discounts = self._n_step(indices)
+        dones = self.dones[last]
+        next_states = self._stacked_frames((last + 1) % self.capacity)
+        next_states[dones] = 0
+        return ReplayBatch(states=self._to_device(self._stacked_frames(indices), torch.float32),
+                           actions=self._to_device(self.actions[indices], torch.int64),
+                           rewards=self._to_device(rewards, torch.float32),
+                           next_states=self._to_device(next_states, torch.float32),
+                           dones=self._to_device(dones, torch.bool),
+                           discounts=self._discounts_to_device(discounts))
+
+
+class SumTree:
+    """
+    Binary sum tree over ``capacity`` non-negative priorities, in one flat
+    array (root at 1, leaves from ``leaf_offset``). Updates and prefix-sum
+    searches take whole batches and walk the ``log2(capacity)`` levels with
+    NumPy, so there is no Python work per transition.
+    """
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self.depth = max(int(np.ceil(np.log2(capacity))), 0)
+        self.leaf_offset = 1 << self.depth
+        self.nodes = np.zeros(2 * self.leaf_offset, dtype=np.float64)
+
+    @property
+    def total(self) -> float:
+        return float(self.nodes[1])
+
+    def get(self, indices: np.ndarray) -> np.ndarray:
+        return self.nodes[self.leaf_offset + np.asarray(indices)]
+
+    def update(self, indices: np.ndarray, priorities: np.ndarray) -> None:
+        positions = self.leaf_offset + np.asarray(indices, dtype=np.int64)
+        self.nodes[positions] = priorities
+        for _ in range(self.depth):
+            positions = np.unique(positions >> 1)
+            self.nodes[positions] = self.nodes[2 * positions] + self.nodes[2 * positions + 1]
+
+    def find(self, values: np.ndarray) -> np.ndarray:
+        """Leaf index of each prefix sum in ``values``, descending all of them level by level."""
+        values = np.array(values, dtype=np.float64)
+        positions = np.ones(len(values), dtype=np.int64)
+        for _ in range(self.depth):
+            left = 2 * positions
+            left_sums = self.nodes[left]
+            go_right = values > left_sums
+            values -= np.where(go_right, left_sums, 0.0)
+            positions = left + go_right
+        return np.minimum(positions - self.leaf_offset, self.capacity - 1)
+
+
+class PrioritizedReplayMixin:
+    """
+    Prioritized experience replay on top of a replay buffer's slots.
+
+    Each transition is sampled with probability ``p_i / sum(p)``, where
+    ``p_i = (|TD error| + epsilon) ** alpha`` is kept in a ``SumTree``. New
+    transitions get the largest priority seen so far. Sampling is stratified
+    over ``batch_size`` equal segments of the total. Batches carry
+    importance-sampling weights ``(N * P(i)) ** -beta`` normalized by the
+    batch maximum. ``beta`` anneals linearly from ``beta_start`` to 1 over
+    ``beta_steps`` sampled batches. ``update_priorities`` takes the batch's
+    indices and TD errors.
+    """
+    def __init__(self,
+                 *args,
+                 alpha: float = 0.6,
+                 beta_start: float = 0.4,
+                 beta_steps: int = 100_000,
+                 epsilon: float = 1e-6,
+                 **kwargs):
+        super().__init__(*args, **kwargs)
+        self.alpha = alpha
+        self.beta_start = beta_start
+        self.beta_steps = max(beta_steps, 1)
+        self.epsilon = epsilon
+        self.tree = SumTree(self.capacity)
+        self.max_priority = 1.0
+        self.samples_drawn = 0
+        # Transitions restored from disk start out equally likely
+        restored = self.occupied_slots()
+        if len(restored):
+            self.tree.update(restored, np.full(len(restored), self.max_priority))
+
+    @property
+    def beta(self) -> float:
+        return min(1.0, self.beta_start + (1.0 - self.beta_start) * self.samples_drawn / self.beta_steps)
+
+    def _on_transition(self, slot: int) -> None:
+        super()._on_transition(slot)
+        self.tree.update(np.array([slot]), np.array([self.max_priority]))
+
+    def _on_invalidate(self, slots: np.ndarray) -> None:
+        super()._on_invalidate(slots)
+        self.tree.update(slots, np.zeros(len(slots)))
+
+    def sample_indices(self, batch_size: int) -> np.ndarray:
+        if len(self) == 0:
+            raise ValueError("Cannot sample from an empty replay buffer")
+        total = self.tree.total
+        values = (np.arange(batch_size) + self.rng.random(batch_size)) * (total / batch_size)
+        indices = self.tree.find(values)
+        # Rounding can land on an empty leaf next to the sampled mass
+        empty = self.tree.get(indices) <= 0
+        while empty.any():
+            indices[empty] = self.tree.find(self.rng.random(int(empty.sum())) * total)
+            empty = self.tree.get(indices) <= 0
+        return indices
+
+    def sample(self, batch_size: int) -> ReplayBatch:
+        indices = self.sample_indices(batch_size)
+        probabilities = self.tree.get(indices) / self.tree.total
+        weights = (len(self) * probabilities) ** -self.beta
+        weights /= weights.max()
+        self.samples_drawn += 1
+        return self.gather(indices)._replace(weights=self._to_device(weights.astype(np.float32), torch.float32),
+                                             indices=indices)
+
+    def update_priorities(self, indices: np.ndarray, td_errors: np.ndarray) -> None:
+        priorities = (np.abs(td_errors) + self.epsilon) ** self.alpha
+        self.tree.update(indices, priorities)
+        self.max_priority = max(self.max_priority, float(priorities.max()))
+
+
+class PrioritizedArrayReplayBuffer(PrioritizedReplayMixin, ArrayReplayBuffer):
+    """``ArrayReplayBuffer`` with prioritized sampling."""
+
+
+class PrioritizedFrameReplayBuffer(PrioritizedReplayMixin, FrameReplayBuffer):
+    """``FrameReplayBuffer`` with prioritized sampling."""
+
+
+class MemmapReplayBuffer(ArrayReplayBuffer):
+    """
+    ``ArrayReplayBuffer`` whose transitions live in a memory-mapped file, so
+    its capacity is bounded by disk space instead of RAM and it survives
+    restarts.
+
+    ``folder`` holds ``transitions.npy``, one fixed-size record per slot
+    (state, next state, action, reward, done, episode end), and ``metadata.json`` with the
+    write index and size. Reopening a folder with the same capacity and
+    observation layout resumes the buffer; a different layout raises
+    ``ValueError`` rather than overwriting it. The OS page cache decides
+    what stays in memory. A sampled batch is read in slot order, so
+    neighbouring records share page reads, and each transition is one
+    contiguous record. The metadata is saved at the end of every episode
+    and on ``close``; transitions pushed since are not counted after a
+    restart.
+    """
+    RECORDS_FILE = "transitions.npy"
+    METADATA_FILE = "metadata.json"
+    VERSION = 1
+
+    def __init__(self,
+                 capacity: int,
+                 observation_shape: Tuple[int, ...],
+                 observation_dtype: Any = np.uint8,
+                 device: Union[str, torch.device] = "cpu",
+                 seed: Optional[int] = None,
+                 n_step: int = 1,
+                 gamma: float = 0.99,
+                 folder: Union[str, Path] = "replay"):
+        self.folder = Path(folder)
+        super().__init__(capacity, observation_shape, observation_dtype, device, seed, n_step, gamma)
+
+    def _allocate(self, observation_shape: Tuple[int, ...], observation_dtype: np.dtype) -> None:
+        record = np.dtype([("state", observation_dtype, observation_shape),
+                           ("next_state", observation_dtype, observation_shape),
+                           ("action", np.int64),
+                           ("reward", np.float32),
+                           ("done", np.bool_),
+                           ("episode_end", np.bool_)], align=True)
+        self.folder.mkdir(parents=True, exist_ok=True)
+        records_path = self.folder / self.RECORDS_FILE
+        metadata_path = self.folder / self.METADATA_FILE
+        if records_path.exists() and metadata_path.exists():
+            self.records = np.lib.format.open_memmap(records_path, mode="r+")
+            if self.records.shape != (self.capacity,) or self.records.dtype != record:
+                raise ValueError(f"{records_path} holds {self.records.shape[0]} transitions of "
+                                 f"{self.records.dtype}, expected {self.capacity} of {record}; "
+                                 f"use another folder or delete it")
+            metadata = json.loads(metadata_path.read_text())
+            self._next_idx, self._size = metadata["next_idx"], metadata["size"]
+        else:
+            # The file is sparse until records are written
+            self.records = np.lib.format.open_memmap(records_path, mode="w+", dtype=record, shape=(self.capacity,))
+            self.save_metadata()
+        # Field views, so push writes straight into the mapped records
+        self.states = self.records["state"]
+        self.next_states = self.records["next_state"]
+        self.actions = self.records["action"]
+        self.rewards = self.records["reward"]
+        self.dones = self.records["done"]
+        self.episode_ends = self.records["episode_end"]
+
+    def save_metadata(self) -> None:
+        path = self.folder / self.METADATA_FILE
+        tmp_path = path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps({"version": self.VERSION, "capacity": self.capacity,
+                                        "next_idx": self._next_idx, "size": self._size}))
+        os.replace(tmp_path, path)
+
+    def end_episode(self) -> None:
+        super().end_episode()
+        self.save_metadata()
+
+    def _read(self, indices: np.ndarray) -> np.ndarray:
+        """Records at ``indices``, read in slot order."""
+        order = np.argsort(indices, kind="stable")
+        rows = np.empty(len(indices), dtype=self.records.dtype)
+        rows[order] = self.records[indices[order]]
+        return rows
+
+    def gather(self, indices: np.ndarray) -> ReplayBatch:
+        last, rewards, discounts = self._n_step(indices)
+        rows = self._read(indices)
+        last_rows = rows if last is indices else self._read(last)
+        return ReplayBatch(states=self._to_device(np.ascontiguousarray(rows["state"]), torch.float32),
+                           actions=self._to_device(np.ascontiguousarray(rows["action"]), torch.int64),
+                           rewards=self._to_device(rewards, torch.float32),
+                           next_states=self._to_device(np.ascontiguousarray(last_rows["next_state"]), torch.float32),
+                           dones=self._to_device(np.ascontiguousarray(last_rows["done"]), torch.bool),
+                           discounts=self._discounts_to_device(discounts))
+
+    def close(self) -> None:
+        """Writes pending records and the metadata to disk."""
+        super().close()
+        self.records.flush()
+        self.save_metadata()
+
+
+class PrioritizedMemmapReplayBuffer(PrioritizedReplayMixin, MemmapReplayBuffer):
+    """``MemmapReplayBuffer`` with prioritized sampling; priorities are kept in memory."""
@@ -29,19 +29,22 @@ class ConfigManager:
         cls.data_config["MODEL_DATA_FOLDER_PATH"] = Path(cls.data_config["MODEL_DATA_FOLDER_PATH"])
         cls.data_config["SCORES_FILE_PATH"] = Path(cls.data_config["SCORES_FILE_PATH"])
         cls.data_config["HIGH_SCORE_FILE_PATH"] = Path(cls.data_config["HIGH_SCORE_FILE_PATH"])
+        if cls.data_config.get("RECORDINGS_FOLDER_PATH"):
+            cls.data_config["RECORDINGS_FOLDER_PATH"] = Path(cls.data_config["RECORDINGS_FOLDER_PATH"])
+        if cls.data_config.get("VIDEOS_FOLDER_PATH"):
+            cls.data_config["VIDEOS_FOLDER_PATH"] = Path(cls.data_config["VIDEOS_FOLDER_PATH"])
+        if cls.data_config.get("REPLAY_FOLDER_PATH"):
+            cls.data_config["REPLAY_FOLDER_PATH"] = Path(cls.data_config["REPLAY_FOLDER_PATH"])
+        if cls.data_config.get("RESULTS_DB_PATH"):
+            cls.data_config["RESULTS_DB_PATH"] = Path(cls.data_config["RESULTS_DB_PATH"])
         
         cls.logs_config["LOGS_FOLDER_PATH"] = Path(cls.logs_config["LOGS_FOLDER_PATH"])
         
         cls.model_config["MODELS_FOLDER_PATH"] = Path(cls.model_config["MODELS_FOLDER_PATH"])
-        cls.model_config["IMAGE_INPUT_SIZE"] = (cls.game_config["BOARD_DIM"] * cls.ui_config["CELL_SIZE_IN_PIXELS"] + cls.ui_config["EXTRA_WINDOW_HEIGHT"],
-                                                cls.game_config["BOARD_DIM"] * cls.ui_config["CELL_SIZE_IN_PIXELS"])
         
         cls.ui_config["BOARD_DIM"] = cls.game_config["BOARD_DIM"]
         
         cls.game_config["SNAKE"]["SNAKE_INIT_POS"] = tuple(cls.game_config["SNAKE"]["SNAKE_INIT_POS"])
-        
-        board_size_in_pix = cls.ui_config["BOARD_DIM"] * cls.ui_config["CELL_SIZE_IN_PIXELS"]
-        cls.model_config["IMAGE_INPUT_SIZE"] = (board_size_in_pix, board_size_in_pix)
     
     @classmethod
     def get_data_config(cls):
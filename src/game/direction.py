@@ -9,9 +9,17 @@ class Direction(Enum):
 
     @staticmethod
     def is_opposite(dir1, dir2):
-        return (dir1.value[0] == -dir2.value[0] and dir1.value[1] == -dir2.value[1])
+        return _OPPOSITES[dir1] is dir2
     
     @staticmethod
     def get_opposite(dir1):
-        return Direction((dir1.value[0] * -1, dir1.value[1] * -1))
-    
\ No newline at end of file
+        return _OPPOSITES[dir1]
+
+
+# Precomputed once so the per-move checks are dict lookups instead of Enum construction
+_OPPOSITES = {
+    Direction.UP: Direction.DOWN,
+    Direction.DOWN: Direction.UP,
+    Direction.LEFT: Direction.RIGHT,
+    Direction.RIGHT: Direction.LEFT,
+}
@@ -1,12 +1,27 @@
 from time import sleep
-from typing import Optional, Dict, Any, Tuple
+from typing import Optional, Dict, Any, Tuple, List, Sequence
 import gym
 from gym import spaces
 import numpy as np
 from src.game.game import Game
 from src.game.ui import UI
+from src.game.observation import BoardRasterizer, GridEncoder, env_observation_shape, validate_buffer
+from src.game.recording import EpisodeRecorder, placed_food
+from src.game.spectator import Spectator, SpectatorFrame
+from src.game.video import VideoRecorder, is_new_high_score
 from src.config import ConfigManager
-from src.utils.logger import logger
+from src.utils.logger import logger, debug_enabled
+
+
+_DEBUG = debug_enabled(__name__)
+
+
+def make_observation_space(model_config: Dict[str, Any], ui_config: Dict[str, Any]) -> spaces.Box:
+    """Observation space of ``SnakeEnv``: float32 planes in [0, 1] for ``GRID``, uint8 RGB images otherwise."""
+    shape = env_observation_shape(model_config, ui_config)
+    if model_config.get("OBSERVATION_MODE", "RGB") == "GRID":
+        return spaces.Box(low=0.0, high=1.0, shape=shape, dtype=np.float32)
+    return spaces.Box(low=0, high=255, shape=shape, dtype=np.uint8)
 
 
 class SnakeEnv(gym.Env):
@@ -28,23 +43,86 @@ class SnakeEnv(gym.Env):
         
         self.episodes_count: int = 0
         
-        self.headless: bool = not self.episodes_count % self.game_config["EPISODES_PER_RENDER"] == 0
+        # One renderer lives for the whole run; HEADLESS never opens a display window,
+        # SPECTATOR leaves the window to a separate viewer process
+        render_mode = self.game_config.get("RENDER_MODE", "WINDOW")
+        self.headless: bool = render_mode in ("HEADLESS", "SPECTATOR")
         self.ui: Optional[UI] = None
+        self.spectator: Optional[Spectator] = None
+        if render_mode == "SPECTATOR":
+            sleep_per_timestep = self.game_config["SLEEP_PER_TIMESTEP"]
+            self.spectator = Spectator(ui_config=self.ui_config,
+                                       game_config=self.game_config,
+                                       queue_size=self.game_config.get("SPECTATOR_QUEUE_SIZE", 64),
+                                       fps=1.0 / sleep_per_timestep if sleep_per_timestep > 0 else 0.0)
+        
+        # Observations are painted with NumPy unless the pygame renderer is requested
+        self.rasterizer: Optional[BoardRasterizer] = None
+        if self.model_config.get("RGB_RENDERER", "PYGAME") == "NUMPY":
+            self.rasterizer = BoardRasterizer(self.ui_config)
+        
+        # Symbolic (C, BOARD_DIM, BOARD_DIM) planes instead of RGB images
+        self.grid_encoder: Optional[GridEncoder] = None
+        if self.model_config.get("OBSERVATION_MODE", "RGB") == "GRID":
+            self.grid_encoder = GridEncoder(board_dim=self.game_config["BOARD_DIM"],
+                                            superfood_lifetime=self.game_config["FOOD"]["SUPERFOOD_LIFETIME"],
+                                            body_age=self.model_config.get("GRID_BODY_AGE", False))
         
         # Action space: 0:STILL, 1:RIGHT, 2:DOWN, 3:LEFT, 4:UP
         self.action_space = spaces.Discrete(self.model_config["NUM_ACTIONS"])
         
-        self.image_dim: Tuple[int, int] = self.model_config["IMAGE_INPUT_SIZE"]
+        # Observation space: one plane per board feature, or an RGB screenshot of the board, channels first
+        self.observation_space = make_observation_space(self.model_config, self.ui_config)
+
+        # Compact per-episode logs that can be replayed and re-rendered offline
+        self.recorder: Optional[EpisodeRecorder] = None
+        if self.game_config.get("RECORD_EPISODES", False):
+            self.recorder = EpisodeRecorder(self.data_config["RECORDINGS_FOLDER_PATH"])
+        
+        # GIFs of selected episodes, drawn and encoded on a background thread. Pygame fonts and the
+        # display are not thread-safe, so that thread only runs when this one never draws the window
+        self.video: Optional[VideoRecorder] = None
+        video_config = self.game_config.get("VIDEO") or {}
+        record_video = bool(video_config.get("EVERY_N_EPISODES") or video_config.get("ON_HIGH_SCORE"))
+        if record_video and not self.headless:
+            logger.warning("VIDEO recording needs RENDER_MODE HEADLESS or SPECTATOR, no videos are recorded")
+        elif record_video:
+            self.video = VideoRecorder(ui_config=self.ui_config,
+                                       game_config=self.game_config,
+                                       folder=self.data_config["VIDEOS_FOLDER_PATH"],
+                                       every_n_episodes=video_config.get("EVERY_N_EPISODES", 0),
+                                       predicate=is_new_high_score if video_config.get("ON_HIGH_SCORE") else None,
+                                       fps=video_config.get("FPS", 10),
+                                       max_frames=video_config.get("MAX_FRAMES", 1000),
+                                       queue_size=video_config.get("QUEUE_SIZE", 4),
+                                       duty_cycle=video_config.get("DUTY_CYCLE", 0.05))
         
-        # Observation space: RGB screenshot of the game
-        self.observation_space = spaces.Box(
-            low=0,
-            high=255,
-            shape=(self.model_config["IMAGE_INPUT_SIZE"][0],
-                   self.model_config["IMAGE_INPUT_SIZE"][1],
-                   3),
-            dtype=np.uint8
-        )
+        # Preallocated observation buffers, written in turn when set
+        self._obs_buffers: List[np.ndarray] = []
+        self._obs_buffer_idx: int = 0
+
+    def set_observation_buffers(self, buffers: Sequence[np.ndarray]) -> None:
+        """
+        Observations are written into these preallocated arrays in turn instead
+        of freshly allocated ones. With at least two buffers the observation
+        returned by the previous step stays intact while the next one is drawn.
+        An empty sequence goes back to allocating a new array per observation.
+        Args:
+            buffers: C-contiguous arrays matching ``observation_space``
+        """
+        if len(buffers) == 1:
+            raise ValueError("At least two observation buffers are needed to keep the previous observation intact")
+        for buffer in buffers:
+            validate_buffer(buffer, self.observation_space.shape, self.observation_space.dtype)
+        self._obs_buffers = list(buffers)
+        self._obs_buffer_idx = 0
+
+    def _next_obs_buffer(self) -> Optional[np.ndarray]:
+        if not self._obs_buffers:
+            return None
+        out = self._obs_buffers[self._obs_buffer_idx]
+        self._obs_buffer_idx = (self._obs_buffer_idx + 1) % len(self._obs_buffers)
+        return out
 
     def _update_ui_components(self) -> None:
         if self.ui:
@@ -53,8 +131,7 @@ class SnakeEnv(gym.Env):
                 new_food=self.game.current_food,
                 new_score=self.game.score)
     
-    def _get_obs(self) -> np.ndarray:
-        # Headless rendering
+    def _create_or_reset_ui(self) -> None:
         if self.ui is None:
             self.ui = UI(
                 ui_config=self.ui_config,
@@ -62,81 +139,124 @@ class SnakeEnv(gym.Env):
                 episode=self.episodes_count,
                 food=self.game.current_food,
                 score=self.game.score,
-                high_score=self.game.high_score
+                high_score=self.game.high_score,
+                headless=self.headless
             )
+        else:
+            self.ui.reset(
+                snake=self.game.snake,
+                food=self.game.current_food,
+                score=self.game.score,
+                high_score=self.game.high_score,
+                episode=self.episodes_count
+            )
+    
+    def _get_obs(self, out: Optional[np.ndarray] = None) -> np.ndarray:
+        if out is None:
+            out = self._next_obs_buffer()
+        if self.grid_encoder is not None:
+            return self.grid_encoder.encode(self.game.snake, self.game.current_food, out=out)
+        if self.rasterizer is not None:
+            return self.rasterizer.render(self.game.snake, self.game.current_food, out=out)
+        
+        # Board-only pygame rendering, the HUD is never part of the observation
+        if self.ui is None:
+            self._create_or_reset_ui()
         else:
             self._update_ui_components()
         
-        _, board_rgb_array = self.ui.headless_render()
-        return board_rgb_array
+        return self.ui.render_board(out=out)
 
     def _get_info(self) -> Dict[str, Any]:
-        return self.game.get_state()
+        return self.game.get_info()
 
     def reset(self, 
               seed: Optional[int] = None, 
               options: Optional[Dict[str, Any]] = None) -> Tuple[np.ndarray, Dict[str, Any]]:
         super().reset(seed=seed)
+        if self.video is not None:
+            self.video.end_episode(self.game)
         self.episodes_count += 1
-        self.game.reset()
-        logger.debug(f"Environment reset for episode {self.episodes_count}")
+        self.game.reset(seed=seed)
+        logger.debug("Environment reset for episode {}", self.episodes_count)
+        if self.recorder is not None:
+            # An episode cut short by the caller is saved before the next one starts
+            self.recorder.finish()
+            self.recorder.start(self.game, seed, self.episodes_count)
+        if self.video is not None:
+            self.video.start_episode(self.game, self.episodes_count)
         # self.game = Game(game_config=self.game_config,
         #                  data_config=self.data_config)
+        self._create_or_reset_ui()
         observation = self._get_obs()
-        self.cleanup_ui()
-        self.ui = UI(
-                ui_config=self.ui_config,
-                snake=self.game.snake,
-                episode=self.episodes_count,
-                food=self.game.current_food,
-                score=self.game.score,
-                high_score=self.game.high_score
-            )
         info = self._get_info()
         return observation, info
 
-    def step(self, action: int) -> Tuple[np.ndarray, float, bool, bool, Dict[str, Any]]:
-        prev_score = self.game.score
-        
-        logger.debug(f"Taking action {action}")
-        _, terminated, _, _, _, _, _, _ = self.game.step(action)
-
-        # Update rewards accumulated
-        reward = 0
-        if action == 0:
-            reward += self.training_config["REWARDS"]["NOTHING"]
-            
-        if self.game.snake.check_collision():
-            reward += self.training_config["REWARDS"]["COLLIDE"]
-            logger.debug(f"Snake collided, adding collision reward: {self.training_config['REWARDS']['COLLIDE']}")
+    def tick(self, action: int) -> Tuple[float, bool]:
+        """
+        Advances the game by one tick without drawing an observation, for
+        wrappers that only observe some ticks. ``step`` is ``tick`` + ``observe``.
+        Returns:
+            tuple: (reward, terminated)
+        """
+        food_before = self.game.current_food
+        result = self.game.fast_step(action)
+        if self.recorder is not None:
+            self.recorder.record_step(action, placed_food(food_before, self.game.current_food))
+            if result.is_game_over:
+                self.recorder.finish()
+        if self.video is not None:
+            self.video.capture(self.game)
+            if result.is_game_over:
+                self.video.end_episode(self.game)
+
+        # Rewards come straight from the events the game already computed
+        rewards = self.training_config["REWARDS"]
+        reward = rewards["NOTHING"] if action == 0 else 0.0
+        if result.collided:
+            reward += rewards["COLLIDE"]
+            if _DEBUG:
+                logger.debug("Snake collided, adding collision reward: {}", rewards["COLLIDE"])
         else:
-            reward += self.training_config["REWARDS"]["MOVE"]
-            logger.debug(f"Snake moved, adding movement reward: {self.training_config['REWARDS']['MOVE']}")
-            
-        if self.game.score > prev_score:
-            food_reward = self.game.score - prev_score
-            reward += food_reward
-            logger.debug(f"Snake ate food, adding food reward: {food_reward}")
-        
-        observation = self._get_obs()
-        info = self._get_info()
+            reward += rewards["MOVE"]
+        if result.ate_food:
+            reward += result.score_gained
+            if _DEBUG:
+                logger.debug("Snake ate food, adding food reward: {}", result.score_gained)
+        return float(reward), result.is_game_over
+
+    def observe(self, out: Optional[np.ndarray] = None) -> Tuple[np.ndarray, Dict[str, Any]]:
+        """
+        Args:
+            out: Array to draw the observation into, instead of the next
+                observation buffer (see ``set_observation_buffers``)
+        """
+        if out is not None:
+            validate_buffer(out, self.observation_space.shape, self.observation_space.dtype)
+        return self._get_obs(out), self._get_info()
+
+    def step(self, action: int) -> Tuple[np.ndarray, float, bool, bool, Dict[str, Any]]:
+        reward, terminated = self.tick(action)
+        observation, info = self.observe()
         truncated = False
         return observation, reward, terminated, truncated, info
 
+    def _is_render_episode(self) -> bool:
+        return self.episodes_count == 1 or self.episodes_count % self.game_config["EPISODES_PER_RENDER"] == 0
+
     def render(self) -> None:
+        if self.spectator is not None:
+            if self._is_render_episode():
+                self.spectator.publish(SpectatorFrame.from_game(self.game, self.episodes_count))
+            return
+        if self.headless:
+            return
         if self.ui is None:
-                self.ui = UI(
-                    ui_config=self.ui_config,
-                    snake=self.game.snake,
-                    episode=self.episodes_count,
-                    food=self.game.current_food,
-                    score=self.game.score,
-                    high_score=self.game.high_score
-                )
+            self._create_or_reset_ui()
         else:
             self._update_ui_components()
                 
-        if self.episodes_count == 1 or self.episodes_count % self.game_config["EPISODES_PER_RENDER"] == 0:
+        if self._is_render_episode():
             sleep(self.game_config["SLEEP_PER_TIMESTEP"])
             self.ui.full_render()
 
@@ -145,4 +265,15 @@ class SnakeEnv(gym.Env):
             logger.debug("Cleaning up UI resources")
             self.ui.close()
             self.ui = None
+    
+    def close(self) -> None:
+        if self.recorder is not None:
+            self.recorder.finish()
+        if self.video is not None:
+            self.video.end_episode(self.game)
+            self.video.close()
+        if self.spectator is not None:
+            self.spectator.close()
+        self.cleanup_ui()
+        super().close()
         
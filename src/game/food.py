@@ -1,6 +1,7 @@
 from abc import ABC, abstractmethod
 from typing import List, Tuple, Optional
 import random
+from src.game.free_cells import FreeCellSet
 
 
 class Food(ABC):
@@ -10,9 +11,25 @@ class Food(ABC):
         self.active: bool = False
     
     @abstractmethod
-    def place_food(self, snake_body: List[Tuple[int, int]]) -> None:
+    def place_food(self, 
+                   snake_body: Optional[List[Tuple[int, int]]] = None,
+                   free_cells: Optional[FreeCellSet] = None,
+                   rng=random) -> None:
         pass
 
+    def _pick_position(self, 
+                       snake_body: Optional[List[Tuple[int, int]]],
+                       free_cells: Optional[FreeCellSet],
+                       rng=random) -> Optional[Tuple[int, int]]:
+        # Constant-time pick when the game keeps a free-cell index, None if the board is full
+        if free_cells is not None:
+            return free_cells.sample_position(rng) if len(free_cells) else None
+        # Rejection sampling against a plain body list
+        while True:
+            pos = (rng.randint(0, self.board_dim-1), rng.randint(0, self.board_dim-1))
+            if pos not in snake_body:
+                return pos
+
     @abstractmethod
     def is_eaten(self, snake_head: Tuple[int, int]) -> bool:
         pass
@@ -27,13 +44,14 @@ class SimpleFood(Food):
         super().__init__(board_dim)
         self.remaining_steps = 0
         
-    def place_food(self, snake_body: List[Tuple[int, int]]) -> None:
-        while True:
-            pos = (random.randint(0, self.board_dim-1), random.randint(0, self.board_dim-1))
-            if pos not in snake_body:
-                self.position = pos
-                self.active = True
-                break
+    def place_food(self, 
+                   snake_body: Optional[List[Tuple[int, int]]] = None,
+                   free_cells: Optional[FreeCellSet] = None,
+                   rng=random) -> None:
+        pos = self._pick_position(snake_body, free_cells, rng)
+        if pos is not None:
+            self.position = pos
+            self.active = True
 
     def is_eaten(self, snake_head: Tuple[int, int]) -> bool:
         return self.active and snake_head == self.position
@@ -54,14 +72,15 @@ class SuperFood(Food):
         self.remaining_steps = 0
         self.active = False
 
-    def place_food(self, snake_body: List[Tuple[int, int]]) -> None:
-        while True:
-            pos = (random.randint(0, self.board_dim-1), random.randint(0, self.board_dim-1))
-            if pos not in snake_body:
-                self.position = pos
-                self.active = True
-                self.remaining_steps = self.lifetime
-                break
+    def place_food(self, 
+                   snake_body: Optional[List[Tuple[int, int]]] = None,
+                   free_cells: Optional[FreeCellSet] = None,
+                   rng=random) -> None:
+        pos = self._pick_position(snake_body, free_cells, rng)
+        if pos is not None:
+            self.position = pos
+            self.active = True
+            self.remaining_steps = self.lifetime
 
     def is_eaten(self, snake_head: Tuple[int, int]) -> bool:
         return self.active and snake_head == self.position
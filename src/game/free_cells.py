@@ -0,0 +1,53 @@
+import random
+from typing import List, Tuple
+from src.game.grid import cell_coords
+
+
+class FreeCellSet:
+    """
+    Cells not covered by the snake, with O(1) add, remove and uniform random pick.
+
+    Cell ids live in a dense list, and a per-cell index into that list lets
+    removal swap the last entry into the freed slot.
+    """
+    def __init__(self, board_dim: int):
+        self.board_dim = board_dim
+        self._coords = cell_coords(board_dim)
+        self._cells: List[int] = list(range(board_dim ** 2))
+        self._index: List[int] = list(range(board_dim ** 2))
+
+    def add(self, cell: int) -> None:
+        if self._index[cell] >= 0:
+            return
+        self._index[cell] = len(self._cells)
+        self._cells.append(cell)
+
+    def remove(self, cell: int) -> None:
+        i = self._index[cell]
+        if i < 0:
+            return
+        last = self._cells.pop()
+        if last != cell:
+            self._cells[i] = last
+            self._index[last] = i
+        self._index[cell] = -1
+
+    def sample(self, rng=random) -> int:
+        return self._cells[rng.randrange(len(self._cells))]
+
+    def sample_position(self, rng=random) -> Tuple[int, int]:
+        return self._coords[self.sample(rng)]
+
+    def snapshot(self) -> Tuple[Tuple[int, ...], Tuple[int, ...]]:
+        return tuple(self._cells), tuple(self._index)
+
+    def restore(self, snapshot: Tuple[Tuple[int, ...], Tuple[int, ...]]) -> None:
+        cells, index = snapshot
+        self._cells[:] = cells
+        self._index[:] = index
+
+    def __contains__(self, cell: int) -> bool:
+        return self._index[cell] >= 0
+
+    def __len__(self) -> int:
+        return len(self._cells)
@@ -1,19 +1,120 @@
 import random
 from uuid import uuid4
 from datetime import datetime
-from typing import Optional, Literal, Tuple, Dict, Any
-from pathlib import Path
+from typing import Optional, Literal, Tuple, Dict, Any, NamedTuple, Callable, Iterator, KeysView, ValuesView, ItemsView
 from src.game.direction import Direction
-from src.game.snake import Snake
+from src.game.snake import Snake, SnakeSnapshot
 from src.game.food import Food, SimpleFood, SuperFood
+from src.game.results_store import ResultsStore, results_db_path, read_high_score
+
+
+ACTION_TO_DIRECTION = {
+    1: Direction.RIGHT,
+    2: Direction.DOWN,
+    3: Direction.LEFT,
+    4: Direction.UP,
+}
+
+
+class StepResult(NamedTuple):
+    """Outcome of one ``Game.fast_step``, with the events rewards are built from."""
+    steps_elapsed: int
+    is_game_over: bool
+    collided: bool
+    ate_food: bool
+    score_gained: float
+
+
+class GameSnapshot(NamedTuple):
+    """Everything ``Game.restore`` needs to rewind a game, see ``Game.snapshot``."""
+    snake: SnakeSnapshot
+    food: Optional[Tuple[bool, Optional[Tuple[int, int]], bool, int]]
+    is_food_active: bool
+    steps_elapsed: int
+    food_count: int
+    score: float
+    is_game_over: bool
+    rng_state: Tuple[Any, ...]
+
+
+class LazyInfo(dict):
+    """
+    Step info whose ``game_id`` and ``updated_at`` are only generated when read,
+    so the uuid and timestamp cost nothing on steps nobody inspects. Iterating,
+    copying, comparing or printing the info generates them first, so it still
+    behaves like a dict that holds every key.
+    """
+    _LAZY_FIELDS: Dict[str, Callable[[], Any]] = {
+        "game_id": lambda: str(uuid4()),
+        "updated_at": lambda: datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+    }
+
+    def __missing__(self, key: str) -> Any:
+        if key not in self._LAZY_FIELDS:
+            raise KeyError(key)
+        value = self[key] = self._LAZY_FIELDS[key]()
+        return value
+
+    def __contains__(self, key: object) -> bool:
+        return dict.__contains__(self, key) or key in self._LAZY_FIELDS
+
+    def get(self, key: str, default: Any = None) -> Any:
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def _materialize(self) -> "LazyInfo":
+        for key in self._LAZY_FIELDS:
+            if not dict.__contains__(self, key):
+                self[key]
+        return self
+
+    # dict(info), {**info} and pickling go through these once __iter__ is overridden
+    def __iter__(self) -> Iterator[str]:
+        return dict.__iter__(self._materialize())
+
+    def __len__(self) -> int:
+        return dict.__len__(self._materialize())
+
+    def keys(self) -> KeysView[str]:
+        return dict.keys(self._materialize())
+
+    def values(self) -> ValuesView[Any]:
+        return dict.values(self._materialize())
+
+    def items(self) -> ItemsView[str, Any]:
+        return dict.items(self._materialize())
+
+    def copy(self) -> Dict[str, Any]:
+        return dict.copy(self._materialize())
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, LazyInfo):
+            other._materialize()
+        return dict.__eq__(self._materialize(), other)
+
+    def __ne__(self, other: object) -> bool:
+        return not self == other
+
+    def __repr__(self) -> str:
+        return dict.__repr__(self._materialize())
 
 
 class Game:
     def __init__(self, 
                  game_config: Optional[Dict[str, Any]],
-                 data_config: Optional[Dict[str, Any]]):
+                 data_config: Optional[Dict[str, Any]],
+                 record_results: bool = True):
         self.game_config = game_config
         self.data_config = data_config
+        # Finished games go to a shared, buffered store; without it the high score is read once
+        self.results_store: Optional[ResultsStore] = None
+        if record_results:
+            self.results_store = ResultsStore.for_path(results_db_path(data_config),
+                                                       high_score_path=data_config["HIGH_SCORE_FILE_PATH"])
+        self._initial_high_score: float = read_high_score(data_config["HIGH_SCORE_FILE_PATH"]) \
+            if self.results_store is None else 0
         self.snake: Optional[Snake] = None
         self.is_food_active: bool = False
         self.current_food: Optional[Food] = None
@@ -23,27 +124,27 @@ class Game:
         self.high_score: int = 0
         self.is_game_over: bool = False
         self.state: Optional[Dict[str, int]] = None
+        # Food placement draws from a private generator, so snapshot/restore never touch the global one.
+        # Unseeded games take their seed from the random module, which random.seed still controls
+        self.rng = random.Random(random.getrandbits(64))
         self.reset()
 
-    def reset(self) -> None:
+    def reset(self, seed: Optional[int] = None) -> None:
+        if seed is not None:
+            self.rng = random.Random(seed)
         self.snake = Snake(board_dim=self.game_config["BOARD_DIM"],
                            init_pos=self.game_config["SNAKE"]["SNAKE_INIT_POS"],
                            init_length=self.game_config["SNAKE"]["SNAKE_INIT_LENGTH"],
                            init_direction=Direction[self.game_config["SNAKE"]["SNAKE_INIT_DIRECTION"]])
-        self._generate_or_update_food()
+        # Food is only placed once the new episode is under way, so a seeded reset does not
+        # depend on how the previous episode ended
         self.is_food_active: bool = False
         self.current_food: Optional[Food] = None
         self.steps_elapsed: int = 0
         self.food_count: int = 0
         self.score: int = 0
         self.is_game_over: bool = False
-        
-        # Read high score, default to 0 if the file doesn't exist
-        try:
-            with open(self.data_config["HIGH_SCORE_FILE_PATH"], "r", encoding="utf-8") as f:
-                self.high_score = int(f.read())
-        except (ValueError, FileNotFoundError):
-            self.high_score = 0
+        self.high_score = self.results_store.high_score if self.results_store else self._initial_high_score
         
     def _is_food_eaten(self) -> bool:
         if not self.is_food_active:
@@ -56,15 +157,21 @@ class Game:
             return
         
         if not hasattr(self.current_food, 'active') or not self.is_food_active:
-            if random.random() <= self.game_config["FOOD"]["SUPERFOOD_PROBABILITY"] and self.food_count > 0:
-                self.current_food = SuperFood(board_dim=self.game_config["BOARD_DIM"],
-                                    lifetime=self.game_config["FOOD"]["SUPERFOOD_LIFETIME"])
-            else:
-                self.current_food = SimpleFood(board_dim=self.game_config["BOARD_DIM"])
-            self.current_food.place_food(self.snake.get_body())
-            self.is_food_active = True
+            self.current_food = self._spawn_food()
+            self.is_food_active = self.current_food.active
         else:
             self.current_food.update()
+            # An expired SuperFood frees the slot so new food is placed on the next step
+            self.is_food_active = self.current_food.active
+        
+    def _spawn_food(self) -> Food:
+        if self.rng.random() <= self.game_config["FOOD"]["SUPERFOOD_PROBABILITY"] and self.food_count > 0:
+            food = SuperFood(board_dim=self.game_config["BOARD_DIM"],
+                             lifetime=self.game_config["FOOD"]["SUPERFOOD_LIFETIME"])
+        else:
+            food = SimpleFood(board_dim=self.game_config["BOARD_DIM"])
+        food.place_food(free_cells=self.snake.free_cells, rng=self.rng)
+        return food
         
     def _update_score(self) -> None:
         if not self.is_food_active:
@@ -74,8 +181,9 @@ class Game:
         else: 
             self.score += self.game_config["SCORE"]["XPLIER_EAT_SUPERFOOD"]*(1+self.current_food.remaining_steps)    
     
-    def step(self, action: Literal[0, 1, 2, 3, 4]=0) -> Tuple[float, bool, int, int]:
+    def fast_step(self, action: Literal[0, 1, 2, 3, 4]=0) -> StepResult:
         """
+        Same rules as ``step`` without building the body list or state tuple.
         Actions:
             0: STILL (do nothing)
             1: RIGHT
@@ -83,7 +191,7 @@ class Game:
             3: LEFT
             4: UP
         Returns:
-            tuple: (reward, game_over, score, steps_elapsed)
+            StepResult: (steps_elapsed, is_game_over, collided, ate_food, score_gained)
         """
         self.steps_elapsed += 1
         
@@ -91,21 +199,16 @@ class Game:
         self._generate_or_update_food()
         
         # Step 2: Update snake direction and move it
-        action_to_direction_map = {
-            1: Direction.RIGHT,
-            2: Direction.DOWN,
-            3: Direction.LEFT,
-            4: Direction.UP,
-        }
-
-        if action in action_to_direction_map:
-            new_direction = action_to_direction_map[action]
+        new_direction = ACTION_TO_DIRECTION.get(action)
+        if new_direction is not None:
             self.snake.set_direction(new_direction)
 
         self.snake.move()
 
         # Step 3: Check if food is eaten after snake moves, if so grow snake, update food count & score
-        if self._is_food_eaten():
+        prev_score = self.score
+        ate_food = self._is_food_eaten()
+        if ate_food:
             self.food_count += 1
             self._update_score()
             self.snake.growth_pending = True
@@ -113,11 +216,27 @@ class Game:
             self.is_food_active = False
                 
         # Step 4: Check for end states (collision or if the snake has eaten all foods)
-        if self.snake.check_collision() or len(self.snake) >= self.game_config["BOARD_DIM"] ** 2:
+        collided = self.snake.check_collision()
+        if collided or len(self.snake) >= self.game_config["BOARD_DIM"] ** 2:
             self.is_game_over = True
             self.snake.kill()
             self._record_state()
         
+        return StepResult(self.steps_elapsed, self.is_game_over, collided, ate_food, self.score - prev_score)
+    
+    def step(self, action: Literal[0, 1, 2, 3, 4]=0) -> Tuple[Any, ...]:
+        """
+        Actions:
+            0: STILL (do nothing)
+            1: RIGHT
+            2: DOWN
+            3: LEFT
+            4: UP
+        Returns:
+            tuple: (steps_elapsed, game_over, score, snake_body, direction,
+            is_food_active, food_position, food_remaining_steps)
+        """
+        self.fast_step(action)
         return (self.steps_elapsed, 
                 self.is_game_over, 
                 self.score,
@@ -127,6 +246,39 @@ class Game:
                 self.current_food.position if self.is_food_active else None,
                 self.current_food.remaining_steps if self.is_food_active and isinstance(self.current_food, SuperFood) else None)
         
+    def snapshot(self) -> GameSnapshot:
+        """
+        Immutable copy of the game state, including the RNG, for lookahead and
+        rewinding. Configs, the results store and the high score are not included.
+        """
+        food = None
+        if self.current_food is not None:
+            food = (isinstance(self.current_food, SuperFood), self.current_food.position,
+                    self.current_food.active, self.current_food.remaining_steps)
+        return GameSnapshot(self.snake.snapshot(), food, self.is_food_active, self.steps_elapsed,
+                            self.food_count, self.score, self.is_game_over, self.rng.getstate())
+    
+    def restore(self, snapshot: GameSnapshot) -> None:
+        """Rewinds the game to ``snapshot``, reusing the current snake's buffers."""
+        self.snake.restore(snapshot.snake)
+        if snapshot.food is None:
+            self.current_food = None
+        else:
+            is_super, position, active, remaining_steps = snapshot.food
+            if is_super:
+                food = SuperFood(board_dim=self.game_config["BOARD_DIM"],
+                                 lifetime=self.game_config["FOOD"]["SUPERFOOD_LIFETIME"])
+            else:
+                food = SimpleFood(board_dim=self.game_config["BOARD_DIM"])
+            food.position, food.active, food.remaining_steps = position, active, remaining_steps
+            self.current_food = food
+        self.is_food_active = snapshot.is_food_active
+        self.steps_elapsed = snapshot.steps_elapsed
+        self.food_count = snapshot.food_count
+        self.score = snapshot.score
+        self.is_game_over = snapshot.is_game_over
+        self.rng.setstate(snapshot.rng_state)
+    
     def _record_state(self):
         self.state = {
             "game_id": str(uuid4()),
@@ -135,7 +287,8 @@ class Game:
             "food_count": self.food_count,
             "score": self.score,
         }
-        self._record_score()
+        if self.results_store is not None:
+            self.results_store.record(self.state)
     
     def get_state(self):
         return {
@@ -147,16 +300,9 @@ class Game:
             "is_game_over": self.is_game_over,
         }
     
-    def _record_score(self):
-        scores_path = Path(self.data_config["SCORES_FILE_PATH"])
-        scores_path.parent.mkdir(parents=True, exist_ok=True)
-        
-        with open(scores_path, "a", encoding="utf-8") as f:
-            f.write(f"{self.state}\n")
-        
-        high_score_path = Path(self.data_config["HIGH_SCORE_FILE_PATH"])
-        high_score_path.parent.mkdir(parents=True, exist_ok=True)
-        
-        if self.score > self.high_score:
-            with open(high_score_path, "w", encoding="utf-8") as f:
-                f.write(str(self.score))
\ No newline at end of file
+    def get_info(self) -> LazyInfo:
+        """Like ``get_state``, but the game id and timestamp are built only if read."""
+        return LazyInfo(steps_elapsed=self.steps_elapsed,
+                        food_count=self.food_count,
+                        score=self.score,
+                        is_game_over=self.is_game_over)
@@ -0,0 +1,29 @@
+from functools import lru_cache
+from typing import Dict, Tuple
+from src.game.direction import Direction
+
+
+# Cells are addressed by an integer id: cell = x * board_dim + y
+
+# Cell codes used by board observations
+EMPTY, BODY, HEAD, SIMPLE_FOOD, SUPER_FOOD = 0, 1, 2, 3, 4
+
+
+def to_cell(pos: Tuple[int, int], board_dim: int) -> int:
+    return (pos[0] % board_dim) * board_dim + (pos[1] % board_dim)
+
+
+@lru_cache(maxsize=None)
+def cell_coords(board_dim: int) -> Tuple[Tuple[int, int], ...]:
+    """(x, y) tuple of every cell id, shared so lookups never allocate."""
+    return tuple((x, y) for x in range(board_dim) for y in range(board_dim))
+
+
+@lru_cache(maxsize=None)
+def neighbour_table(board_dim: int) -> Dict[Direction, Tuple[int, ...]]:
+    """Neighbouring cell id of every cell in each direction, with wrap-around at the edges."""
+    return {
+        direction: tuple(to_cell((x + direction.value[0], y + direction.value[1]), board_dim)
+                         for x, y in cell_coords(board_dim))
+        for direction in Direction
+    }
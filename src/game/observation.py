@@ -0,0 +1,309 @@
+from typing import Dict, Any, Optional, Tuple
+import numpy as np
+from src.game.snake import Snake
+from src.game.food import Food, SuperFood
+from src.game.colour import Colour
+from src.game.grid import EMPTY, BODY, HEAD, SIMPLE_FOOD, SUPER_FOOD
+
+
+def validate_buffer(out: np.ndarray, shape: Tuple[int, ...], dtype: Any) -> np.ndarray:
+    """Checks that a caller-provided observation buffer can be written in place."""
+    if out.shape != tuple(shape) or out.dtype != np.dtype(dtype) or not out.flags.c_contiguous:
+        raise ValueError(f"Output buffer must be a C-contiguous {np.dtype(dtype)} array of shape {tuple(shape)}")
+    return out
+
+
+def _rgb(colour_name: str) -> np.ndarray:
+    # Alpha is dropped, as it is when pygame draws onto the opaque board surface
+    return np.array(Colour[colour_name].value[:3], dtype=np.uint8)
+
+
+def _circle_mask(size: int, center: int, radius: int) -> np.ndarray:
+    """Filled circle clipped to a ``size x size`` cell, rasterized like ``pygame.draw.circle``."""
+    mask = np.zeros((size + 2 * radius, size + 2 * radius), dtype=bool)
+    c = center + radius
+    f, ddf_x, ddf_y, x, y = 1 - radius, 0, -2 * radius, 0, radius
+    while x < y:
+        if f >= 0:
+            y -= 1
+            ddf_y += 2
+            f += ddf_y
+        x += 1
+        ddf_x += 2
+        f += ddf_x + 1
+        if f >= 0:
+            mask[c + y - 1, c - x:c + x] = True
+            mask[c - y, c - x:c + x] = True
+        mask[c + x - 1, c - y:c + y] = True
+        mask[c - x, c - y:c + y] = True
+    return mask[radius:radius + size, radius:radius + size]
+
+
+class BoardRasterizer:
+    """
+    Paints the board straight into a ``(3, H, W)`` uint8 array with NumPy,
+    without pygame, SDL or fonts.
+
+    The output matches the board crop of ``UI.headless_render`` pixel for
+    pixel (board fill, border, grid lines, head square, body and food circles),
+    with one documented tolerance: the food symbol glyph is not drawn, so at
+    most the glyph's pixels inside the food cell differ. Sprites that a
+    positive ``STRETCH`` would push past their cell are clipped to the cell.
+    """
+    def __init__(self, ui_config: Dict[str, Any]):
+        self.ui_config = ui_config
+        self.board_dim: int = ui_config["BOARD_DIM"]
+        self.cell_size: int = ui_config["CELL_SIZE_IN_PIXELS"]
+        self.board_pixel_size: int = self.board_dim * self.cell_size
+        self.shape = (3, self.board_pixel_size, self.board_pixel_size)
+        self._background = self._build_background()
+        self._sprites = self._build_sprites()
+
+    def _build_background(self) -> np.ndarray:
+        board_config = self.ui_config["BOARD"]
+        size = self.board_pixel_size
+        background = np.empty(self.shape, dtype=np.uint8)
+        background[:] = _rgb(board_config["FILL"])[:, None, None]
+
+        border = board_config["BORDER"]["THICKNESS"]
+        border_fill = _rgb(board_config["BORDER"]["FILL"])[:, None, None]
+        background[:, :border, :] = border_fill
+        background[:, size - border:, :] = border_fill
+        background[:, :, :border] = border_fill
+        background[:, :, size - border:] = border_fill
+
+        # pygame centres thick lines on the grid coordinate, biased down/right
+        thickness = board_config["GRID"]["THICKNESS"]
+        grid_fill = _rgb(board_config["GRID"]["FILL"])[:, None]
+        for i in range(1, self.board_dim):
+            start = max(i * self.cell_size - (thickness - 1) // 2, 0)
+            stop = i * self.cell_size + thickness // 2 + 1
+            background[:, :, start:stop] = grid_fill[:, :, None]
+            background[:, start:stop, :] = grid_fill[:, None, :]
+        return background
+
+    def _build_sprites(self) -> Dict[int, tuple]:
+        cs = self.cell_size
+        snake_config = self.ui_config["SNAKE"]
+        food_config = self.ui_config["FOOD"]
+
+        head_mask = np.zeros((cs, cs), dtype=bool)
+        stretch = snake_config["HEAD"]["STRETCH"]
+        lo, hi = max(-stretch, 0), min(cs + stretch, cs)
+        head_mask[lo:hi, lo:hi] = True
+
+        body_mask = _circle_mask(cs, cs // 2, cs // 2 + snake_config["BODY"]["STRETCH"])
+        food_mask = _circle_mask(cs, cs // 2, cs // 2 - 2)
+        return {
+            HEAD: (head_mask, _rgb(snake_config["HEAD"]["FILL"])),
+            BODY: (body_mask, _rgb(snake_config["BODY"]["FILL"])),
+            SIMPLE_FOOD: (food_mask, _rgb(food_config["SIMPLE"]["FILL"])),
+            SUPER_FOOD: (food_mask, _rgb(food_config["SUPER"]["FILL"])),
+        }
+
+    def cell_labels(self, snake: Snake, food: Optional[Food]) -> np.ndarray:
+        """
+        Returns:
+            np.ndarray: (BOARD_DIM, BOARD_DIM) cell codes laid out like the
+            rendered board (row ``BOARD_DIM - 1 - y``, column ``x``)
+        """
+        top = self.board_dim - 1
+        occupancy = np.frombuffer(snake.occupancy, dtype=np.uint8).reshape(self.board_dim, self.board_dim)
+        labels = np.where(occupancy.T[::-1] > 0, BODY, EMPTY).astype(np.uint8)
+        head_x, head_y = snake.get_head()
+        labels[top - head_y, head_x] = HEAD
+        if food is not None and food.active:
+            food_x, food_y = food.position
+            labels[top - food_y, food_x] = SUPER_FOOD if isinstance(food, SuperFood) else SIMPLE_FOOD
+        return labels
+
+    def render(self,
+               snake: Snake,
+               food: Optional[Food],
+               out: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Args:
+            snake: Snake to draw
+            food: Current food, drawn only while active
+            out: Optional contiguous ``(3, H, W)`` uint8 array to draw into
+        Returns:
+            np.ndarray: (3, H, W) uint8 RGB board image
+        """
+        if out is None:
+            out = np.empty(self.shape, dtype=np.uint8)
+        else:
+            validate_buffer(out, self.shape, np.uint8)
+        np.copyto(out, self._background)
+
+        labels = self.cell_labels(snake, food)
+        # View the image as (3, row, y-in-cell, col, x-in-cell) blocks, one per cell
+        blocks = out.reshape(3, self.board_dim, self.cell_size, self.board_dim, self.cell_size)
+        for label, (mask, colour) in self._sprites.items():
+            rows, cols = np.nonzero(labels == label)
+            if rows.size == 0:
+                continue
+            cells = blocks[:, rows, :, cols, :]
+            cells[:, :, mask] = colour[:, None]
+            blocks[:, rows, :, cols, :] = cells
+        return out
+
+
+class ObservationPreprocessor:
+    """
+    Shrinks ``(3, H, W)`` uint8 board images before they reach the agent.
+
+    With ``pixels_per_cell`` it keeps that many evenly spaced pixels along
+    each axis of every cell (the centres of equal sub-cells), which skips the
+    border and grid lines. Sprites are solid, so a few samples per cell still
+    tell every cell kind apart, provided they hit both the centre (food) and a
+    corner (square head vs round body), e.g. 3 with the default sprites.
+    With ``palette`` the RGB channels collapse into one channel holding the
+    index of each pixel's colour in ``palette_colours`` (0, the board fill,
+    for colours not in the palette). The output stays uint8.
+    """
+    def __init__(self,
+                 ui_config: Dict[str, Any],
+                 pixels_per_cell: Optional[int] = None,
+                 palette: bool = False):
+        board_dim: int = ui_config["BOARD_DIM"]
+        cell_size: int = ui_config["CELL_SIZE_IN_PIXELS"]
+        if pixels_per_cell is not None and not 1 <= pixels_per_cell <= cell_size:
+            raise ValueError(f"Pixels per cell must be between 1 and {cell_size}, got {pixels_per_cell}")
+        self.pixels_per_cell = pixels_per_cell
+        self.palette = palette
+        self.input_shape = (3, board_dim * cell_size, board_dim * cell_size)
+
+        side = self.input_shape[1]
+        self._rows: Optional[np.ndarray] = None
+        if pixels_per_cell is not None:
+            offsets = (np.arange(pixels_per_cell) * cell_size + cell_size // 2) // pixels_per_cell
+            self._rows = (np.arange(board_dim)[:, None] * cell_size + offsets[None, :]).ravel()
+            side = self._rows.size
+        self.shape = (1 if palette else 3, side, side)
+
+        self.palette_colours = self._build_palette(ui_config)
+        keys = np.array([self._key(np.array(colour, dtype=np.uint8)) for colour in self.palette_colours])
+        self._palette_order = np.argsort(keys)
+        self._palette_keys = keys[self._palette_order]
+
+    @staticmethod
+    def _build_palette(ui_config: Dict[str, Any]) -> Tuple[Tuple[int, int, int], ...]:
+        board_config, snake_config, food_config = ui_config["BOARD"], ui_config["SNAKE"], ui_config["FOOD"]
+        names = [board_config["FILL"], board_config["BORDER"]["FILL"], board_config["GRID"]["FILL"],
+                 snake_config["HEAD"]["FILL"], snake_config["BODY"]["FILL"],
+                 food_config["SIMPLE"]["FILL"], food_config["SUPER"]["FILL"],
+                 food_config["SIMPLE"]["FONT"]["COLOUR"], food_config["SUPER"]["FONT"]["COLOUR"]]
+        colours = []
+        for name in names:
+            colour = tuple(int(c) for c in _rgb(name))
+            if colour not in colours:
+                colours.append(colour)
+        return tuple(colours)
+
+    @staticmethod
+    def _key(rgb: np.ndarray) -> np.ndarray:
+        # One integer per colour, over the leading channel axis
+        rgb = rgb.astype(np.uint32)
+        return (rgb[0] << 16) | (rgb[1] << 8) | rgb[2]
+
+    def apply(self, observation: np.ndarray, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Args:
+            observation: (3, H, W) uint8 RGB board image
+            out: Optional contiguous uint8 array of ``shape`` to write into
+        Returns:
+            np.ndarray: Preprocessed uint8 observation of ``shape``
+        """
+        if out is None:
+            out = np.empty(self.shape, dtype=np.uint8)
+        else:
+            validate_buffer(out, self.shape, np.uint8)
+        image = observation if self._rows is None else observation[:, self._rows[:, None], self._rows]
+        if not self.palette:
+            np.copyto(out, image)
+            return out
+        keys = self._key(image)
+        positions = np.searchsorted(self._palette_keys, keys).clip(max=len(self._palette_keys) - 1)
+        indices = self._palette_order[positions]
+        np.copyto(out[0], np.where(self._palette_keys[positions] == keys, indices, 0), casting="unsafe")
+        return out
+
+
+class GridEncoder:
+    """
+    Symbolic board observation: a ``(5, BOARD_DIM, BOARD_DIM)`` float32 tensor
+    with one plane each for the head, body, simple food, superfood and the
+    superfood's remaining lifetime (normalized to [0, 1] over the whole plane).
+
+    With ``body_age`` the body plane holds ``(n - i) / (n - 1)`` for the i-th
+    segment behind the head, so the neck is 1.0 and the tail is smallest.
+    Planes use the same layout as the rendered board.
+    """
+    NUM_CHANNELS = 5
+    HEAD_PLANE, BODY_PLANE, SIMPLE_FOOD_PLANE, SUPER_FOOD_PLANE, LIFETIME_PLANE = range(NUM_CHANNELS)
+
+    def __init__(self,
+                 board_dim: int,
+                 superfood_lifetime: int,
+                 body_age: bool = False):
+        self.board_dim = board_dim
+        self.superfood_lifetime = superfood_lifetime
+        self.body_age = body_age
+        self.shape = (self.NUM_CHANNELS, board_dim, board_dim)
+
+    def encode(self,
+               snake: Snake,
+               food: Optional[Food],
+               out: Optional[np.ndarray] = None) -> np.ndarray:
+        if out is None:
+            out = np.empty(self.shape, dtype=np.float32)
+        else:
+            validate_buffer(out, self.shape, np.float32)
+        out.fill(0.0)
+        top = self.board_dim - 1
+        head_x, head_y = snake.get_head()
+
+        if self.body_age:
+            segments = np.array(list(snake.iter_body())[1:], dtype=np.int64).reshape(-1, 2)
+            n = len(segments) + 1
+            # Write tail first so the newest segment wins on overlapping cells
+            ages = (n - np.arange(1, n, dtype=np.float32)) / max(n - 1, 1)
+            out[self.BODY_PLANE, top - segments[::-1, 1], segments[::-1, 0]] = ages[::-1]
+        else:
+            occupancy = np.frombuffer(snake.occupancy, dtype=np.uint8).reshape(self.board_dim, self.board_dim)
+            np.greater(occupancy.T[::-1], 0, out=out[self.BODY_PLANE], casting="unsafe")
+            out[self.BODY_PLANE, top - head_y, head_x] = float(snake.check_collision())
+        out[self.HEAD_PLANE, top - head_y, head_x] = 1.0
+
+        if food is not None and food.active:
+            food_x, food_y = food.position
+            if isinstance(food, SuperFood):
+                out[self.SUPER_FOOD_PLANE, top - food_y, food_x] = 1.0
+                out[self.LIFETIME_PLANE] = min(max(food.remaining_steps / self.superfood_lifetime, 0.0), 1.0)
+            else:
+                out[self.SIMPLE_FOOD_PLANE, top - food_y, food_x] = 1.0
+        return out
+
+
+def make_preprocessor(model_config: Dict[str, Any], ui_config: Dict[str, Any]) -> Optional[ObservationPreprocessor]:
+    """The ``ObservationPreprocessor`` configured in ``MODEL_CONFIG``, None when images are used as drawn."""
+    if model_config.get("OBSERVATION_MODE", "RGB") != "RGB" or \
+            not (model_config.get("PIXELS_PER_CELL") or model_config.get("PALETTE")):
+        return None
+    return ObservationPreprocessor(ui_config, model_config.get("PIXELS_PER_CELL"), model_config.get("PALETTE", False))
+
+
+def env_observation_shape(model_config: Dict[str, Any], ui_config: Dict[str, Any]) -> Tuple[int, int, int]:
+    """(C, H, W) of a ``SnakeEnv`` observation in the configured ``OBSERVATION_MODE``."""
+    board_dim = ui_config["BOARD_DIM"]
+    if model_config.get("OBSERVATION_MODE", "RGB") == "GRID":
+        return (GridEncoder.NUM_CHANNELS, board_dim, board_dim)
+    side = board_dim * ui_config["CELL_SIZE_IN_PIXELS"]
+    return (3, side, side)
+
+
+def model_input_shape(model_config: Dict[str, Any], ui_config: Dict[str, Any]) -> Tuple[int, int, int]:
+    """(C, H, W) the model sees: the env observation after preprocessing, ``FRAME_STACK`` frames deep."""
+    preprocessor = make_preprocessor(model_config, ui_config)
+    channels, height, width = preprocessor.shape if preprocessor else env_observation_shape(model_config, ui_config)
+    return (channels * model_config.get("FRAME_STACK", 1), height, width)
@@ -0,0 +1,213 @@
+import argparse
+import struct
+from datetime import datetime
+from pathlib import Path
+from typing import Optional, Dict, Any, List, Tuple, NamedTuple, Iterator, Union
+from src.game.direction import Direction
+from src.game.game import Game, ACTION_TO_DIRECTION
+from src.game.food import Food, SimpleFood, SuperFood
+from src.game.grid import to_cell, cell_coords
+from src.game.spectator import SpectatorFrame
+from src.game.video import HeadlessFrameRenderer, write_frames
+from src.utils.logger import logger
+
+
+# Episode log layout (little-endian):
+#   header: magic, version, board dim, seed (-1 if none), initial direction action, body length
+#   initial body: one uint16 cell id per segment, head first
+#   steps: one byte per step, action in the low bits, plus a uint16 cell id when food was placed
+MAGIC = b"SNKE"
+VERSION = 1
+_HEADER = struct.Struct("<4sBBqBH")
+_CELL = struct.Struct("<H")
+ACTION_MASK = 0x07
+FOOD_FLAG = 0x08
+SUPER_FLAG = 0x10
+_DIRECTION_TO_ACTION = {direction: action for action, direction in ACTION_TO_DIRECTION.items()}
+
+
+class EpisodeLog(NamedTuple):
+    """A decoded episode: enough to replay it through ``Game`` step by step."""
+    board_dim: int
+    seed: Optional[int]
+    init_body: List[Tuple[int, int]]
+    init_direction: Direction
+    actions: List[int]
+    # Step number (``Game.steps_elapsed``) -> (is superfood, position) of the food placed on that step
+    placements: Dict[int, Tuple[bool, Tuple[int, int]]]
+
+
+def placed_food(food_before: Optional[Food], food_after: Optional[Food]) -> Optional[Food]:
+    """
+    The food placed during a step, given ``Game.current_food`` before and
+    after it. Food that was placed and eaten on the same step is inactive
+    by then but still has its position, so it counts.
+    """
+    if food_after is food_before or food_after is None or food_after.position is None:
+        return None
+    return food_after
+
+
+class EpisodeRecorder:
+    """
+    Records episodes as a few bytes per step and writes one ``.snkrec`` file
+    per episode into a folder per run.
+    """
+    def __init__(self, folder: Union[str, Path]):
+        self.folder = Path(folder) / f"run_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+        self._buffer: Optional[bytearray] = None
+        self._episode: int = 0
+
+    def start(self, game: Game, seed: Optional[int], episode: int) -> None:
+        """Begins a new episode from the freshly reset ``game``."""
+        board_dim = game.game_config["BOARD_DIM"]
+        body = game.snake.get_body()
+        self._buffer = bytearray(_HEADER.pack(MAGIC, VERSION, board_dim, -1 if seed is None else seed,
+                                              _DIRECTION_TO_ACTION[game.snake.direction], len(body)))
+        for pos in body:
+            self._buffer += _CELL.pack(to_cell(pos, board_dim))
+        self._board_dim = board_dim
+        self._episode = episode
+
+    def record_step(self, action: int, spawned_food: Optional[Food] = None) -> None:
+        """
+        Args:
+            action: Action taken on this step
+            spawned_food: Food placed during this step, if any
+        """
+        if self._buffer is None:
+            return
+        if spawned_food is None:
+            self._buffer.append(int(action))
+            return
+        flags = FOOD_FLAG | (SUPER_FLAG if isinstance(spawned_food, SuperFood) else 0)
+        self._buffer.append(int(action) | flags)
+        self._buffer += _CELL.pack(to_cell(spawned_food.position, self._board_dim))
+
+    def to_bytes(self) -> bytes:
+        return bytes(self._buffer or b"")
+
+    def finish(self) -> Optional[Path]:
+        """Writes the current episode, if any, and returns its path."""
+        if self._buffer is None:
+            return None
+        self.folder.mkdir(parents=True, exist_ok=True)
+        path = self.folder / f"episode_{self._episode:06d}.snkrec"
+        path.write_bytes(self._buffer)
+        self._buffer = None
+        logger.debug("Recorded episode {} to {}", self._episode, path)
+        return path
+
+
+def read_episode(data: Union[bytes, str, Path]) -> EpisodeLog:
+    """Decodes an episode log from bytes or a ``.snkrec`` file."""
+    if not isinstance(data, (bytes, bytearray)):
+        data = Path(data).read_bytes()
+    magic, version, board_dim, seed, direction, body_length = _HEADER.unpack_from(data)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError(f"Not a version {VERSION} episode log")
+    coords = cell_coords(board_dim)
+    offset = _HEADER.size
+    init_body = []
+    for _ in range(body_length):
+        init_body.append(coords[_CELL.unpack_from(data, offset)[0]])
+        offset += _CELL.size
+
+    actions: List[int] = []
+    placements: Dict[int, Tuple[bool, Tuple[int, int]]] = {}
+    while offset < len(data):
+        code = data[offset]
+        offset += 1
+        actions.append(code & ACTION_MASK)
+        if code & FOOD_FLAG:
+            placements[len(actions)] = (bool(code & SUPER_FLAG), coords[_CELL.unpack_from(data, offset)[0]])
+            offset += _CELL.size
+    return EpisodeLog(board_dim, None if seed < 0 else seed, init_body,
+                      ACTION_TO_DIRECTION[direction], actions, placements)
+
+
+class ReplayGame(Game):
+    """A ``Game`` that starts from a recorded board and places the recorded food."""
+    def __init__(self, game_config: Dict[str, Any], log: EpisodeLog):
+        if log.board_dim != game_config["BOARD_DIM"]:
+            raise ValueError(f"Episode was recorded on a {log.board_dim}x{log.board_dim} board, "
+                             f"config has BOARD_DIM {game_config['BOARD_DIM']}")
+        self.log = log
+        super().__init__(game_config=game_config,
+                         data_config={"HIGH_SCORE_FILE_PATH": None},
+                         record_results=False)
+
+    def reset(self, seed: Optional[int] = None) -> None:
+        super().reset(seed)
+        self.snake.body = list(self.log.init_body)
+        self.snake.direction = self.log.init_direction
+
+    def _spawn_food(self) -> Food:
+        placement = self.log.placements.get(self.steps_elapsed)
+        if placement is None:
+            # Nothing was placed, the board was full
+            return SimpleFood(board_dim=self.game_config["BOARD_DIM"])
+        is_super, position = placement
+        if is_super:
+            food = SuperFood(board_dim=self.game_config["BOARD_DIM"],
+                             lifetime=self.game_config["FOOD"]["SUPERFOOD_LIFETIME"])
+            food.remaining_steps = food.lifetime
+        else:
+            food = SimpleFood(board_dim=self.game_config["BOARD_DIM"])
+        food.position = position
+        food.active = True
+        return food
+
+
+def replay(log: EpisodeLog, game_config: Dict[str, Any]) -> Iterator[Game]:
+    """Yields the game after the reset and after every recorded step."""
+    game = ReplayGame(game_config, log)
+    yield game
+    for action in log.actions:
+        game.fast_step(action)
+        yield game
+
+
+def render_episode(log: EpisodeLog,
+                   game_config: Dict[str, Any],
+                   ui_config: Dict[str, Any],
+                   frames_dir: Union[str, Path, None] = None,
+                   gif_path: Union[str, Path, None] = None,
+                   fps: int = 10,
+                   episode: int = 0) -> int:
+    """
+    Re-renders a recorded episode with a headless UI, to PNG frames and/or a GIF.
+    Returns:
+        int: Number of frames rendered
+    """
+    renderer = HeadlessFrameRenderer(ui_config, game_config)
+    frames = (SpectatorFrame.from_game(game, episode) for game in replay(log, game_config))
+    try:
+        return write_frames(renderer, frames, frames_dir=frames_dir, gif_path=gif_path, fps=fps)
+    finally:
+        renderer.close()
+
+
+def main() -> None:
+    from src.config import config as app_config
+
+    parser = argparse.ArgumentParser(description="Replay a recorded Snake episode and re-render it headless")
+    parser.add_argument("episode", type=Path, help="Path to a .snkrec episode log")
+    parser.add_argument("--frames", type=Path, help="Folder to write PNG frames to")
+    parser.add_argument("--gif", type=Path, help="GIF file to write")
+    parser.add_argument("--fps", type=int, default=10, help="GIF frame rate")
+    args = parser.parse_args()
+
+    log = read_episode(args.episode)
+    final = None
+    for final in replay(log, app_config.get_game_config()):
+        pass
+    logger.info(f"Episode: {len(log.actions)} steps, {final.food_count} food, score {final.score}")
+    if args.frames or args.gif:
+        count = render_episode(log, app_config.get_game_config(), app_config.get_ui_config(),
+                               frames_dir=args.frames, gif_path=args.gif, fps=args.fps)
+        logger.info(f"Rendered {count} frames")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,224 @@
+import atexit
+import queue
+import sqlite3
+import threading
+import time
+from uuid import uuid4
+from contextlib import closing
+from datetime import datetime
+from pathlib import Path
+from typing import Optional, Dict, Any, List, Sequence, Tuple, Union
+import numpy as np
+from src.utils.logger import logger
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    run_id TEXT NOT NULL,
+    game_id TEXT NOT NULL,
+    finished_at TEXT NOT NULL,
+    steps_elapsed INTEGER NOT NULL,
+    food_count INTEGER NOT NULL,
+    score REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS results_run_id ON results (run_id);
+"""
+_COLUMNS = ("run_id", "game_id", "finished_at", "steps_elapsed", "food_count", "score")
+
+# Queue markers for the writer thread
+_FLUSH = object()
+_STOP = object()
+
+
+def results_db_path(data_config: Dict[str, Any]) -> Path:
+    """``RESULTS_DB_PATH`` if configured, else the scores file with a ``.db`` suffix."""
+    if data_config.get("RESULTS_DB_PATH"):
+        return Path(data_config["RESULTS_DB_PATH"])
+    return Path(data_config["SCORES_FILE_PATH"]).with_suffix(".db")
+
+
+def read_high_score(path: Union[str, Path, None]) -> float:
+    """High score from the legacy text file, 0 if it is missing or unreadable."""
+    if path is None:
+        return 0
+    try:
+        return float(Path(path).read_text(encoding="utf-8"))
+    except (ValueError, OSError):
+        return 0
+
+
+class ResultsStore:
+    """
+    Game results kept in a SQLite table, written in batches by a background
+    thread so finishing an episode never waits on disk.
+
+    The high score lives in memory: it is seeded from the legacy high score
+    file and the database, raised by every recorded result and written back to
+    the file by the writer thread. After each batch the writer also reads the
+    best score in the database, so several processes sharing one database
+    agree on the high score.
+
+    One store is shared by every ``Game`` using the same database path, see
+    ``for_path``.
+    """
+    _instances: Dict[Path, "ResultsStore"] = {}
+    _instances_lock = threading.Lock()
+
+    def __init__(self,
+                 db_path: Union[str, Path],
+                 high_score_path: Union[str, Path, None] = None,
+                 run_id: Optional[str] = None,
+                 flush_interval: float = 1.0,
+                 batch_size: int = 256):
+        self.db_path = Path(db_path)
+        self.high_score_path = Path(high_score_path) if high_score_path else None
+        self.run_id = run_id or datetime.now().strftime("%Y%m%d_%H%M%S")
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self._queue: queue.Queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._writer: Optional[threading.Thread] = None
+        self._high_score = max(read_high_score(self.high_score_path), self._read_db_high_score())
+        self._written_high_score = self._high_score
+
+    @classmethod
+    def for_path(cls, db_path: Union[str, Path], **kwargs) -> "ResultsStore":
+        """The store shared by everyone writing to ``db_path`` in this process."""
+        key = Path(db_path).resolve()
+        with cls._instances_lock:
+            if key not in cls._instances or cls._instances[key].closed:
+                cls._instances[key] = cls(db_path, **kwargs)
+            return cls._instances[key]
+
+    @property
+    def high_score(self) -> float:
+        return self._high_score
+
+    @property
+    def closed(self) -> bool:
+        return self._writer is not None and not self._writer.is_alive()
+
+    def _connect(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(self.db_path, timeout=30)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.executescript(_SCHEMA)
+        return connection
+
+    def _read_db_high_score(self) -> float:
+        if not self.db_path.exists():
+            return 0
+        try:
+            with closing(self._connect()) as connection:
+                best = connection.execute("SELECT MAX(score) FROM results").fetchone()[0]
+        except sqlite3.Error as e:
+            logger.warning(f"Could not read high score from {self.db_path}: {e}")
+            return 0
+        return best or 0
+
+    def record(self, result: Dict[str, Any]) -> None:
+        """
+        Queues one finished game and updates the in-memory high score.
+        Args:
+            result: Game state with ``steps_elapsed``, ``food_count`` and ``score``,
+                optionally ``game_id`` and ``updated_at``
+        """
+        finished_at = result.get("updated_at") or datetime.now()
+        if isinstance(finished_at, datetime):
+            finished_at = finished_at.isoformat(sep=" ", timespec="seconds")
+        row = (self.run_id,
+               result.get("game_id") or str(uuid4()),
+               finished_at,
+               int(result["steps_elapsed"]),
+               int(result["food_count"]),
+               float(result["score"]))
+        with self._lock:
+            self._high_score = max(self._high_score, row[-1])
+            if self._writer is None:
+                self._start_writer()
+        self._queue.put(row)
+
+    def _start_writer(self) -> None:
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._writer = threading.Thread(target=self._run, name="ResultsStoreWriter", daemon=True)
+        self._writer.start()
+        atexit.register(self.close)
+
+    def _run(self) -> None:
+        connection = self._connect()
+        running = True
+        while running:
+            # Wait for a first row, then gather more for up to flush_interval
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size and isinstance(batch[-1], tuple):
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=timeout))
+                except queue.Empty:
+                    break
+            rows = [item for item in batch if isinstance(item, tuple)]
+            try:
+                if rows:
+                    self._write(connection, rows)
+            except (sqlite3.Error, OSError) as e:
+                logger.error(f"Could not write {len(rows)} game results to {self.db_path}: {e}")
+            finally:
+                running = _STOP not in batch
+                for _ in batch:
+                    self._queue.task_done()
+        connection.close()
+
+    def _write(self, connection: sqlite3.Connection, rows: List[Tuple[Any, ...]]) -> None:
+        with connection:
+            connection.executemany(
+                f"INSERT INTO results ({', '.join(_COLUMNS)}) VALUES ({', '.join('?' * len(_COLUMNS))})", rows)
+        best = connection.execute("SELECT MAX(score) FROM results").fetchone()[0] or 0
+        with self._lock:
+            self._high_score = max(self._high_score, best)
+            high_score = self._high_score
+        if self.high_score_path and high_score > self._written_high_score:
+            self.high_score_path.parent.mkdir(parents=True, exist_ok=True)
+            self.high_score_path.write_text(str(high_score), encoding="utf-8")
+            self._written_high_score = high_score
+
+    def flush(self) -> None:
+        """Blocks until every queued result is written."""
+        if self._writer is not None and self._writer.is_alive():
+            self._queue.put(_FLUSH)
+            self._queue.join()
+
+    def close(self) -> None:
+        if self._writer is not None and self._writer.is_alive():
+            self._queue.put(_STOP)
+            self._writer.join()
+
+    def _query(self, sql: str, params: Sequence[Any] = ()) -> List[Tuple[Any, ...]]:
+        self.flush()
+        if not self.db_path.exists():
+            return []
+        with closing(self._connect()) as connection:
+            return connection.execute(sql, params).fetchall()
+
+    def last_n(self, n: int = 10, run_id: Optional[str] = None) -> List[Dict[str, Any]]:
+        """The ``n`` most recent results, newest first, optionally for one run."""
+        where, params = ("WHERE run_id = ?", (run_id,)) if run_id else ("", ())
+        rows = self._query(f"SELECT {', '.join(_COLUMNS)} FROM results {where} ORDER BY id DESC LIMIT ?",
+                           (*params, n))
+        return [dict(zip(_COLUMNS, row)) for row in rows]
+
+    def percentiles(self,
+                    q: Sequence[float] = (50, 90, 99),
+                    run_id: Optional[str] = None) -> Dict[float, float]:
+        """Score percentiles over all results, or one run's; empty if nothing is recorded."""
+        where, params = ("WHERE run_id = ?", (run_id,)) if run_id else ("", ())
+        scores = np.array([row[0] for row in self._query(f"SELECT score FROM results {where}", params)])
+        if scores.size == 0:
+            return {}
+        return dict(zip(q, np.percentile(scores, q).tolist()))
+
+    def best_by_run(self) -> Dict[str, float]:
+        """Best score of every run."""
+        return dict(self._query("SELECT run_id, MAX(score) FROM results GROUP BY run_id ORDER BY run_id"))
@@ -1,10 +1,29 @@
-from typing import Tuple, List
+from typing import Tuple, List, Iterator, NamedTuple, Optional
 from src.game.direction import Direction
-from src.utils.utils import add_tuples
+from src.game.grid import to_cell, cell_coords, neighbour_table
+from src.game.free_cells import FreeCellSet
+
+
+class SnakeSnapshot(NamedTuple):
+    """Raw copy of a snake's ring buffer, grids and flags, see ``Snake.snapshot``."""
+    ring: Tuple[int, ...]
+    head_idx: int
+    length: int
+    occupancy: bytes
+    free_cells: Tuple[Tuple[int, ...], Tuple[int, ...]]
+    direction: Direction
+    growth_pending: bool
+    alive: bool
 
 
 class Snake:
-    def __init__(self, 
+    """
+    Snake body kept in a fixed-capacity ring buffer of cell ids plus a
+    ``board_dim x board_dim`` occupancy grid, so moving, growing and
+    collision checks cost the same whatever the snake's length. The
+    ``free_cells`` set is kept in step with the grid for food placement.
+    """
+    def __init__(self,
                  board_dim: int,
                  init_pos: Tuple[int, int],
                  init_length: int,
@@ -15,14 +34,61 @@ class Snake:
         self.direction = self.init_direction = init_direction
         self.growth_pending: bool = False
         self.alive: bool = True
+        self._capacity: int = board_dim ** 2
+        self._coords = cell_coords(board_dim)
+        self._neighbours = neighbour_table(board_dim)
+        # Bumped whenever the body is replaced, so renderers can tell moves from new bodies
+        self._generation: int = 0
+        self._moves: int = 0
         self._set_body()
-    
+
     def _set_body(self) -> None:
         opposite_dir = Direction.get_opposite(self.init_direction)
         dx, dy = opposite_dir.value
-        self.body: List[Tuple[int, int]] = [(self.init_pos[0] + dx * i, 
-                                             self.init_pos[1] + dy * i) for i in range(self.init_length)]
-        
+        self.body = [(self.init_pos[0] + dx * i,
+                      self.init_pos[1] + dy * i) for i in range(self.init_length)]
+
+    @property
+    def body(self) -> Tuple[Tuple[int, int], ...]:
+        """
+        Read-only copy of the body, head first, built on every access. Assign
+        a new body to change it; hot paths use ``iter_body``/``get_head``.
+        """
+        return tuple(self.iter_body())
+
+    @body.setter
+    def body(self, body: List[Tuple[int, int]]) -> None:
+        if len(body) > self._capacity:
+            raise ValueError(f"Snake body of length {len(body)} does not fit a {self.board_dim}x{self.board_dim} board")
+        # Ring buffer runs tail -> head, the head sits at self._head_idx
+        self._ring: List[int] = [0] * self._capacity
+        self.occupancy: bytearray = bytearray(self._capacity)
+        self.free_cells: FreeCellSet = FreeCellSet(self.board_dim)
+        self._length: int = len(body)
+        self._head_idx: int = self._length - 1
+        self._generation += 1
+        for i, pos in enumerate(body):
+            cell = to_cell(pos, self.board_dim)
+            self._ring[self._head_idx - i] = cell
+            self.occupancy[cell] += 1
+            self.free_cells.remove(cell)
+
+    def snapshot(self) -> SnakeSnapshot:
+        """Immutable copy of the internal buffers, restored without rebuilding them."""
+        return SnakeSnapshot(tuple(self._ring), self._head_idx, self._length, bytes(self.occupancy),
+                             self.free_cells.snapshot(), self.direction, self.growth_pending, self.alive)
+
+    def restore(self, snapshot: SnakeSnapshot) -> None:
+        self._ring[:] = snapshot.ring
+        self._head_idx = snapshot.head_idx
+        self._length = snapshot.length
+        self.occupancy[:] = snapshot.occupancy
+        self.free_cells.restore(snapshot.free_cells)
+        self.direction = snapshot.direction
+        self.growth_pending = snapshot.growth_pending
+        self.alive = snapshot.alive
+        self._generation += 1
+
     def set_direction(self, new_direction: Direction) -> None:
         if not Direction.is_opposite(self.direction, new_direction):
             self.direction = new_direction
@@ -30,45 +96,83 @@ class Snake:
     def move(self) -> None:
         if not self.alive:
             return
-        head = self.body[0]
-        new_head = add_tuples(head, self.direction.value)
-        # Handle wrapping around the edges with pygame coordinates (0,0 at top-left)
-        if new_head[0] < 0:
-            new_head = (self.board_dim - 1, new_head[1])
-        elif new_head[0] >= self.board_dim:
-            new_head = (0, new_head[1])
-        elif new_head[1] < 0:
-            new_head = (new_head[0], self.board_dim - 1)
-        elif new_head[1] >= self.board_dim:
-            new_head = (new_head[0], 0)
-        self.body.insert(0, new_head)
-        if self.growth_pending:
-            self.growth_pending = False
+        ring = self._ring
+        new_head = self._neighbours[self.direction][ring[self._head_idx]]
+        if self.growth_pending and self._length < self._capacity:
+            self._length += 1
         else:
-            self.body.pop()
+            tail = ring[(self._head_idx - self._length + 1) % self._capacity]
+            self.occupancy[tail] -= 1
+            if not self.occupancy[tail]:
+                self.free_cells.add(tail)
+        self.growth_pending = False
+        self._head_idx = (self._head_idx + 1) % self._capacity
+        ring[self._head_idx] = new_head
+        self.occupancy[new_head] += 1
+        self.free_cells.remove(new_head)
+        self._moves += 1
+
+    def body_version(self) -> Tuple[int, int, int]:
+        """Marker of the current body, to pass to ``changed_since`` later."""
+        return (self._generation, self._moves, self._length)
+
+    def changed_since(self, version: Tuple[int, int, int]) -> Optional[List[Tuple[int, int]]]:
+        """
+        Cells whose content may differ from when ``body_version`` returned
+        ``version``: the old head, every cell the head moved into and the
+        vacated tail cells, read back from the ring buffer in O(moves).
+        None when the body was replaced or the ring has been overwritten since.
+        """
+        generation, moves, length = version
+        steps = self._moves - moves
+        if generation != self._generation or self._length < length or steps + length > self._capacity:
+            return None
+        if steps == 0:
+            return []
+        ring, coords, capacity = self._ring, self._coords, self._capacity
+        old_head_idx = self._head_idx - steps
+        cells = [coords[ring[(old_head_idx + i) % capacity]] for i in range(steps + 1)]
+        old_tail_idx = old_head_idx - length + 1
+        vacated = steps - (self._length - length)
+        cells.extend(coords[ring[(old_tail_idx + i) % capacity]] for i in range(vacated))
+        return cells
+
+    def occupies(self, pos: Tuple[int, int]) -> bool:
+        return self.occupancy[to_cell(pos, self.board_dim)] > 0
 
     def check_collision(self) -> bool:
-        head = self.body[0]
-        return head in self.body[1:]
+        return self.occupancy[self._ring[self._head_idx]] > 1
 
     def __len__(self):
-        return len(self.body)
-    
+        return self._length
+
     def get_head(self) -> Tuple[int, int]:
-        return self.body[0]
+        return self._coords[self._ring[self._head_idx]]
+
+    def get_head_cell(self) -> int:
+        return self._ring[self._head_idx]
+
+    def iter_body(self) -> Iterator[Tuple[int, int]]:
+        """Body cells from head to tail without building a list."""
+        ring, coords, capacity = self._ring, self._coords, self._capacity
+        for i in range(self._length):
+            yield coords[ring[(self._head_idx - i) % capacity]]
 
     def get_body(self) -> List[Tuple[int, int]]:
-        return self.body
+        return list(self.iter_body())
 
     def get_direction(self) -> Direction:
         return self.direction
 
     def kill(self) -> None:
         self.alive = False
-        
+
     def __eq__(self, other: object) -> bool:
         if not isinstance(other, Snake):
             return False
-        return all([self.body == other.body, 
-                    self.direction == other.direction])
-        
\ No newline at end of file
+        if self is other:
+            return True
+        return all([self._length == other._length,
+                    self.direction == other.direction,
+                    self.get_body() == other.get_body()])
+
@@ -0,0 +1,149 @@
+import multiprocessing as mp
+import queue
+import time
+from typing import Optional, Dict, Any, Tuple, NamedTuple
+from src.game.direction import Direction
+from src.game.food import Food, SimpleFood, SuperFood
+from src.game.game import Game
+from src.game.snake import Snake
+from src.utils.logger import logger
+
+
+class SpectatorFrame(NamedTuple):
+    """Everything the viewer needs to draw one step, small enough to pickle every step."""
+    episode: int
+    body: Tuple[Tuple[int, int], ...]
+    food_is_super: bool
+    food_position: Optional[Tuple[int, int]]
+    food_remaining: int
+    score: float
+    high_score: float
+    is_game_over: bool
+
+    @classmethod
+    def from_game(cls, game: Game, episode: int) -> "SpectatorFrame":
+        food = game.current_food
+        active = food is not None and food.active
+        return cls(episode,
+                   tuple(game.snake.iter_body()),
+                   isinstance(food, SuperFood),
+                   food.position if active else None,
+                   getattr(food, "remaining_steps", 0),
+                   game.score,
+                   game.high_score,
+                   game.is_game_over)
+
+
+class Spectator:
+    """
+    Shows the game in a separate viewer process, so watching never slows the
+    learner down.
+
+    ``publish`` puts a ``SpectatorFrame`` on a bounded queue without waiting.
+    When the viewer falls behind, new frames are dropped until it catches
+    up, and ``dropped`` counts them. The viewer
+    draws the frames with the regular ``UI``, at most ``fps`` per second. The
+    process starts with the first frame and ends on ``close`` or when its
+    window is closed.
+    """
+    def __init__(self,
+                 ui_config: Dict[str, Any],
+                 game_config: Dict[str, Any],
+                 queue_size: int = 64,
+                 fps: float = 10.0,
+                 start_method: Optional[str] = None):
+        self.ui_config = ui_config
+        self.game_config = game_config
+        self.fps = fps
+        self._context = mp.get_context(start_method)
+        self._queue = self._context.Queue(maxsize=max(queue_size, 1))
+        self._process: Optional[mp.process.BaseProcess] = None
+        self.dropped: int = 0
+
+    @property
+    def alive(self) -> bool:
+        return self._process is not None and self._process.is_alive()
+
+    def publish(self, frame: SpectatorFrame) -> None:
+        if self._process is None:
+            self._process = self._context.Process(target=_run_viewer,
+                                                  args=(self._queue, self.ui_config, self.game_config, self.fps),
+                                                  name="SnakeSpectator", daemon=True)
+            self._process.start()
+        elif not self._process.is_alive():
+            return
+        try:
+            self._queue.put_nowait(frame)
+        except queue.Full:
+            # The learner never waits for the viewer, a frame that does not fit is dropped
+            self.dropped += 1
+
+    def close(self, timeout: float = 2.0) -> None:
+        if self._process is None:
+            return
+        if self._process.is_alive():
+            try:
+                self._queue.put(None, timeout=timeout)
+            except queue.Full:
+                pass
+            self._process.join(timeout)
+            if self._process.is_alive():
+                self._process.terminate()
+                self._process.join()
+        self._queue.close()
+        self._queue.cancel_join_thread()
+        self._process = None
+        if self.dropped:
+            logger.debug("Spectator dropped {} frames", self.dropped)
+
+
+def _frame_food(frame: SpectatorFrame, game_config: Dict[str, Any]) -> Food:
+    if frame.food_is_super:
+        food = SuperFood(board_dim=game_config["BOARD_DIM"], lifetime=game_config["FOOD"]["SUPERFOOD_LIFETIME"])
+        food.remaining_steps = frame.food_remaining
+    else:
+        food = SimpleFood(board_dim=game_config["BOARD_DIM"])
+    if frame.food_position is not None:
+        food.position = frame.food_position
+        food.active = True
+    return food
+
+
+def _run_viewer(frames: mp.Queue,
+                ui_config: Dict[str, Any],
+                game_config: Dict[str, Any],
+                fps: float) -> None:
+    """Viewer process: draws frames from the queue, paced to ``fps``."""
+    # pygame is imported here so the learner process never needs a display for this
+    import pygame
+    from src.game.ui import UI
+
+    snake_config = game_config["SNAKE"]
+    snake = Snake(board_dim=game_config["BOARD_DIM"],
+                  init_pos=snake_config["SNAKE_INIT_POS"],
+                  init_length=snake_config["SNAKE_INIT_LENGTH"],
+                  init_direction=Direction[snake_config["SNAKE_INIT_DIRECTION"]])
+    ui: Optional[UI] = None
+    interval = 1.0 / fps if fps > 0 else 0.0
+    next_frame_at = time.monotonic()
+    try:
+        while True:
+            frame = frames.get()
+            if frame is None:
+                break
+            snake.body = list(frame.body)
+            food = _frame_food(frame, game_config)
+            if ui is None:
+                ui = UI(ui_config=ui_config, snake=snake, episode=frame.episode, food=food,
+                        score=frame.score, high_score=frame.high_score)
+            else:
+                ui.reset(snake=snake, food=food, score=frame.score,
+                         high_score=frame.high_score, episode=frame.episode)
+            ui.full_render(is_game_over=frame.is_game_over)
+            if any(event.type == pygame.QUIT for event in pygame.event.get()):
+                break
+            next_frame_at = max(next_frame_at + interval, time.monotonic())
+            time.sleep(max(next_frame_at - time.monotonic(), 0.0))
+    finally:
+        if ui is not None:
+            ui.close()
@@ -0,0 +1,178 @@
+import random
+import multiprocessing as mp
+from multiprocessing import shared_memory
+from multiprocessing.connection import Connection
+from typing import Optional, Dict, Any, Tuple, List
+import numpy as np
+from gym import spaces
+from src.game.env import SnakeEnv, make_observation_space
+from src.config import ConfigManager
+from src.utils.logger import logger
+
+
+def _worker(remote: Connection,
+            parent_remote: Connection,
+            app_config: ConfigManager,
+            env_idx: int,
+            shm_name: str,
+            obs_shape: Tuple[int, ...],
+            seed: Optional[int]) -> None:
+    parent_remote.close()
+    # Forked workers inherit the parent's RNG state, so every board would play the same game
+    random.seed(None if seed is None else seed + env_idx)
+    np.random.seed(None if seed is None else seed + env_idx)
+
+    shm = shared_memory.SharedMemory(name=shm_name)
+    env = SnakeEnv(app_config)
+    slots = np.ndarray(obs_shape, dtype=env.observation_space.dtype, buffer=shm.buf)
+    max_steps = env.training_config.get("MAX_TIMESTEPS_PER_EPISODE")
+    episode_return, episode_length = 0.0, 0
+    try:
+        while True:
+            command, data = remote.recv()
+            if command == "step":
+                action, slot = data
+                reward, terminated = env.tick(action)
+                episode_return += reward
+                episode_length += 1
+                truncated = bool(max_steps and episode_length >= max_steps and not terminated)
+                if terminated or truncated:
+                    # The parent only sees the new board, so the terminal one is never drawn
+                    info = env.game.get_info()
+                    info["episode"] = {"r": episode_return, "l": episode_length, "score": info["score"]}
+                    episode_return, episode_length = 0.0, 0
+                    slots[slot, env_idx], _ = env.reset()
+                else:
+                    _, info = env.observe(out=slots[slot, env_idx])
+                remote.send((reward, terminated, truncated, info))
+            elif command == "reset":
+                seed_value, slot = data
+                slots[slot, env_idx], info = env.reset(seed=seed_value)
+                episode_return, episode_length = 0.0, 0
+                remote.send(info)
+            elif command == "close":
+                break
+            else:
+                raise ValueError(f"Unknown command: {command}")
+    except KeyboardInterrupt:
+        pass
+    finally:
+        del slots
+        env.close()
+        shm.close()
+        remote.close()
+
+
+class SubprocVecEnv:
+    """
+    Runs ``num_envs`` ``SnakeEnv`` instances in worker processes and steps them
+    in lockstep.
+
+    Observations are never pickled: workers render straight into one
+    ``multiprocessing.shared_memory`` block holding two ``(num_envs, C, H, W)``
+    slots, written alternately, so the batch returned by the previous call
+    stays intact while the next one is drawn. Only actions, rewards, flags and
+    info dicts travel over the pipes.
+
+    Finished episodes (termination or ``MAX_TIMESTEPS_PER_EPISODE``) are reset
+    automatically; their info dict carries ``"episode"`` with the return
+    ``"r"``, length ``"l"`` and final ``"score"``, and the returned observation
+    already shows the new board.
+    """
+    def __init__(self,
+                 app_config: ConfigManager,
+                 num_envs: int,
+                 seed: Optional[int] = None,
+                 start_method: Optional[str] = None):
+        self.num_envs = num_envs
+        model_config = app_config.get_model_config()
+        self.observation_space = make_observation_space(model_config, app_config.get_ui_config())
+        self.action_space = spaces.Discrete(model_config["NUM_ACTIONS"])
+
+        obs_shape = (2, num_envs) + self.observation_space.shape
+        nbytes = int(np.prod(obs_shape)) * np.dtype(self.observation_space.dtype).itemsize
+        self._shm = shared_memory.SharedMemory(create=True, size=nbytes)
+        self._obs = np.ndarray(obs_shape, dtype=self.observation_space.dtype, buffer=self._shm.buf)
+        self._slot: int = 0
+
+        ctx = mp.get_context(start_method)
+        self.remotes, self.processes = [], []
+        for env_idx in range(num_envs):
+            remote, work_remote = ctx.Pipe()
+            process = ctx.Process(target=_worker,
+                                  args=(work_remote, remote, app_config, env_idx,
+                                        self._shm.name, obs_shape, seed),
+                                  daemon=True)
+            process.start()
+            work_remote.close()
+            self.remotes.append(remote)
+            self.processes.append(process)
+        self.closed: bool = False
+        self._waiting: bool = False
+        logger.info(f"Started SubprocVecEnv with {num_envs} workers")
+
+    def _next_slot(self) -> int:
+        self._slot ^= 1
+        return self._slot
+
+    def reset(self, seed: Optional[int] = None) -> Tuple[np.ndarray, List[Dict[str, Any]]]:
+        """
+        Returns:
+            tuple: (obs, infos), ``obs`` being a ``(num_envs, C, H, W)`` view
+            into shared memory that stays valid until the next-but-one call
+        """
+        slot = self._next_slot()
+        for env_idx, remote in enumerate(self.remotes):
+            remote.send(("reset", (None if seed is None else seed + env_idx, slot)))
+        infos = [remote.recv() for remote in self.remotes]
+        return self._obs[slot], infos
+
+    def step_async(self, actions: np.ndarray) -> None:
+        slot = self._next_slot()
+        for remote, action in zip(self.remotes, np.asarray(actions).tolist()):
+            remote.send(("step", (action, slot)))
+        self._waiting = True
+
+    def step_wait(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, List[Dict[str, Any]]]:
+        results = [remote.recv() for remote in self.remotes]
+        self._waiting = False
+        rewards, terminated, truncated, infos = zip(*results)
+        return (self._obs[self._slot],
+                np.array(rewards, dtype=np.float64),
+                np.array(terminated, dtype=bool),
+                np.array(truncated, dtype=bool),
+                list(infos))
+
+    def step(self, actions: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, List[Dict[str, Any]]]:
+        """
+        Args:
+            actions: (num_envs,) array of actions, same codes as ``SnakeEnv.step``
+        Returns:
+            tuple: (obs, rewards, terminated, truncated, infos)
+        """
+        self.step_async(actions)
+        return self.step_wait()
+
+    def close(self) -> None:
+        if self.closed:
+            return
+        if self._waiting:
+            for remote in self.remotes:
+                remote.recv()
+        for remote in self.remotes:
+            remote.send(("close", None))
+        for process in self.processes:
+            process.join()
+        for remote in self.remotes:
+            remote.close()
+        del self._obs
+        self._shm.close()
+        self._shm.unlink()
+        self.closed = True
+        logger.info("Closed SubprocVecEnv")
+
+    def __enter__(self) -> "SubprocVecEnv":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
@@ -4,7 +4,28 @@ import numpy as np
 from src.game.snake import Snake
 from src.game.food import Food, SuperFood
 from src.game.colour import Colour
-from src.utils.logger import logger
+from src.game.observation import validate_buffer
+from src.utils.logger import logger, DebugSampler
+
+
+# Kinds of sprites a board cell can hold
+HEAD, BODY, SIMPLE_FOOD, SUPER_FOOD = "head", "body", "simple_food", "super_food"
+
+# Rendered text surfaces kept before the glyph cache is cleared
+GLYPH_CACHE_SIZE = 512
+
+_step_debug = DebugSampler(__name__)
+
+
+class _SurfaceState:
+    """What is currently drawn on one target surface, so frames only redraw changes."""
+    def __init__(self):
+        self.valid: bool = False
+        # The snake and its body_version as drawn, and the drawn food cell and kind
+        self.snake: Optional[Snake] = None
+        self.snake_version: Optional[Tuple[int, int, int]] = None
+        self.food: Optional[Tuple[Tuple[int, int], str]] = None
+        self.hud: Optional[Tuple[Any, ...]] = None
 
 
 class UI:
@@ -14,9 +35,15 @@ class UI:
                  episode: int,
                  food: Optional[Food] = None,
                  score: Optional[int] = 0,
-                 high_score: Optional[int] = 0):
-        logger.debug(f"Initializing UI for episode {episode}")
-        pygame.init()
+                 high_score: Optional[int] = 0,
+                 headless: bool = False):
+        logger.debug("Initializing UI for episode {}", episode)
+        # Headless UIs only draw onto off-screen surfaces, so the display is never touched
+        self.headless = headless
+        if headless:
+            pygame.font.init()
+        else:
+            pygame.init()
         self.ui_config = ui_config
         self.board_width: int = self.ui_config["BOARD_DIM"]
         self.board_height: int = self.ui_config["BOARD_DIM"]
@@ -46,34 +73,64 @@ class UI:
         self.score_rect: Optional[pygame.Rect] = None
         self.food_lifetime_rect: Optional[pygame.Rect] = None
         self.board_rect: Optional[pygame.Rect] = None
-        self.snake_rect: Optional[pygame.Rect] = None
-        self.food_rect: Optional[pygame.Rect] = None
         self.game_over_rect: Optional[pygame.Rect] = None
         self.font_game_over: Optional[pygame.font.Font] = None
         self._is_initialized: bool = False
         self.headless_surface: Optional[pygame.Surface] = None
+        
+        # Pre-rendered static layers (background, title, HUD frame, board, grid)
+        self._static_layer: Optional[pygame.Surface] = None
+        self._static_key: Optional[Tuple[int, int, int]] = None
+        self._screen_state = _SurfaceState()
+        self._headless_state = _SurfaceState()
+        
+        # Board-only observation surface, drawn without any of the HUD
+        self._board_layer: Optional[pygame.Surface] = None
+        self._board_surface: Optional[pygame.Surface] = None
+        self._board_state = _SurfaceState()
+        
+        # Fonts are loaded once and text surfaces are rendered once per string
+        self._font_cache: Dict[Tuple[str, int], pygame.font.Font] = {}
+        self._glyph_cache: Dict[Tuple[str, str, int, str], pygame.Surface] = {}
+    
+    def _get_font(self, name: str, size: int) -> pygame.font.Font:
+        font = self._font_cache.get((name, size))
+        if font is None:
+            font = self._font_cache[(name, size)] = pygame.font.SysFont(name, size)
+        return font
+    
+    def _render_text(self, text: str, font_config: Dict[str, Any], colour: str) -> pygame.Surface:
+        key = (text, font_config["NAME"], font_config["SIZE"], colour)
+        glyph = self._glyph_cache.get(key)
+        if glyph is None:
+            if len(self._glyph_cache) >= GLYPH_CACHE_SIZE:
+                self._glyph_cache.clear()
+            font = self._get_font(font_config["NAME"], font_config["SIZE"])
+            glyph = self._glyph_cache[key] = font.render(text, True, Colour[colour].value)
+        return glyph
     
     def _initialize_fonts(self) -> None:
-        self.font_title = pygame.font.SysFont(
+        self.font_title = self._get_font(
             self.ui_config["TITLE"]["FONT"]["NAME"], 
             self.ui_config["TITLE"]["FONT"]["SIZE"]
         )
-        self.font_score = pygame.font.SysFont(
+        self.font_score = self._get_font(
             self.ui_config["SCORE"]["FONT"]["NAME"], 
             self.ui_config["SCORE"]["FONT"]["SIZE"]
         )
-        self.font_game_over = pygame.font.SysFont(
+        self.font_game_over = self._get_font(
             self.ui_config["GAME_OVER_LABEL"]["FONT"]["NAME"], 
             self.ui_config["GAME_OVER_LABEL"]["FONT"]["SIZE"]
         )
     
     def _initialize_display(self) -> None:
-        self.screen = pygame.display.set_mode((self.window_width, self.window_height))
-        pygame.display.set_caption(self.ui_config["TITLE"]["TEXT"])
+        if not self.headless:
+            self.screen = pygame.display.set_mode((self.window_width, self.window_height))
+            pygame.display.set_caption(self.ui_config["TITLE"]["TEXT"])
         self._initialize_fonts()
         self.headless_surface = pygame.Surface((self.window_width, self.window_height))
         self._is_initialized = True
-        logger.debug(f"Display initialized with dimensions: {self.window_width}x{self.window_height}")
+        logger.debug("Display initialized with dimensions: {}x{}", self.window_width, self.window_height)
     
     def _draw_title(self, surface: pygame.Surface) -> Tuple[pygame.Surface, pygame.Rect]:
         # Create a title section with a border
@@ -110,7 +167,7 @@ class UI:
         surface.blit(title_text, title_rect)
         return surface, title_section
     
-    def __draw_scores_food_lifetime_labels(self, surface: pygame.Surface) -> Tuple[pygame.Surface, pygame.Rect]:
+    def _draw_score_section(self, surface: pygame.Surface) -> Tuple[pygame.Surface, pygame.Rect]:
         # Create a score section below the title
         score_section = pygame.Rect(
             0, 
@@ -133,17 +190,21 @@ class UI:
             score_section,
             self.ui_config['BOARD']['BORDER']['THICKNESS'] // 2
         )
+        return surface, score_section
+    
+    def __draw_scores_food_lifetime_labels(self, surface: pygame.Surface) -> Tuple[pygame.Surface, pygame.Rect]:
+        score_section = self.score_rect
         
         # Render score and high score texts
-        score_text = self.font_score.render(
+        score_text = self._render_text(
             f"Current Score: {self.score}",
-            True,
-            Colour[self.ui_config["SCORE"]["COLOUR"]].value,
+            self.ui_config["SCORE"]["FONT"],
+            self.ui_config["SCORE"]["COLOUR"],
         )
-        high_score_text = self.font_score.render(
+        high_score_text = self._render_text(
             f"High Score: {self.high_score}",
-            True,
-            Colour[self.ui_config["SCORE"]["COLOUR"]].value,
+            self.ui_config["SCORE"]["FONT"],
+            self.ui_config["SCORE"]["COLOUR"],
         )
         
         # Determine the food lifetime text
@@ -159,10 +220,10 @@ class UI:
             lifetime_text = "Food: Normal"
             
         # Render food lifetime text
-        food_lifetime_text = self.font_score.render(
+        food_lifetime_text = self._render_text(
             lifetime_text,
-            True,
-            Colour[self.ui_config["FOOD_LABEL"]["COLOUR"]].value
+            self.ui_config["SCORE"]["FONT"],
+            self.ui_config["FOOD_LABEL"]["COLOUR"]
         )
         
         # Position score text on the left side of the score section
@@ -201,9 +262,6 @@ class UI:
         board_width = self.board_width * self.cell_size
         board_height = self.board_height * self.cell_size
         
-        board_bottomright_x = board_topleft_x + board_width
-        board_bottomright_y = board_topleft_y + board_height
-        
         # Create board rectangle
         board_rect = pygame.Rect(
             board_topleft_x, 
@@ -211,6 +269,13 @@ class UI:
             board_width, 
             board_height
         )
+        return self._paint_board(surface, board_rect)
+    
+    def _paint_board(self, 
+                     surface: pygame.Surface, 
+                     board_rect: pygame.Rect) -> Tuple[pygame.Surface, pygame.Rect]:
+        board_topleft_x, board_topleft_y = board_rect.topleft
+        board_bottomright_x, board_bottomright_y = board_rect.bottomright
         
         # Draw board background
         pygame.draw.rect(
@@ -249,80 +314,150 @@ class UI:
             )
         return surface, board_rect
     
-    def _draw_snake(self, 
-                    surface: pygame.Surface, 
-                    board_rect: pygame.Rect) -> Tuple[pygame.Surface, List[pygame.Rect]]:
-        snake_pygame_objects: List[pygame.Rect] = []
-        # Draw head
-        head_x, head_y = self.snake.body[0]
-        head_y = (self.board_height - 1) - head_y
-        head_top_y = board_rect.top + head_y * self.cell_size - self.ui_config["SNAKE"]["HEAD"]["STRETCH"]
-        head_bottom_y = board_rect.top + head_y * self.cell_size + self.cell_size + self.ui_config["SNAKE"]["HEAD"]["STRETCH"]
-        head_left_x = board_rect.left + head_x * self.cell_size - self.ui_config["SNAKE"]["HEAD"]["STRETCH"]
-        head_right_x = board_rect.left + head_x * self.cell_size + self.cell_size + self.ui_config["SNAKE"]["HEAD"]["STRETCH"]
-        
-        head_rect = pygame.draw.rect(
-            surface,
-            Colour[self.ui_config["SNAKE"]["HEAD"]["FILL"]].value,
-            (head_left_x, head_top_y, head_right_x - head_left_x, head_bottom_y - head_top_y)
-        )
-        snake_pygame_objects.append(head_rect)
-        
-        # Draw body
-        body_radius = self.cell_size // 2
-        for x, y in self.snake.body[1:]:
-            y = (self.board_height - 1) - y
-            body_center_x, body_center_y = (board_rect.left + x * self.cell_size + self.cell_size // 2, 
-                                            board_rect.top + y * self.cell_size + self.cell_size // 2)
-            body_circle = pygame.draw.circle(
+    def _cell_rect(self, 
+                   pos: Tuple[int, int], 
+                   board_rect: Optional[pygame.Rect] = None) -> pygame.Rect:
+        board_rect = board_rect or self.board_rect
+        x, y = pos
+        y = (self.board_height - 1) - y
+        return pygame.Rect(board_rect.left + x * self.cell_size,
+                           board_rect.top + y * self.cell_size,
+                           self.cell_size,
+                           self.cell_size)
+    
+    def _draw_cell(self, 
+                   surface: pygame.Surface, 
+                   cell_rect: pygame.Rect, 
+                   kind: str) -> pygame.Rect:
+        if kind == HEAD:
+            stretch = self.ui_config["SNAKE"]["HEAD"]["STRETCH"]
+            return pygame.draw.rect(
+                surface,
+                Colour[self.ui_config["SNAKE"]["HEAD"]["FILL"]].value,
+                cell_rect.inflate(2 * stretch, 2 * stretch)
+            )
+        if kind == BODY:
+            return pygame.draw.circle(
                 surface,
                 Colour[self.ui_config["SNAKE"]["BODY"]["FILL"]].value,
-                (body_center_x, body_center_y),
-                body_radius + self.ui_config["SNAKE"]["BODY"]["STRETCH"]
+                (cell_rect.left + self.cell_size // 2, cell_rect.top + self.cell_size // 2),
+                self.cell_size // 2 + self.ui_config["SNAKE"]["BODY"]["STRETCH"]
             )
-            snake_pygame_objects.append(body_circle)
-        return surface, snake_pygame_objects
-    
-    def _draw_food(self, 
-                   surface: pygame.Surface, 
-                   board_rect: pygame.Rect) -> Tuple[pygame.Surface, pygame.Rect]:
-        if not self.food:
-            return
-        food_x, food_y = self.food.position
-        food_y = (self.board_height - 1) - food_y 
-        food_center_x, food_center_y = (board_rect.left + food_x * self.cell_size + self.cell_size // 2, 
-                                        board_rect.top + food_y * self.cell_size + self.cell_size // 2)
-        is_super_food = isinstance(self.food, SuperFood)
-        fill_color = Colour[self.ui_config["FOOD"]["SUPER"]["FILL"]].value if is_super_food else Colour[self.ui_config["FOOD"]["SIMPLE"]["FILL"]].value
-        symbol = self.ui_config["FOOD"]["SUPER"]["SYMBOL"] if is_super_food else self.ui_config["FOOD"]["SIMPLE"]["SYMBOL"]
-        font_name = self.ui_config["FOOD"]["SUPER"]["FONT"]["NAME"] if is_super_food else self.ui_config["FOOD"]["SIMPLE"]["FONT"]["NAME"]
-        font_size = self.ui_config["FOOD"]["SUPER"]["FONT"]["SIZE"] if is_super_food else self.ui_config["FOOD"]["SIMPLE"]["FONT"]["SIZE"]
-        font_color = Colour[self.ui_config["FOOD"]["SUPER"]["FONT"]["COLOUR"]].value if is_super_food else Colour[self.ui_config["FOOD"]["SIMPLE"]["FONT"]["COLOUR"]].value
         
+        food_config = self.ui_config["FOOD"]["SUPER"] if kind == SUPER_FOOD else self.ui_config["FOOD"]["SIMPLE"]
+        food_center = (cell_rect.left + self.cell_size // 2, cell_rect.top + self.cell_size // 2)
         pygame.draw.circle(
             surface,
-            fill_color,
-            (food_center_x, food_center_y),
+            Colour[food_config["FILL"]].value,
+            food_center,
             self.cell_size // 2 - 2
         )
         
-        food_text = pygame.font.SysFont(
-            font_name,
-            font_size
-        ).render(symbol, True, font_color)
+        food_text = self._render_text(food_config["SYMBOL"], food_config["FONT"], food_config["FONT"]["COLOUR"])
         
-        food_rect = food_text.get_rect(
-            center=(food_center_x, food_center_y)
-        )
+        food_rect = food_text.get_rect(center=food_center)
         surface.blit(food_text, food_rect)
-        return surface, food_rect
+        return food_rect
+    
+    def _food_cell(self) -> Optional[Tuple[Tuple[int, int], str]]:
+        if self.food and self.food.active:
+            return self.food.position, SUPER_FOOD if isinstance(self.food, SuperFood) else SIMPLE_FOOD
+        return None
+    
+    def _cell_kind(self, 
+                   pos: Tuple[int, int], 
+                   food_cell: Optional[Tuple[Tuple[int, int], str]]) -> Optional[str]:
+        # Food is drawn over the snake, the head over the body
+        if food_cell is not None and food_cell[0] == pos:
+            return food_cell[1]
+        if pos == self.snake.get_head():
+            return HEAD
+        return BODY if self.snake.occupies(pos) else None
+    
+    def _hud_values(self) -> Tuple[Any, ...]:
+        food_kind = type(self.food) if self.food else None
+        remaining_steps = getattr(self.food, "remaining_steps", None)
+        return (self.score, self.high_score, food_kind, remaining_steps)
+    
+    def _build_static_layer(self) -> None:
+        # Everything that does not change during an episode is drawn once per window size and episode
+        layer = pygame.Surface((self.window_width, self.window_height))
+        layer.fill(Colour[self.ui_config["BG_COLOUR"]].value)
+        layer, self.title_rect = self._draw_title(layer)
+        layer, self.score_rect = self._draw_score_section(layer)
+        layer, self.board_rect = self._draw_board(layer, score_rect=self.score_rect)
+        self._static_layer = layer
+        self._static_key = (self.window_width, self.window_height, self.episode)
+        self._screen_state.valid = False
+        self._headless_state.valid = False
+    
+    def _render_to(self, 
+                   surface: pygame.Surface, 
+                   state: _SurfaceState, 
+                   is_game_over: bool) -> List[pygame.Rect]:
+        if self._static_key != (self.window_width, self.window_height, self.episode):
+            self._build_static_layer()
+        
+        dirty_rects: List[pygame.Rect] = []
+        if not state.valid:
+            surface.blit(self._static_layer, (0, 0))
+            state.snake = None
+            state.hud = None
+            dirty_rects.append(surface.get_rect())
+        
+        dirty_rects.extend(self._render_cells(surface, state, self._static_layer, self.board_rect))
+        
+        hud = self._hud_values()
+        if hud != state.hud:
+            surface.blit(self._static_layer, self.score_rect, area=self.score_rect)
+            self.__draw_scores_food_lifetime_labels(surface)
+            state.hud = hud
+            dirty_rects.append(self.score_rect)
+        
+        state.valid = not is_game_over
+        if is_game_over:
+            # The overlay covers the whole window, so the next frame starts from scratch
+            self._game_over_screen(surface, board_rect=self.board_rect)
+            dirty_rects = [surface.get_rect()]
+        return dirty_rects
+    
+    def _render_cells(self, 
+                      surface: pygame.Surface, 
+                      state: _SurfaceState, 
+                      layer: pygame.Surface, 
+                      board_rect: pygame.Rect) -> List[pygame.Rect]:
+        food_cell = self._food_cell()
+        changed = self.snake.changed_since(state.snake_version) if state.snake is self.snake else None
+        if changed is None:
+            # A new or replaced body: repaint the whole board once
+            surface.blit(layer, board_rect, area=board_rect)
+            for pos in self.snake.iter_body():
+                self._draw_cell(surface, self._cell_rect(pos, board_rect), self._cell_kind(pos, food_cell))
+            if food_cell is not None:
+                self._draw_cell(surface, self._cell_rect(food_cell[0], board_rect), food_cell[1])
+            dirty_rects = [board_rect]
+        else:
+            # Redraw only the cells the snake's ring buffer says changed (head moves, vacated tail) and the food
+            positions = set(changed)
+            if state.food != food_cell:
+                positions.update(cell[0] for cell in (state.food, food_cell) if cell is not None)
+            dirty_rects = []
+            for pos in positions:
+                cell_rect = self._cell_rect(pos, board_rect)
+                surface.blit(layer, cell_rect, area=cell_rect)
+                kind = self._cell_kind(pos, food_cell)
+                if kind is not None:
+                    self._draw_cell(surface, cell_rect, kind)
+                dirty_rects.append(cell_rect)
+        state.snake, state.snake_version, state.food = self.snake, self.snake.body_version(), food_cell
+        return dirty_rects
     
     def _game_over_screen(self, 
                           surface: pygame.Surface,
                           board_rect: pygame.Rect) -> Tuple[pygame.Surface, pygame.Rect]:
         overlay = pygame.Surface((self.window_width, self.window_height))
         overlay.set_alpha(180)
-        overlay.fill(Colour[self.ui_config["GAME_OVER_LABEL"]["FILL"]["COLOUR"]].value)
+        overlay.fill(Colour[self.ui_config["GAME_OVER_LABEL"]["FILL"]].value)
         surface.blit(overlay, (0, 0))
         
         game_over_text = self.font_game_over.render(
@@ -341,7 +476,8 @@ class UI:
             self.score = new_score
     
     def _update_snake(self, new_snake: Snake) -> None:
-        if self.snake != new_snake:
+        # Identity, not Snake.__eq__, which compares whole bodies
+        if self.snake is not new_snake:
             self.snake = new_snake
     
     def _update_food(self, new_food: Food) -> None:
@@ -355,47 +491,46 @@ class UI:
                           ) -> None:
         if new_score:
             self._update_score(new_score)
-            logger.debug(f"Updated score to {new_score}")
         if new_snake:
             self._update_snake(new_snake)
-            logger.debug("Updated snake position")
         if new_food:
             self._update_food(new_food)
-            logger.debug(f"Updated food position to {new_food.position}")
+        if _step_debug():
+            logger.debug("Updated UI components: score {}, head {}, food {}", 
+                         self.score, self.snake.get_head(), self.food.position if self.food else None)
             
+    def reset(self,
+              snake: Snake,
+              food: Optional[Food],
+              score: int,
+              high_score: int,
+              episode: int) -> None:
+        """Points the renderer at a new episode, keeping the display, fonts and cached layers."""
+        logger.debug("Resetting UI for episode {}", episode)
+        self.snake = snake
+        self.food = food
+        self.score = score
+        self.high_score = high_score
+        self.episode = episode
+    
     def full_render(self, is_game_over: bool = False) -> None:
+        if self.headless:
+            return
         if not self._is_initialized:
             self._initialize_display()
         
-        self.screen.fill(Colour[self.ui_config["BG_COLOUR"]].value)
-        self.screen, self.title_rect = self._draw_title(self.screen)
-        self.screen, self.score_rect = self.__draw_scores_food_lifetime_labels(self.screen)
-        self.screen, self.board_rect = self._draw_board(self.screen, 
-                                                      score_rect=self.score_rect)
-        
-        self.screen, self.snake_rect = self._draw_snake(self.screen, board_rect=self.board_rect)
-        if self.food:
-            self.screen, self.food_rect = self._draw_food(self.screen, board_rect=self.board_rect)
-        if is_game_over:
-            self.screen, self.game_over_rect = self._game_over_screen(self.screen, board_rect=self.board_rect)
-        pygame.display.flip()
+        full_redraw = not self._screen_state.valid
+        dirty_rects = self._render_to(self.screen, self._screen_state, is_game_over)
+        if full_redraw or is_game_over:
+            pygame.display.flip()
+        elif dirty_rects:
+            pygame.display.update(dirty_rects)
     
     def headless_render(self, is_game_over: bool = False) -> Tuple[np.ndarray, np.ndarray]:
         if not self._is_initialized:
             self._initialize_display()
         
-        self.headless_surface.fill(Colour[self.ui_config["BG_COLOUR"]].value)
-        self.headless_surface, self.title_rect = self._draw_title(self.headless_surface)
-        self.headless_surface, self.score_rect = self.__draw_scores_food_lifetime_labels(self.headless_surface)
-        self.headless_surface, self.board_rect = self._draw_board(self.headless_surface, 
-                                                      score_rect=self.score_rect)
-        self.headless_surface, self.snake_rect = self._draw_snake(self.headless_surface, board_rect=self.board_rect)
-        if self.food:
-            self.headless_surface, self.food_rect = self._draw_food(self.headless_surface, board_rect=self.board_rect)
-        
-        if is_game_over:
-            self.headless_surface, self.game_over_rect = self._game_over_screen(self.headless_surface, board_rect=self.board_rect)
-        pygame.display.flip()
+        self._render_to(self.headless_surface, self._headless_state, is_game_over)
         
         window_rgb_array = pygame.surfarray.array3d(self.headless_surface)
         board_rgb_array = window_rgb_array[
@@ -407,6 +542,39 @@ class UI:
         board_rgb_array = np.transpose(board_rgb_array, (2, 1, 0))
         return window_rgb_array, board_rgb_array
     
+    def render_board(self, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Draws only the board onto a board-sized surface, skipping the title,
+        score labels and game over overlay that observations never see.
+        Args:
+            out: Optional contiguous ``(3, H, W)`` uint8 array to copy the board into
+        Returns:
+            np.ndarray: (3, H, W) uint8 RGB board image, identical to the
+            board crop of ``headless_render``
+        """
+        if self._board_layer is None:
+            layer = pygame.Surface((self.board_pixel_width, self.board_pixel_height))
+            self._board_layer, _ = self._paint_board(layer, layer.get_rect())
+            self._board_surface = self._board_layer.copy()
+            self._board_state = _SurfaceState()
+        
+        if not self._board_state.valid:
+            self._board_surface.blit(self._board_layer, (0, 0))
+            self._board_state.snake = None
+            self._board_state.valid = True
+        self._render_cells(self._board_surface, self._board_state, self._board_layer, self._board_layer.get_rect())
+        
+        shape = (3, self.board_pixel_height, self.board_pixel_width)
+        if out is None:
+            out = np.empty(shape, dtype=np.uint8)
+        else:
+            validate_buffer(out, shape, np.uint8)
+        # Copy straight from the locked surface pixels, the (W, H, 3) view is transposed to CHW
+        pixels = pygame.surfarray.pixels3d(self._board_surface)
+        np.copyto(out, pixels.transpose(2, 1, 0))
+        del pixels
+        return out
+    
     def close(self):
         logger.debug("Closing pygame UI resources")
         pygame.quit()
@@ -0,0 +1,219 @@
+from typing import Optional, Dict, Any, Tuple, List
+import numpy as np
+from src.game.direction import Direction
+from src.game.grid import EMPTY, BODY, HEAD, SIMPLE_FOOD, SUPER_FOOD
+from src.config import ConfigManager
+
+
+# Action codes follow Game.step: 0:STILL, 1:RIGHT, 2:DOWN, 3:LEFT, 4:UP
+ACTION_DELTAS = np.array([(0, 0),
+                          Direction.RIGHT.value,
+                          Direction.DOWN.value,
+                          Direction.LEFT.value,
+                          Direction.UP.value], dtype=np.int64)
+OPPOSITE_ACTIONS = np.array([0, 3, 4, 1, 2], dtype=np.int64)
+DIRECTION_TO_ACTION = {
+    Direction.RIGHT: 1,
+    Direction.DOWN: 2,
+    Direction.LEFT: 3,
+    Direction.UP: 4,
+}
+
+
+class VecSnakeEnv:
+    """
+    A batched Snake engine that steps ``num_envs`` boards in lockstep.
+
+    All game state lives in preallocated NumPy arrays and follows the rules of
+    ``Game.step``/``Snake.move``: wrap-around, growth on the move after eating,
+    ``SuperFood`` countdown and the score multipliers from ``GAME_CONFIG``.
+    Finished boards (collision, full board or ``MAX_TIMESTEPS_PER_EPISODE``)
+    are reset automatically at the end of ``step``.
+
+    Snake bodies are ring buffers of ``(x, y)`` cells indexed by ``head_idx``,
+    with an ``(x, y)`` occupancy grid per board for constant-time collisions.
+    """
+    def __init__(self,
+                 app_config: ConfigManager,
+                 num_envs: int,
+                 seed: Optional[int] = None):
+        self.game_config = app_config.get_game_config()
+        self.training_config = app_config.get_training_config()
+        self.num_envs = num_envs
+        self.board_dim: int = self.game_config["BOARD_DIM"]
+        self.capacity: int = self.board_dim ** 2
+        self.max_steps: Optional[int] = self.training_config.get("MAX_TIMESTEPS_PER_EPISODE")
+        self.rng = np.random.default_rng(seed)
+
+        self.bodies = np.zeros((num_envs, self.capacity, 2), dtype=np.int64)
+        self.head_idx = np.zeros(num_envs, dtype=np.int64)
+        self.lengths = np.zeros(num_envs, dtype=np.int64)
+        self.occupancy = np.zeros((num_envs, self.board_dim, self.board_dim), dtype=np.uint8)
+        self.directions = np.zeros(num_envs, dtype=np.int64)
+        self.growth_pending = np.zeros(num_envs, dtype=bool)
+        self.food_pos = np.zeros((num_envs, 2), dtype=np.int64)
+        self.food_active = np.zeros(num_envs, dtype=bool)
+        self.food_is_super = np.zeros(num_envs, dtype=bool)
+        self.food_remaining = np.zeros(num_envs, dtype=np.int64)
+        self.scores = np.zeros(num_envs, dtype=np.float64)
+        self.steps_elapsed = np.zeros(num_envs, dtype=np.int64)
+        self.food_count = np.zeros(num_envs, dtype=np.int64)
+        self.dones = np.zeros(num_envs, dtype=bool)
+
+        self._rows = np.arange(num_envs)
+        self._build_initial_snake()
+
+    def _build_initial_snake(self) -> None:
+        snake_config = self.game_config["SNAKE"]
+        init_direction = Direction[snake_config["SNAKE_INIT_DIRECTION"]]
+        init_length = snake_config["SNAKE_INIT_LENGTH"]
+        dx, dy = Direction.get_opposite(init_direction).value
+        x0, y0 = snake_config["SNAKE_INIT_POS"]
+
+        # Ring order runs tail -> head, so the head sits at index init_length - 1
+        segments = [((x0 + dx * i) % self.board_dim, (y0 + dy * i) % self.board_dim)
+                    for i in range(init_length)]
+        self._init_ring = np.array(segments[::-1], dtype=np.int64)
+        self._init_occupancy = np.zeros((self.board_dim, self.board_dim), dtype=np.uint8)
+        np.add.at(self._init_occupancy, (self._init_ring[:, 0], self._init_ring[:, 1]), 1)
+        self._init_length = init_length
+        self._init_action = DIRECTION_TO_ACTION[init_direction]
+
+    def _reset_boards(self, idx: np.ndarray) -> None:
+        self.bodies[idx, :self._init_length] = self._init_ring
+        self.head_idx[idx] = self._init_length - 1
+        self.lengths[idx] = self._init_length
+        self.occupancy[idx] = self._init_occupancy
+        self.directions[idx] = self._init_action
+        self.growth_pending[idx] = False
+        self.food_active[idx] = False
+        self.food_is_super[idx] = False
+        self.food_remaining[idx] = 0
+        self.scores[idx] = 0
+        self.steps_elapsed[idx] = 0
+        self.food_count[idx] = 0
+        self.dones[idx] = False
+
+    def reset(self, seed: Optional[int] = None) -> Tuple[np.ndarray, Dict[str, Any]]:
+        if seed is not None:
+            self.rng = np.random.default_rng(seed)
+        self._reset_boards(self._rows)
+        return self.get_obs(), self._get_info()
+
+    def _place_food(self, idx: np.ndarray) -> None:
+        if idx.size == 0:
+            return
+        is_super = ((self.rng.random(idx.size) <= self.game_config["FOOD"]["SUPERFOOD_PROBABILITY"])
+                    & (self.food_count[idx] > 0))
+        # Uniform pick among free cells: random keys with occupied cells masked out
+        keys = self.rng.random((idx.size, self.capacity))
+        keys[self.occupancy[idx].reshape(idx.size, -1) > 0] = -1.0
+        cells = keys.argmax(axis=1)
+        self.food_pos[idx, 0] = cells // self.board_dim
+        self.food_pos[idx, 1] = cells % self.board_dim
+        self.food_active[idx] = True
+        self.food_is_super[idx] = is_super
+        self.food_remaining[idx] = np.where(is_super, self.game_config["FOOD"]["SUPERFOOD_LIFETIME"], 0)
+
+    def _generate_or_update_food(self) -> None:
+        # Start generating food only after the first 3 steps in a new game
+        eligible = self.steps_elapsed >= 3
+        spawn = eligible & ~self.food_active
+        countdown = eligible & self.food_active & self.food_is_super
+        self.food_remaining[countdown] -= 1
+        self.food_active[countdown & (self.food_remaining < 0)] = False
+        self._place_food(np.flatnonzero(spawn))
+
+    def step(self, actions: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, Dict[str, Any]]:
+        """
+        Args:
+            actions: (num_envs,) array of actions, same codes as ``Game.step``
+        Returns:
+            tuple: (obs, rewards, terminated, truncated, info). ``info`` holds the
+            per-board score, steps and food count of the episode that just ran,
+            while ``obs`` already shows the reset board for finished episodes.
+        """
+        actions = np.asarray(actions, dtype=np.int64)
+        rows = self._rows
+        self.steps_elapsed += 1
+
+        # Step 1: Generate/update food
+        self._generate_or_update_food()
+
+        # Step 2: Update snake directions and move them
+        turning = (actions > 0) & (actions != OPPOSITE_ACTIONS[self.directions])
+        self.directions[turning] = actions[turning]
+
+        heads = self.bodies[rows, self.head_idx]
+        new_heads = (heads + ACTION_DELTAS[self.directions]) % self.board_dim
+
+        shrinking = ~self.growth_pending
+        tails = self.bodies[rows, (self.head_idx - self.lengths + 1) % self.capacity]
+        self.occupancy[rows[shrinking], tails[shrinking, 0], tails[shrinking, 1]] -= 1
+        self.lengths += self.growth_pending
+        self.growth_pending[:] = False
+
+        self.head_idx += 1
+        self.head_idx %= self.capacity
+        self.bodies[rows, self.head_idx] = new_heads
+        collided = self.occupancy[rows, new_heads[:, 0], new_heads[:, 1]] > 0
+        self.occupancy[rows, new_heads[:, 0], new_heads[:, 1]] += 1
+
+        # Step 3: Eat food, grow on the next move and update scores
+        eaten = self.food_active & (new_heads == self.food_pos).all(axis=1)
+        score_config = self.game_config["SCORE"]
+        food_score = np.where(self.food_is_super,
+                              score_config["XPLIER_EAT_SUPERFOOD"] * (1 + self.food_remaining),
+                              score_config["EAT_FOOD"]) * eaten
+        self.scores += food_score
+        self.food_count += eaten
+        self.growth_pending |= eaten
+        self.food_active &= ~eaten
+
+        # Step 4: End states
+        terminated = collided | (self.lengths >= self.capacity)
+        truncated = np.zeros(self.num_envs, dtype=bool)
+        if self.max_steps:
+            truncated = ~terminated & (self.steps_elapsed >= self.max_steps)
+        self.dones = terminated | truncated
+
+        rewards_config = self.training_config["REWARDS"]
+        rewards = (np.where(actions == 0, rewards_config["NOTHING"], 0.0)
+                   + np.where(collided, rewards_config["COLLIDE"], rewards_config["MOVE"])
+                   + food_score)
+
+        info = self._get_info()
+        self._reset_boards(np.flatnonzero(self.dones))
+        return self.get_obs(), rewards, terminated, truncated, info
+
+    def _get_info(self) -> Dict[str, Any]:
+        return {
+            "steps_elapsed": self.steps_elapsed.copy(),
+            "food_count": self.food_count.copy(),
+            "score": self.scores.copy(),
+            "is_game_over": self.dones.copy(),
+        }
+
+    def get_obs(self) -> np.ndarray:
+        """
+        Returns:
+            np.ndarray: (num_envs, BOARD_DIM, BOARD_DIM) uint8 cell codes, laid out
+            like the rendered board (row ``BOARD_DIM - 1 - y``, column ``x``)
+        """
+        top = self.board_dim - 1
+        obs = np.where(self.occupancy > 0, BODY, EMPTY).astype(np.uint8)
+        obs = np.ascontiguousarray(obs.transpose(0, 2, 1)[:, ::-1, :])
+
+        heads = self.bodies[self._rows, self.head_idx]
+        obs[self._rows, top - heads[:, 1], heads[:, 0]] = HEAD
+
+        food_rows = np.flatnonzero(self.food_active)
+        food = self.food_pos[food_rows]
+        obs[food_rows, top - food[:, 1], food[:, 0]] = np.where(self.food_is_super[food_rows],
+                                                                SUPER_FOOD, SIMPLE_FOOD)
+        return obs
+
+    def get_body(self, env_idx: int) -> List[Tuple[int, int]]:
+        """Body of one board as a head-first list of ``(x, y)`` tuples, like ``Snake.get_body``."""
+        ring_idx = (self.head_idx[env_idx] - np.arange(self.lengths[env_idx])) % self.capacity
+        return [tuple(cell) for cell in self.bodies[env_idx, ring_idx].tolist()]
@@ -0,0 +1,236 @@
+import importlib.util
+import queue
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from pathlib import Path
+from typing import Optional, Dict, Any, List, Iterable, Iterator, Callable, NamedTuple, Union
+import numpy as np
+from src.game.direction import Direction
+from src.game.game import Game
+from src.game.snake import Snake
+from src.game.spectator import SpectatorFrame, _frame_food
+from src.utils.logger import logger
+
+
+class EpisodeSummary(NamedTuple):
+    """What a ``VideoRecorder`` predicate sees when an episode ends."""
+    episode: int
+    steps: int
+    score: float
+    previous_high_score: float
+
+
+def is_new_high_score(summary: EpisodeSummary) -> bool:
+    return summary.score > 0 and summary.score > summary.previous_high_score
+
+
+class HeadlessFrameRenderer:
+    """Draws ``SpectatorFrame``s with a headless ``UI``, never touching the display."""
+    def __init__(self, ui_config: Dict[str, Any], game_config: Dict[str, Any]):
+        self.ui_config = ui_config
+        self.game_config = game_config
+        snake_config = game_config["SNAKE"]
+        self.snake = Snake(board_dim=game_config["BOARD_DIM"],
+                           init_pos=snake_config["SNAKE_INIT_POS"],
+                           init_length=snake_config["SNAKE_INIT_LENGTH"],
+                           init_direction=Direction[snake_config["SNAKE_INIT_DIRECTION"]])
+        self.ui = None
+
+    def render(self, frame: SpectatorFrame) -> np.ndarray:
+        """
+        Returns:
+            np.ndarray: (H, W, 3) uint8 RGB image of the whole window
+        """
+        from src.game.ui import UI
+
+        self.snake.body = list(frame.body)
+        food = _frame_food(frame, self.game_config)
+        if self.ui is None:
+            self.ui = UI(ui_config=self.ui_config, snake=self.snake, episode=frame.episode, food=food,
+                         score=frame.score, high_score=frame.high_score, headless=True)
+        else:
+            self.ui.reset(snake=self.snake, food=food, score=frame.score,
+                          high_score=frame.high_score, episode=frame.episode)
+        window_rgb_array, _ = self.ui.headless_render(is_game_over=frame.is_game_over)
+        return window_rgb_array.transpose(1, 2, 0)
+
+    def save_png(self, path: Union[str, Path]) -> None:
+        """Saves the last rendered frame."""
+        import pygame
+        pygame.image.save(self.ui.headless_surface, str(path))
+
+    def close(self) -> None:
+        # UI.close quits pygame for the whole process, so only owners of the process call this
+        if self.ui is not None:
+            self.ui.close()
+            self.ui = None
+
+
+def write_frames(renderer: HeadlessFrameRenderer,
+                 frames: Iterable[SpectatorFrame],
+                 frames_dir: Union[str, Path, None] = None,
+                 gif_path: Union[str, Path, None] = None,
+                 fps: int = 10) -> int:
+    """
+    Renders frames to PNG files in ``frames_dir`` and/or an animated GIF
+    (which needs Pillow).
+    Returns:
+        int: Number of frames rendered
+    """
+    frames_dir = Path(frames_dir) if frames_dir else None
+    if frames_dir:
+        frames_dir.mkdir(parents=True, exist_ok=True)
+    gif_frames = []
+    count = 0
+    for count, frame in enumerate(frames, start=1):
+        image = renderer.render(frame)
+        if frames_dir:
+            renderer.save_png(frames_dir / f"frame_{count - 1:05d}.png")
+        if gif_path:
+            gif_frames.append(image.copy())
+
+    if gif_path and gif_frames:
+        from PIL import Image
+        Path(gif_path).parent.mkdir(parents=True, exist_ok=True)
+        images = [Image.fromarray(frame) for frame in gif_frames]
+        images[0].save(gif_path, save_all=True, append_images=images[1:],
+                       duration=max(1000 // fps, 1), loop=0)
+    return count
+
+
+# Queue marker for the encoder thread
+_STOP = object()
+
+
+class VideoRecorder:
+    """
+    Turns selected episodes into animated GIFs on a background thread.
+
+    An episode is selected when it is every ``every_n_episodes``-th one, or
+    when ``predicate`` accepts its ``EpisodeSummary`` at the end (e.g.
+    ``is_new_high_score``). While an episode may be selected, ``capture``
+    keeps one small ``SpectatorFrame`` per step, at most the last
+    ``max_frames``. Without a predicate, other episodes capture nothing. The
+    frames of a selected episode go to the encoder thread through a queue
+    of at most ``queue_size`` episodes; when it is full the episode is
+    skipped rather than stalling the caller. The thread draws with a
+    headless ``UI`` and writes ``episode_<n>.gif`` (PNG frames in
+    ``episode_<n>/`` when Pillow is missing) under ``folder/run_<timestamp>``.
+
+    Drawing is Python code that holds the GIL, so the thread sleeps between
+    frames to stay busy at most ``duty_cycle`` of the time, which bounds the
+    slowdown of the training loop. ``close`` finishes the queue at full speed.
+
+    Pygame fonts and display state are not thread-safe, so nothing else in
+    the process may draw a pygame window while a recorder is running;
+    ``SnakeEnv`` only creates one in the HEADLESS and SPECTATOR render modes.
+    """
+    def __init__(self,
+                 ui_config: Dict[str, Any],
+                 game_config: Dict[str, Any],
+                 folder: Union[str, Path],
+                 every_n_episodes: int = 0,
+                 predicate: Optional[Callable[[EpisodeSummary], bool]] = None,
+                 fps: int = 10,
+                 max_frames: int = 1000,
+                 queue_size: int = 4,
+                 duty_cycle: float = 0.05):
+        self.ui_config = ui_config
+        self.game_config = game_config
+        self.folder = Path(folder) / f"run_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+        self.every_n_episodes = every_n_episodes
+        self.predicate = predicate
+        self.fps = fps
+        self.max_frames = max_frames
+        self.duty_cycle = min(max(duty_cycle, 0.01), 1.0)
+        self._closing = False
+        self.written: List[Path] = []
+        self.skipped: int = 0
+        self._queue: queue.Queue = queue.Queue(maxsize=max(queue_size, 1))
+        self._thread: Optional[threading.Thread] = None
+        self._frames: Optional[deque] = None
+        self._episode: int = 0
+        self._previous_high_score: float = 0
+
+    def _is_every_nth(self, episode: int) -> bool:
+        return self.every_n_episodes > 0 and episode % self.every_n_episodes == 0
+
+    def start_episode(self, game: Game, episode: int) -> None:
+        """Begins capturing a freshly reset ``game`` if the episode may be recorded."""
+        self._episode = episode
+        self._previous_high_score = game.high_score
+        self._frames = None
+        if self._is_every_nth(episode) or self.predicate is not None:
+            self._frames = deque(maxlen=self.max_frames)
+            self.capture(game)
+
+    def capture(self, game: Game) -> None:
+        if self._frames is not None:
+            self._frames.append(SpectatorFrame.from_game(game, self._episode))
+
+    def end_episode(self, game: Game) -> bool:
+        """
+        Hands the episode to the encoder thread if it is selected.
+        Returns:
+            bool: Whether the episode was queued for encoding
+        """
+        frames, self._frames = self._frames, None
+        if not frames:
+            return False
+        summary = EpisodeSummary(self._episode, game.steps_elapsed, game.score, self._previous_high_score)
+        if not (self._is_every_nth(self._episode) or (self.predicate is not None and self.predicate(summary))):
+            return False
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="VideoRecorder", daemon=True)
+            self._thread.start()
+        try:
+            self._queue.put_nowait((self._episode, list(frames)))
+        except queue.Full:
+            self.skipped += 1
+            logger.warning("Video encoder is behind, episode {} is not recorded", self._episode)
+            return False
+        return True
+
+    def _run(self) -> None:
+        renderer = HeadlessFrameRenderer(self.ui_config, self.game_config)
+        while True:
+            item = self._queue.get()
+            try:
+                if item is _STOP:
+                    return
+                self._encode(renderer, *item)
+            except Exception as e:
+                logger.error(f"Could not record episode {item[0]}: {e}")
+            finally:
+                self._queue.task_done()
+
+    def _encode(self, renderer: HeadlessFrameRenderer, episode: int, frames: List[SpectatorFrame]) -> None:
+        if importlib.util.find_spec("PIL") is not None:
+            path = self.folder / f"episode_{episode:06d}.gif"
+            write_frames(renderer, self._paced(frames), gif_path=path, fps=self.fps)
+        else:
+            path = self.folder / f"episode_{episode:06d}"
+            write_frames(renderer, self._paced(frames), frames_dir=path)
+        self.written.append(path)
+        logger.debug("Recorded video of episode {} to {}", episode, path)
+
+    def _paced(self, frames: List[SpectatorFrame]) -> Iterator[SpectatorFrame]:
+        for frame in frames:
+            started = time.perf_counter()
+            yield frame
+            # The caller drew the frame in between, idle in proportion to that
+            if not self._closing and self.duty_cycle < 1.0:
+                time.sleep((time.perf_counter() - started) * (1.0 - self.duty_cycle) / self.duty_cycle)
+
+    def flush(self) -> None:
+        """Blocks until every queued episode is written."""
+        if self._thread is not None and self._thread.is_alive():
+            self._queue.join()
+
+    def close(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            self._closing = True
+            self._queue.put(_STOP)
+            self._thread.join()
@@ -0,0 +1,114 @@
+from collections import deque
+from typing import Optional, Dict, Any, Tuple
+import gym
+import numpy as np
+from gym import spaces
+from src.game.env import SnakeEnv
+from src.game.observation import ObservationPreprocessor, make_preprocessor
+from src.utils.lazy_frames import LazyFrames
+from src.config import ConfigManager
+
+
+class ActionRepeat(gym.Wrapper):
+    """
+    Repeats every action for ``repeat`` game ticks, summing the rewards and
+    stopping early on termination. Only the last tick is observed, so the
+    agent's forward pass and the observation rendering run once per ``repeat``
+    ticks.
+
+    ``info["ticks"]`` holds the number of ticks a step actually ran. With
+    ``max_episode_ticks`` the episode is truncated once that many ticks have
+    run, even in the middle of a repeated action.
+    """
+    def __init__(self,
+                 env: gym.Env,
+                 repeat: int,
+                 max_episode_ticks: Optional[int] = None):
+        super().__init__(env)
+        if repeat < 1:
+            raise ValueError(f"Action repeat must be at least 1, got {repeat}")
+        self.repeat = repeat
+        self.max_episode_ticks = max_episode_ticks
+        self.episode_ticks: int = 0
+
+    def reset(self, **kwargs) -> Tuple[np.ndarray, Dict[str, Any]]:
+        self.episode_ticks = 0
+        return self.env.reset(**kwargs)
+
+    def step(self, action: int) -> Tuple[np.ndarray, float, bool, bool, Dict[str, Any]]:
+        snake_env: SnakeEnv = self.env.unwrapped
+        total_reward, terminated, truncated, ticks = 0.0, False, False, 0
+        while ticks < self.repeat:
+            reward, terminated = snake_env.tick(action)
+            total_reward += reward
+            ticks += 1
+            self.episode_ticks += 1
+            if terminated:
+                break
+            if self.max_episode_ticks and self.episode_ticks >= self.max_episode_ticks:
+                truncated = True
+                break
+        observation, info = snake_env.observe()
+        info["ticks"] = ticks
+        return observation, total_reward, terminated, truncated, info
+
+
+class PreprocessObservation(gym.ObservationWrapper):
+    """Applies an ``ObservationPreprocessor`` (downsampling, palette) to RGB observations."""
+    def __init__(self, env: gym.Env, preprocessor: ObservationPreprocessor):
+        super().__init__(env)
+        if env.observation_space.shape != preprocessor.input_shape:
+            raise ValueError(f"Preprocessor expects {preprocessor.input_shape} observations, "
+                             f"env produces {env.observation_space.shape}")
+        self.preprocessor = preprocessor
+        self.observation_space = spaces.Box(low=0, high=255, shape=preprocessor.shape, dtype=np.uint8)
+
+    def observation(self, observation: np.ndarray) -> np.ndarray:
+        return self.preprocessor.apply(observation)
+
+
+class FrameStack(gym.Wrapper):
+    """
+    Stacks the last ``k`` observations along the channel axis, so the agent
+    sees the direction of motion. Each step copies the new frame once (the
+    env reuses its observation buffers) and returns a ``LazyFrames`` over it
+    and the previous ``k - 1`` frames. At reset the first frame fills the stack.
+    """
+    def __init__(self, env: gym.Env, k: int):
+        super().__init__(env)
+        if k < 1:
+            raise ValueError(f"Frame stack depth must be at least 1, got {k}")
+        self.k = k
+        self._frames: deque = deque(maxlen=k)
+        space = env.observation_space
+        self.observation_space = spaces.Box(low=np.concatenate([space.low] * k, axis=0),
+                                            high=np.concatenate([space.high] * k, axis=0),
+                                            dtype=space.dtype)
+
+    def reset(self, **kwargs) -> Tuple[LazyFrames, Dict[str, Any]]:
+        observation, info = self.env.reset(**kwargs)
+        frame = np.array(observation)
+        self._frames.extend([frame] * self.k)
+        return LazyFrames(self._frames), info
+
+    def step(self, action: int) -> Tuple[LazyFrames, float, bool, bool, Dict[str, Any]]:
+        observation, reward, terminated, truncated, info = self.env.step(action)
+        self._frames.append(np.array(observation))
+        return LazyFrames(self._frames), reward, terminated, truncated, info
+
+
+def make_env(app_config: ConfigManager) -> gym.Env:
+    """``SnakeEnv`` wrapped as configured in ``TRAINING_CONFIG`` and ``MODEL_CONFIG``."""
+    training_config = app_config.get_training_config()
+    model_config = app_config.get_model_config()
+    env: gym.Env = SnakeEnv(app_config)
+    repeat = training_config.get("ACTION_REPEAT", 1)
+    if repeat > 1:
+        env = ActionRepeat(env, repeat, max_episode_ticks=training_config.get("MAX_TIMESTEPS_PER_EPISODE"))
+    preprocessor = make_preprocessor(model_config, app_config.get_ui_config())
+    if preprocessor is not None:
+        env = PreprocessObservation(env, preprocessor)
+    frame_stack = model_config.get("FRAME_STACK", 1)
+    if frame_stack > 1:
+        env = FrameStack(env, frame_stack)
+    return env
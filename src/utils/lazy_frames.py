@@ -0,0 +1,38 @@
+from typing import Sequence, Tuple
+import numpy as np
+
+
+class LazyFrames:
+    """
+    A stacked observation that references its frames instead of copying them.
+    Consecutive stacks share all but one frame, so keeping many of them (in a
+    replay buffer, say) costs one frame per step rather than ``k``.
+    ``np.asarray`` or ``copy_to`` materialize the ``(k * C, H, W)`` array.
+    """
+    __slots__ = ("frames",)
+
+    def __init__(self, frames: Sequence[np.ndarray]):
+        self.frames: Tuple[np.ndarray, ...] = tuple(frames)
+
+    @property
+    def shape(self) -> Tuple[int, ...]:
+        channels, *rest = self.frames[0].shape
+        return (channels * len(self.frames), *rest)
+
+    @property
+    def dtype(self) -> np.dtype:
+        return self.frames[0].dtype
+
+    def __len__(self) -> int:
+        return self.shape[0]
+
+    def copy_to(self, out: np.ndarray) -> np.ndarray:
+        """Writes the stacked frames into ``out``, e.g. one row of a batch array."""
+        channels = self.frames[0].shape[0]
+        for i, frame in enumerate(self.frames):
+            out[i * channels:(i + 1) * channels] = frame
+        return out
+
+    def __array__(self, dtype=None, copy=None) -> np.ndarray:
+        stacked = np.concatenate(self.frames, axis=0)
+        return stacked if dtype is None else stacked.astype(dtype, copy=False)
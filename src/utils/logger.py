@@ -1,21 +1,64 @@
 import sys
 import os
+from functools import lru_cache
+from typing import Dict, Optional
 from loguru import logger
 from src.config import config
 
-log_path = config.get_logs_config()["LOGS_FOLDER_PATH"]
+logs_config = config.get_logs_config()
+log_path = logs_config["LOGS_FOLDER_PATH"]
 os.makedirs(log_path, exist_ok=True)
 
+# Per-module minimum levels as a loguru filter dict, "" being the default for every module
+module_levels: Dict[str, str] = {"": logs_config.get("LEVEL", "INFO"), **(logs_config.get("MODULE_LEVELS") or {})}
+DEBUG_SAMPLE_EVERY: int = logs_config.get("DEBUG_SAMPLE_EVERY", 100)
+
+
+def _level_for(module: str, levels: Dict[str, str]) -> str:
+    """Level of the longest configured prefix of a dotted module name."""
+    parts = module.split(".")
+    for i in range(len(parts), 0, -1):
+        prefix = ".".join(parts[:i])
+        if prefix in levels:
+            return levels[prefix]
+    return levels[""]
+
+
+@lru_cache(maxsize=None)
+def debug_enabled(module: str) -> bool:
+    """Whether DEBUG messages from ``module`` reach any sink, so hot paths can skip them entirely."""
+    return logger.level(_level_for(module, module_levels)).no <= logger.level("DEBUG").no
+
+
+class DebugSampler:
+    """
+    Lets one in ``every`` step-level debug messages of a module through.
+    Calling it costs a single attribute check while debug is off for the module.
+    """
+    def __init__(self, module: str, every: Optional[int] = None):
+        self.enabled = debug_enabled(module)
+        self.every = max(every or DEBUG_SAMPLE_EVERY, 1)
+        self._count = 0
+
+    def __call__(self) -> bool:
+        if not self.enabled:
+            return False
+        self._count += 1
+        return (self._count - 1) % self.every == 0
+
+
 logger.remove()
 
-logger.add(sys.stdout, level="INFO", 
+logger.add(sys.stdout, level="INFO", filter=module_levels,
           format="<green>{time:YYYY-MM-DD HH:mm:ss}</green> | <level>{level: <8}</level> | <cyan>{name}</cyan>:<cyan>{function}</cyan>:<cyan>{line}</cyan> - <level>{message}</level>")
 
-logger.add(f"{log_path}/training_log.log", level="INFO",
+logger.add(f"{log_path}/training_log.log", level="INFO", filter=module_levels,
           format="{time:YYYY-MM-DD HH:mm:ss} | {level: <8} | {name}:{function}:{line} - {message}")
 
-logger.add(f"{log_path}/debug_log.log", level="DEBUG",
-          format="{time:YYYY-MM-DD HH:mm:ss} | {level: <8} | {name}:{function}:{line} - {message}")
+# The debug file is only opened when some module logs at DEBUG, and is written from a background queue
+if any(logger.level(level).no <= logger.level("DEBUG").no for level in module_levels.values()):
+    logger.add(f"{log_path}/debug_log.log", level="TRACE", filter=module_levels, enqueue=True,
+              format="{time:YYYY-MM-DD HH:mm:ss} | {level: <8} | {name}:{function}:{line} - {message}")
 
 # Test the logger
 if __name__ == "__main__":
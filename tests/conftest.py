@@ -84,8 +84,7 @@ def mock_config():
     # Mock model config
     model_config = {
         "NUM_ACTIONS": 5,
-        "LEARNING_RATE": 0.001,
-        "IMAGE_INPUT_SIZE": 84
+        "LEARNING_RATE": 0.001
     }
     
     # Mock training config
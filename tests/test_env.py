@@ -6,6 +6,7 @@ from unittest.mock import MagicMock, patch
 import numpy as np
 import gym
 from src.game.env import SnakeEnv
+from src.game.food import SimpleFood
 from src.config import ConfigManager
 
 class TestSnakeEnv(unittest.TestCase):
@@ -45,9 +46,49 @@ class TestSnakeEnv(unittest.TestCase):
         
         # Verify the observation is a numpy array with correct shape
         self.assertIsInstance(obs, np.ndarray)
-        self.assertEqual(obs.shape, (3,
-                                     self.env.model_config["IMAGE_INPUT_SIZE"][1], 
-                                     self.env.model_config["IMAGE_INPUT_SIZE"][0]))
+        board_size_in_pix = self.env.ui_config["BOARD_DIM"] * self.env.ui_config["CELL_SIZE_IN_PIXELS"]
+        self.assertEqual(obs.shape, (3, board_size_in_pix, board_size_in_pix))
+    
+    def test_grid_observation_mode(self):
+        """Test the symbolic grid observation mode."""
+        board_dim = self.config.get_game_config()["BOARD_DIM"]
+        with patch.dict(self.config.get_model_config(), {"OBSERVATION_MODE": "GRID"}):
+            env = SnakeEnv(app_config=self.config)
+        self.assertEqual(env.observation_space.shape, (5, board_dim, board_dim))
+        obs, _ = env.reset()
+        self.assertEqual(obs.shape, env.observation_space.shape)
+        self.assertEqual(obs.dtype, np.float32)
+        obs, _, _, _, _ = env.step(1)
+        self.assertTrue(env.observation_space.contains(obs))
+    
+    def test_observation_buffers(self):
+        """Test that observations are written into the provided buffers in turn."""
+        buffers = [np.zeros(self.env.observation_space.shape, dtype=self.env.observation_space.dtype)
+                   for _ in range(2)]
+        self.env.set_observation_buffers(buffers)
+        obs, _ = self.env.reset()
+        self.assertIs(obs, buffers[0])
+        next_obs, _, _, _, _ = self.env.step(1)
+        self.assertIs(next_obs, buffers[1])
+        self.assertFalse(np.array_equal(obs, next_obs))
+        self.env.set_observation_buffers([])
+        np.testing.assert_array_equal(self.env._get_obs(), next_obs)
+        with self.assertRaises(ValueError):
+            self.env.set_observation_buffers([buffers[0]])
+        with self.assertRaises(ValueError):
+            self.env.set_observation_buffers([np.zeros((3, 4, 4), dtype=np.uint8)] * 2)
+    
+    def test_observe_into(self):
+        """Test drawing an observation into a caller's array."""
+        self.env.reset(seed=1)
+        self.env.tick(1)
+        out = np.zeros(self.env.observation_space.shape, dtype=self.env.observation_space.dtype)
+        obs, info = self.env.observe(out=out)
+        self.assertIs(obs, out)
+        np.testing.assert_array_equal(out, self.env._get_obs())
+        self.assertEqual(info["steps_elapsed"], self.env.game.steps_elapsed)
+        with self.assertRaises(ValueError):
+            self.env.observe(out=np.zeros((3, 4, 4), dtype=np.uint8))
     
     def test_step(self):
         """Test taking a step in the environment."""
@@ -67,6 +108,21 @@ class TestSnakeEnv(unittest.TestCase):
         # The snake should have moved right
         self.assertEqual(self.env.game.snake.get_direction().name, 'RIGHT')
     
+    def test_step_rewards(self):
+        """Test that rewards are built from the step result."""
+        rewards = self.env.training_config["REWARDS"]
+        self.env.reset()
+        _, reward, _, _, _ = self.env.step(0)
+        self.assertAlmostEqual(reward, rewards["NOTHING"] + rewards["MOVE"])
+        
+        head = self.env.game.snake.get_head()
+        food = self.env.game.current_food = SimpleFood(board_dim=self.env.game_config["BOARD_DIM"])
+        food.position = ((head[0] + 1) % self.env.game_config["BOARD_DIM"], head[1])
+        food.active = self.env.game.is_food_active = True
+        _, reward, _, _, info = self.env.step(1)
+        self.assertAlmostEqual(reward, rewards["MOVE"] + self.env.game_config["SCORE"]["EAT_FOOD"])
+        self.assertEqual(info["food_count"], 1)
+    
     def test_render(self):
         """Test environment rendering."""
         # Create a mock for the sleep function
@@ -91,6 +147,34 @@ class TestSnakeEnv(unittest.TestCase):
         self.env.cleanup_ui()
         self.assertIsNone(self.env.ui)
         
+    def test_ui_persists_across_resets(self):
+        """Test that one renderer is reused for every episode until close."""
+        self.env.reset()
+        ui = self.env.ui
+        with patch('pygame.quit') as mock_quit:
+            self.env.step(1)
+            self.env.reset()
+            mock_quit.assert_not_called()
+        self.assertIs(self.env.ui, ui)
+        self.assertEqual(ui.episode, 2)
+        self.assertIs(ui.snake, self.env.game.snake)
+        self.env.close()
+        self.assertIsNone(self.env.ui)
+    
+    def test_headless_render_mode(self):
+        """Test that HEADLESS never opens a display window."""
+        with patch.dict(self.config.get_game_config(), {"RENDER_MODE": "HEADLESS"}), \
+                patch.dict(self.config.get_model_config(), {"RGB_RENDERER": "PYGAME"}):
+            env = SnakeEnv(app_config=self.config)
+        with patch('pygame.display.set_mode') as mock_set_mode:
+            obs, _ = env.reset()
+            env.step(1)
+            env.render()
+            mock_set_mode.assert_not_called()
+        self.assertEqual(obs.shape, env.observation_space.shape)
+        self.assertTrue(env.ui.headless)
+        env.close()
+    
     def test_update_ui_components(self):
         """Test updating UI components."""
         # Create a UI first
@@ -7,6 +7,7 @@ import random
 from typing import List, Tuple
 
 from src.game.food import SimpleFood, SuperFood
+from src.game.free_cells import FreeCellSet
 
 class TestFood(unittest.TestCase):
     """Test cases for the Food classes."""
@@ -31,6 +32,29 @@ class TestFood(unittest.TestCase):
         self.assertTrue(self.simple_food.active)
         self.assertEqual(self.simple_food.position, (5, 5))
     
+    def test_food_placement_with_free_cells(self):
+        """Test placing food on a nearly full board through the free-cell index."""
+        free_cells = FreeCellSet(self.board_dim)
+        for cell in range(self.board_dim ** 2):
+            if cell != 42:
+                free_cells.remove(cell)
+        self.simple_food.place_food(free_cells=free_cells)
+        self.assertTrue(self.simple_food.active)
+        self.assertEqual(self.simple_food.position, (42 // self.board_dim, 42 % self.board_dim))
+        
+        self.super_food.place_food(free_cells=free_cells)
+        self.assertEqual(self.super_food.position, self.simple_food.position)
+        self.assertEqual(self.super_food.remaining_steps, 10)
+    
+    def test_food_placement_on_full_board(self):
+        """Test that food stays inactive when no cell is free."""
+        free_cells = FreeCellSet(self.board_dim)
+        for cell in range(self.board_dim ** 2):
+            free_cells.remove(cell)
+        self.simple_food.place_food(free_cells=free_cells)
+        self.assertFalse(self.simple_food.active)
+        self.assertIsNone(self.simple_food.position)
+    
     def test_simple_food_eaten(self):
         """Test simple food eaten detection."""
         self.simple_food.position = (5, 5)
@@ -1,10 +1,14 @@
 """
 Unit tests for the game module.
 """
+import pickle
+import random
+import tempfile
 import unittest
+from pathlib import Path
 from unittest.mock import MagicMock, patch
 import numpy as np
-from src.game.game import Game
+from src.game.game import Game, StepResult
 from src.game.snake import Snake
 from src.game.food import SimpleFood, SuperFood
 from src.game.direction import Direction
@@ -59,8 +63,7 @@ class TestGame(unittest.TestCase):
         self.assertEqual(self.game.steps_elapsed, 0)
         self.assertEqual(len(self.game.snake), 3)
     
-    @patch('random.random', return_value=0.05)
-    def test_generate_superfood(self, mock_random):
+    def test_generate_superfood(self):
         """Test superfood generation."""
         # Set up conditions for superfood generation
         self.game.food_count = 1
@@ -68,7 +71,8 @@ class TestGame(unittest.TestCase):
         self.game.steps_elapsed = 5  # Ensure steps_elapsed >= 3 for food generation
         
         # Generate food
-        self.game._generate_or_update_food()
+        with patch.object(self.game.rng, "random", return_value=0.05):
+            self.game._generate_or_update_food()
         
         # Verify superfood was generated
         self.assertIsNotNone(self.game.current_food)
@@ -150,6 +154,133 @@ class TestGame(unittest.TestCase):
         # Verify game is over due to collision
         self.assertTrue(self.game.is_game_over)
         
+    def test_fast_step_result(self):
+        """Test the events reported by fast_step."""
+        head_pos = self.game.snake.get_head()
+        self.game.current_food = SimpleFood(board_dim=self.game_config["BOARD_DIM"])
+        self.game.current_food.position = (head_pos[0] + 1, head_pos[1])
+        self.game.current_food.active = True
+        self.game.is_food_active = True
+        
+        result = self.game.fast_step(1)
+        self.assertEqual(result, StepResult(steps_elapsed=1, is_game_over=False, collided=False,
+                                            ate_food=True, score_gained=self.game_config["SCORE"]["EAT_FOOD"]))
+        result = self.game.fast_step(0)
+        self.assertFalse(result.ate_food)
+        self.assertEqual(result.score_gained, 0)
+    
+    def test_get_info_is_lazy(self):
+        """Test that the game id and timestamp are only generated when read."""
+        with patch('src.game.game.uuid4') as mock_uuid4:
+            info = self.game.get_info()
+            self.assertEqual(info["score"], 0)
+            self.assertIn('game_id', info)
+            mock_uuid4.assert_not_called()
+            game_id = info["game_id"]
+            self.assertIs(info.get("game_id"), game_id)
+            mock_uuid4.assert_called_once()
+        self.assertIn('updated_at', info)
+        self.assertIsNone(info.get("missing"))
+        with self.assertRaises(KeyError):
+            info["missing"]
+    
+    def test_get_info_copies_lazy_fields(self):
+        """Test that copying, iterating or pickling the info includes the game id and timestamp."""
+        info = self.game.get_info()
+        copied = dict(info)
+        self.assertIn("game_id", copied)
+        self.assertIn("updated_at", copied)
+        self.assertEqual(copied["game_id"], info["game_id"])
+        self.assertEqual(set(info), set(info.keys()))
+        self.assertEqual(len(info), len(copied))
+        self.assertEqual(dict(info.items()), copied)
+        self.assertEqual({**info}, copied)
+        self.assertIn("game_id", repr(self.game.get_info()))
+        self.assertEqual(pickle.loads(pickle.dumps(info)), copied)
+        self.assertNotEqual(self.game.get_info(), self.game.get_info())
+    
+    def test_game_over_recorded(self):
+        """Test that a finished game goes to the results store, not the scores file."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            data_config = {
+                "HIGH_SCORE_FILE_PATH": Path(tmp_dir) / "high_score.txt",
+                "SCORES_FILE_PATH": Path(tmp_dir) / "scores.txt"
+            }
+            game = Game(game_config=self.game_config, data_config=data_config)
+            game.score = 25.0
+            game.snake.body = [(5, 5), (6, 5), (6, 6), (5, 6), (4, 6), (4, 5)]
+            game.snake.direction = Direction.DOWN
+            self.assertTrue(game.fast_step(0).is_game_over)
+            game.reset()
+            self.assertEqual(game.high_score, 25.0)
+            self.assertEqual(game.results_store.last_n(1)[0]["score"], 25.0)
+            self.assertFalse(data_config["SCORES_FILE_PATH"].exists())
+            game.results_store.close()
+        
+        unrecorded = Game(game_config=self.game_config, data_config=self.data_config, record_results=False)
+        self.assertIsNone(unrecorded.results_store)
+    
+    def test_snapshot_restore(self):
+        """Test that a restored game replays the same actions identically."""
+        self.game.reset(seed=42)
+        actions = [1, 1, 2, 2, 0, 3, 3, 4, 0, 1] * 3
+        for action in actions[:5]:
+            self.game.fast_step(action)
+        snapshot = self.game.snapshot()
+        
+        def play():
+            results = [self.game.fast_step(action) for action in actions]
+            return results, self.game.snake.get_body(), self.game.current_food.position, self.game.score
+        
+        first = play()
+        self.game.restore(snapshot)
+        self.assertEqual(self.game.snapshot(), snapshot)
+        self.assertEqual(play(), first)
+        
+        # Restoring also works after the game has been reset
+        self.game.reset()
+        self.game.restore(snapshot)
+        self.assertEqual(play(), first)
+    
+    def test_seeded_reset_ignores_previous_episode(self):
+        """Test that a seeded reset gives the same game however the last episode ended."""
+        def replay(food_active):
+            game = Game(game_config=self.game_config, data_config=self.data_config, record_results=False)
+            for action in [1, 2, 2, 3, 3]:
+                game.fast_step(action)
+            if not food_active:
+                game.is_food_active = False
+                game.current_food = None
+            self.assertEqual(game.is_food_active, food_active)
+            game.reset(seed=7)
+            self.assertIsNone(game.current_food)
+            foods = []
+            for action in [1, 0, 0, 2, 0, 0, 3, 0]:
+                game.fast_step(action)
+                foods.append(game.current_food.position if game.current_food else None)
+            foods.extend(game._spawn_food().position for _ in range(5))
+            return game.snake.get_body(), foods
+        
+        self.assertEqual(replay(food_active=True), replay(food_active=False))
+
+    def test_restore_leaves_global_random_alone(self):
+        """Test that restoring an unseeded game does not rewind the random module."""
+        game = Game(game_config=self.game_config, data_config=self.data_config, record_results=False)
+        snapshot = game.snapshot()
+        first = random.random()
+        game.restore(snapshot)
+        self.assertNotEqual(random.random(), first)
+        self.assertIsNot(game.rng, random)
+
+    def test_snapshot_is_immutable(self):
+        """Test that snapshots do not change when the game moves on."""
+        snapshot = self.game.snapshot()
+        self.game.fast_step(1)
+        self.assertEqual(snapshot.steps_elapsed, 0)
+        self.assertEqual(snapshot.snake.length, 3)
+        with self.assertRaises(AttributeError):
+            snapshot.score = 10
+    
     def test_get_state(self):
         """Test getting the game state."""
         state = self.game.get_state()
@@ -0,0 +1,43 @@
+"""
+Unit tests for the logging helpers.
+"""
+import unittest
+from unittest.mock import patch
+from src.utils import logger as logger_module
+from src.utils.logger import DebugSampler, debug_enabled, _level_for
+
+
+class TestLogger(unittest.TestCase):
+    """Test cases for per-module levels and sampled debug logging."""
+
+    def test_level_for_longest_prefix(self):
+        """Test that the longest configured module prefix wins."""
+        levels = {"": "INFO", "src.agent": "DEBUG", "src.agent.models": "WARNING"}
+        self.assertEqual(_level_for("src.game.env", levels), "INFO")
+        self.assertEqual(_level_for("src.agent.agents", levels), "DEBUG")
+        self.assertEqual(_level_for("src.agent.models", levels), "WARNING")
+        self.assertEqual(_level_for("src.agentx", levels), "INFO")
+
+    def test_debug_enabled(self):
+        """Test the debug gate against the module levels."""
+        levels = {"": "INFO", "src.agent": "DEBUG"}
+        with patch.dict(logger_module.module_levels, levels, clear=True):
+            debug_enabled.cache_clear()
+            try:
+                self.assertTrue(debug_enabled("src.agent.agents"))
+                self.assertFalse(debug_enabled("src.game.env"))
+            finally:
+                debug_enabled.cache_clear()
+
+    def test_debug_sampler(self):
+        """Test that one in every N calls is let through, and none while disabled."""
+        with patch.object(logger_module, "debug_enabled", return_value=True):
+            sampler = DebugSampler("src.game.ui", every=3)
+        self.assertEqual([sampler() for _ in range(7)], [True, False, False, True, False, False, True])
+        with patch.object(logger_module, "debug_enabled", return_value=False):
+            sampler = DebugSampler("src.game.ui", every=1)
+        self.assertFalse(any(sampler() for _ in range(3)))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,203 @@
+"""
+Unit tests for the NumPy observation renderers.
+"""
+import random
+import unittest
+import numpy as np
+from src.config import ConfigManager
+from src.game.game import Game
+from src.game.snake import Snake
+from src.game.food import SimpleFood, SuperFood
+from src.game.direction import Direction
+from src.game.ui import UI
+from src.game.observation import BoardRasterizer, GridEncoder, ObservationPreprocessor
+
+
+class TestBoardRasterizer(unittest.TestCase):
+    """Test cases for the BoardRasterizer class."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.config_manager = ConfigManager()
+        self.ui_config = self.config_manager.get_ui_config()
+        self.game_config = self.config_manager.get_game_config()
+        self.cell_size = self.ui_config["CELL_SIZE_IN_PIXELS"]
+        self.rasterizer = BoardRasterizer(self.ui_config)
+        self.snake = Snake(
+            board_dim=self.game_config["BOARD_DIM"],
+            init_pos=self.game_config["SNAKE"]["SNAKE_INIT_POS"],
+            init_length=self.game_config["SNAKE"]["SNAKE_INIT_LENGTH"],
+            init_direction=Direction[self.game_config["SNAKE"]["SNAKE_INIT_DIRECTION"]]
+        )
+
+    def _pygame_board(self, snake, food):
+        ui = UI(ui_config=self.ui_config, snake=snake, episode=1, food=food, score=0, high_score=0)
+        try:
+            _, board_rgb_array = ui.headless_render()
+        finally:
+            ui.close()
+        return board_rgb_array
+
+    def _assert_matches_pygame(self, snake, food):
+        expected = self._pygame_board(snake, food)
+        actual = self.rasterizer.render(snake, food)
+        self.assertEqual(actual.shape, expected.shape)
+        self.assertEqual(actual.dtype, np.uint8)
+        rows, cols = np.nonzero((actual != expected).any(axis=0))
+        if rows.size == 0:
+            return
+        # Only the food glyph may differ, and only inside the food cell
+        self.assertIsNotNone(food)
+        food_row = self.rasterizer.board_dim - 1 - food.position[1]
+        self.assertTrue(np.all(rows // self.cell_size == food_row))
+        self.assertTrue(np.all(cols // self.cell_size == food.position[0]))
+        self.assertLess(rows.size, self.cell_size ** 2 // 4)
+
+    def test_matches_pygame_without_food(self):
+        """Test that the board without food matches the pygame crop exactly."""
+        self._assert_matches_pygame(self.snake, None)
+
+    def test_matches_pygame_with_food(self):
+        """Test simple and super food on edge and inner cells."""
+        for food_cls, position in [(SimpleFood, (0, 0)), (SuperFood, (9, 9)), (SimpleFood, (3, 6))]:
+            food = food_cls(self.game_config["BOARD_DIM"]) if food_cls is SimpleFood \
+                else food_cls(self.game_config["BOARD_DIM"], lifetime=5)
+            food.position = position
+            food.active = True
+            self._assert_matches_pygame(self.snake, food)
+
+    def test_matches_pygame_during_play(self):
+        """Test random play, including wrap-around and growth."""
+        game = Game(game_config=self.game_config,
+                    data_config=self.config_manager.get_data_config())
+        rng = random.Random(7)
+        for step in range(60):
+            game.step(rng.choice([0, 0, 1, 2, 3, 4]))
+            if game.is_game_over:
+                game.reset()
+            if step % 10 == 0:
+                food = game.current_food if game.is_food_active else None
+                self._assert_matches_pygame(game.snake, food)
+
+    def test_render_into_buffer(self):
+        """Test rendering into a caller-provided buffer."""
+        out = np.zeros(self.rasterizer.shape, dtype=np.uint8)
+        result = self.rasterizer.render(self.snake, None, out=out)
+        self.assertIs(result, out)
+        self.assertTrue(out.any())
+        with self.assertRaises(ValueError):
+            self.rasterizer.render(self.snake, None, out=np.zeros((3, 10, 10), dtype=np.uint8))
+
+
+class TestObservationPreprocessor(unittest.TestCase):
+    """Test cases for the ObservationPreprocessor class."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.config_manager = ConfigManager()
+        self.ui_config = self.config_manager.get_ui_config()
+        self.board_dim = self.ui_config["BOARD_DIM"]
+        self.rasterizer = BoardRasterizer(self.ui_config)
+        self.snake = Snake(board_dim=self.board_dim, init_pos=(5, 5), init_length=3,
+                           init_direction=Direction.RIGHT)
+
+    def _cell(self, obs, n, pos):
+        row = self.board_dim - 1 - pos[1]
+        return obs[:, row * n:(row + 1) * n, pos[0] * n:(pos[0] + 1) * n].tobytes()
+
+    def test_cells_stay_distinguishable(self):
+        """Test that 3 pixels per cell, with or without palette, keep every cell kind apart."""
+        for food in (SimpleFood(board_dim=self.board_dim), SuperFood(board_dim=self.board_dim, lifetime=15)):
+            food.position, food.active = (0, 0), True
+            image = self.rasterizer.render(self.snake, food)
+            for palette in (False, True):
+                preprocessor = ObservationPreprocessor(self.ui_config, pixels_per_cell=3, palette=palette)
+                obs = preprocessor.apply(image)
+                self.assertEqual(obs.shape, (1 if palette else 3, 3 * self.board_dim, 3 * self.board_dim))
+                self.assertEqual(obs.dtype, np.uint8)
+                cells = [self._cell(obs, 3, pos) for pos in [(5, 5), (4, 5), (7, 7), (0, 0)]]
+                self.assertEqual(len(set(cells)), 4)
+                # Cells on the border look like any other empty cell
+                self.assertEqual(self._cell(obs, 3, (9, 9)), self._cell(obs, 3, (7, 7)))
+
+    def test_palette_indices(self):
+        """Test that palette indices point at the pixel colours."""
+        food = SimpleFood(board_dim=self.board_dim)
+        food.position, food.active = (2, 3), True
+        image = self.rasterizer.render(self.snake, food)
+        preprocessor = ObservationPreprocessor(self.ui_config, palette=True)
+        obs = preprocessor.apply(image)
+        self.assertEqual(obs.shape, (1, *image.shape[1:]))
+        palette = np.array(preprocessor.palette_colours, dtype=np.uint8)
+        np.testing.assert_array_equal(palette[obs[0]].transpose(2, 0, 1), image)
+
+    def test_apply_into_buffer(self):
+        """Test preprocessing into a caller-provided buffer."""
+        preprocessor = ObservationPreprocessor(self.ui_config, pixels_per_cell=2)
+        image = self.rasterizer.render(self.snake, None)
+        out = np.empty(preprocessor.shape, dtype=np.uint8)
+        self.assertIs(preprocessor.apply(image, out=out), out)
+        np.testing.assert_array_equal(out, image[:, 7::15, 7::15])
+        with self.assertRaises(ValueError):
+            preprocessor.apply(image, out=np.empty((3, 10, 10), dtype=np.uint8))
+        with self.assertRaises(ValueError):
+            ObservationPreprocessor(self.ui_config, pixels_per_cell=0)
+
+
+class TestGridEncoder(unittest.TestCase):
+    """Test cases for the GridEncoder class."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.board_dim = 10
+        self.encoder = GridEncoder(board_dim=self.board_dim, superfood_lifetime=10)
+        self.snake = Snake(board_dim=self.board_dim, init_pos=(5, 5), init_length=3,
+                           init_direction=Direction.RIGHT)
+
+    def test_planes(self):
+        """Test head, body and simple food planes."""
+        food = SimpleFood(board_dim=self.board_dim)
+        food.position = (1, 2)
+        food.active = True
+        obs = self.encoder.encode(self.snake, food)
+        self.assertEqual(obs.shape, (GridEncoder.NUM_CHANNELS, self.board_dim, self.board_dim))
+        self.assertEqual(obs.dtype, np.float32)
+        # Cell (x, y) sits at row BOARD_DIM - 1 - y, column x
+        self.assertEqual(obs[GridEncoder.HEAD_PLANE, 4, 5], 1.0)
+        self.assertEqual(obs[GridEncoder.HEAD_PLANE].sum(), 1.0)
+        self.assertEqual(obs[GridEncoder.BODY_PLANE, 4, 4], 1.0)
+        self.assertEqual(obs[GridEncoder.BODY_PLANE, 4, 3], 1.0)
+        self.assertEqual(obs[GridEncoder.BODY_PLANE].sum(), 2.0)
+        self.assertEqual(obs[GridEncoder.SIMPLE_FOOD_PLANE, 7, 1], 1.0)
+        self.assertEqual(obs[GridEncoder.SUPER_FOOD_PLANE].sum(), 0.0)
+        self.assertEqual(obs[GridEncoder.LIFETIME_PLANE].sum(), 0.0)
+
+    def test_super_food_lifetime(self):
+        """Test the superfood plane and the normalized lifetime plane."""
+        food = SuperFood(board_dim=self.board_dim, lifetime=10)
+        food.position = (0, 0)
+        food.active = True
+        food.remaining_steps = 4
+        obs = self.encoder.encode(self.snake, food)
+        self.assertEqual(obs[GridEncoder.SUPER_FOOD_PLANE, 9, 0], 1.0)
+        self.assertTrue(np.allclose(obs[GridEncoder.LIFETIME_PLANE], 0.4))
+
+    def test_encode_into_buffer(self):
+        """Test encoding into a caller-provided buffer."""
+        out = np.ones(self.encoder.shape, dtype=np.float32)
+        self.assertIs(self.encoder.encode(self.snake, None, out=out), out)
+        self.assertEqual(out.sum(), 3.0)
+        with self.assertRaises(ValueError):
+            self.encoder.encode(self.snake, None, out=np.zeros(self.encoder.shape, dtype=np.uint8))
+    
+    def test_body_age(self):
+        """Test that body segments are ordered by age."""
+        encoder = GridEncoder(board_dim=self.board_dim, superfood_lifetime=10, body_age=True)
+        obs = encoder.encode(self.snake, None)
+        self.assertEqual(obs[GridEncoder.BODY_PLANE, 4, 4], 1.0)
+        self.assertEqual(obs[GridEncoder.BODY_PLANE, 4, 3], 0.5)
+        self.assertEqual(obs[GridEncoder.BODY_PLANE, 4, 5], 0.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
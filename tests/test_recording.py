@@ -0,0 +1,140 @@
+"""
+Unit tests for episode recording and replay.
+"""
+import random
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+from src.config import ConfigManager
+from src.game.env import SnakeEnv
+from src.game.game import Game
+from src.game.recording import EpisodeRecorder, placed_food, read_episode, replay, render_episode
+
+try:
+    import PIL
+except ImportError:
+    PIL = None
+
+
+class TestRecording(unittest.TestCase):
+    """Test cases for recording, decoding and replaying episodes."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.config = ConfigManager()
+        self.game_config = self.config.get_game_config()
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.game = Game(game_config=self.game_config,
+                         data_config={"HIGH_SCORE_FILE_PATH": None},
+                         record_results=False)
+
+    def tearDown(self):
+        """Clean up after tests."""
+        self.tmp_dir.cleanup()
+
+    def _play(self, seed, steps=300):
+        """Play a seeded random game, recording it and every intermediate state."""
+        recorder = EpisodeRecorder(self.tmp_dir.name)
+        self.game.reset(seed=seed)
+        recorder.start(self.game, seed, episode=1)
+        states = [(self.game.snake.get_body(), self.game.score)]
+        rng = random.Random(seed)
+        for _ in range(steps):
+            food_before = self.game.current_food
+            action = rng.choice([0, 0, 1, 2, 3, 4])
+            result = self.game.fast_step(action)
+            recorder.record_step(action, placed_food(food_before, self.game.current_food))
+            states.append((self.game.snake.get_body(), self.game.score))
+            if result.is_game_over:
+                break
+        return recorder, states
+
+    def test_replay_matches_recorded_game(self):
+        """Test that replaying a log reproduces every recorded state."""
+        for seed in range(5):
+            recorder, states = self._play(seed)
+            log = read_episode(recorder.to_bytes())
+            self.assertEqual(log.seed, seed)
+            replayed = [(game.snake.get_body(), game.score) for game in replay(log, self.game_config)]
+            self.assertEqual(replayed, states)
+
+    def test_log_is_compact(self):
+        """Test that a step costs one byte, plus two per food placement."""
+        recorder, states = self._play(seed=3)
+        log = read_episode(recorder.to_bytes())
+        # 17-byte header, then a uint16 cell per initial segment
+        body_bytes = 2 * len(log.init_body)
+        self.assertEqual(len(recorder.to_bytes()),
+                         17 + body_bytes + len(log.actions) + 2 * len(log.placements))
+        self.assertEqual(len(log.actions), len(states) - 1)
+
+    def test_finish_writes_file(self):
+        """Test that finishing an episode writes one log file."""
+        recorder, _ = self._play(seed=1)
+        path = recorder.finish()
+        self.assertTrue(path.exists())
+        self.assertEqual(read_episode(path).actions, read_episode(path.read_bytes()).actions)
+        self.assertIsNone(recorder.finish())
+        with self.assertRaises(ValueError):
+            read_episode(b"XXXX" + path.read_bytes()[4:])
+
+    def test_env_records_episodes(self):
+        """Test that SnakeEnv writes a replayable log per episode when enabled."""
+        data_config = dict(self.config.get_data_config(), RECORDINGS_FOLDER_PATH=Path(self.tmp_dir.name))
+        with patch.dict(self.game_config, {"RECORD_EPISODES": True}), \
+                patch.object(self.config, "get_data_config", return_value=data_config):
+            env = SnakeEnv(app_config=self.config)
+        env.reset(seed=7)
+        for action in [1, 1, 4, 4, 3, 0, 0, 2]:
+            env.step(action)
+        body, score = env.game.snake.get_body(), env.game.score
+        env.close()
+        paths = list(Path(self.tmp_dir.name).glob("run_*/episode_000001.snkrec"))
+        self.assertEqual(len(paths), 1)
+        *_, final = replay(read_episode(paths[0]), self.game_config)
+        self.assertEqual((final.snake.get_body(), final.score), (body, score))
+
+    def test_env_replays_many_episodes(self):
+        """Test that many seeded env episodes replay to their final state, including food eaten as it appears."""
+        data_config = dict(self.config.get_data_config(), RECORDINGS_FOLDER_PATH=Path(self.tmp_dir.name))
+        with patch.dict(self.game_config, {"RECORD_EPISODES": True}), \
+                patch.object(self.config, "get_data_config", return_value=data_config):
+            env = SnakeEnv(app_config=self.config)
+        rng = random.Random(0)
+        finals = {}
+        for seed in range(300):
+            env.reset(seed=seed)
+            for _ in range(200):
+                _, _, terminated, _, _ = env.step(rng.choice([0, 1, 2, 3, 4]))
+                if terminated:
+                    break
+            finals[env.episodes_count] = (env.game.snake.get_body(), env.game.score, env.game.food_count)
+        env.close()
+        for episode, final_state in finals.items():
+            path, = Path(self.tmp_dir.name).glob(f"run_*/episode_{episode:06d}.snkrec")
+            *_, final = replay(read_episode(path), self.game_config)
+            self.assertEqual((final.snake.get_body(), final.score, final.food_count), final_state,
+                             f"Episode {episode} diverged")
+
+    def test_render_frames(self):
+        """Test re-rendering a recorded episode to PNG frames."""
+        recorder, states = self._play(seed=2, steps=5)
+        frames_dir = Path(self.tmp_dir.name) / "frames"
+        count = render_episode(read_episode(recorder.to_bytes()), self.game_config,
+                               self.config.get_ui_config(), frames_dir=frames_dir)
+        self.assertEqual(count, len(states))
+        self.assertEqual(len(list(frames_dir.glob("frame_*.png"))), len(states))
+
+    @unittest.skipIf(PIL is None, "Pillow is not installed")
+    def test_render_gif(self):
+        """Test re-rendering a recorded episode to a GIF."""
+        recorder, _ = self._play(seed=2, steps=5)
+        gif_path = Path(self.tmp_dir.name) / "episode.gif"
+        render_episode(read_episode(recorder.to_bytes()), self.game_config,
+                       self.config.get_ui_config(), gif_path=gif_path)
+        self.assertTrue(gif_path.exists())
+
+
+if __name__ == '__main__':
+    unittest.main()
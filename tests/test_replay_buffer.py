@@ -0,0 +1,356 @@
+"""
+Unit tests for the replay buffers.
+"""
+import random
+import tempfile
+import unittest
+from unittest.mock import patch
+import numpy as np
+import torch
+from src.agent.replay_buffer import (ArrayReplayBuffer, FrameReplayBuffer, MemmapReplayBuffer,
+                                     PrioritizedArrayReplayBuffer, PrioritizedFrameReplayBuffer,
+                                     PrioritizedMemmapReplayBuffer, SumTree)
+from src.config import ConfigManager
+from src.game.env import SnakeEnv
+from src.game.wrappers import FrameStack
+from src.utils.lazy_frames import LazyFrames
+
+
+class TestArrayReplayBuffer(unittest.TestCase):
+    """Test cases for the ArrayReplayBuffer class."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.shape = (3, 4, 4)
+        self.buffer = ArrayReplayBuffer(capacity=8, observation_shape=self.shape, seed=0)
+
+    def _obs(self, value):
+        return np.full(self.shape, value, dtype=np.uint8)
+
+    def test_push_and_wrap_around(self):
+        """Test the circular write index and the stored fields."""
+        for i in range(10):
+            self.buffer.push(self._obs(i), i % 5, self._obs(i + 1), float(i), i == 9)
+        self.assertEqual(len(self.buffer), 8)
+        # Entries 8 and 9 overwrote slots 0 and 1
+        self.assertEqual(self.buffer.states[0, 0, 0, 0], 8)
+        self.assertEqual(self.buffer.rewards[1], 9.0)
+        self.assertTrue(self.buffer.dones[1])
+        self.assertFalse(self.buffer.next_states[1].any())
+        self.assertEqual(self.buffer.states.dtype, np.uint8)
+
+    def test_sample_batch(self):
+        """Test that a sample is a consistent batch of tensors."""
+        for i in range(6):
+            self.buffer.push(self._obs(i), i % 5, None if i == 5 else self._obs(i + 1), float(i), i == 5)
+        batch = self.buffer.sample(32)
+        self.assertEqual(batch.states.shape, (32, *self.shape))
+        self.assertEqual(batch.states.dtype, torch.float32)
+        self.assertEqual(batch.actions.dtype, torch.int64)
+        self.assertEqual(batch.dones.dtype, torch.bool)
+        ids = batch.states[:, 0, 0, 0].long()
+        self.assertTrue(torch.all(ids < 6))
+        torch.testing.assert_close(batch.rewards, ids.float())
+        torch.testing.assert_close(batch.actions, ids % 5)
+        torch.testing.assert_close(batch.dones, ids == 5)
+        expected_next = torch.where(ids == 5, 0, ids + 1).float()
+        torch.testing.assert_close(batch.next_states[:, 0, 0, 0], expected_next)
+
+    def test_lazy_frames(self):
+        """Test that stacked observations are materialized into their slot."""
+        buffer = ArrayReplayBuffer(capacity=2, observation_shape=(2, 4, 4))
+        frames = [np.full((1, 4, 4), value, dtype=np.uint8) for value in (1, 2, 3)]
+        buffer.push(LazyFrames(frames[:2]), 1, LazyFrames(frames[1:]), 0.0, False)
+        np.testing.assert_array_equal(buffer.states[0], np.asarray(LazyFrames(frames[:2])))
+        np.testing.assert_array_equal(buffer.next_states[0], np.asarray(LazyFrames(frames[1:])))
+
+
+class TestFrameReplayBuffer(unittest.TestCase):
+    """Test cases for the FrameReplayBuffer class."""
+
+    def _play(self, buffer, frame_stack, episodes=6, max_steps=40):
+        """Play random GRID episodes through FrameStack, returning the pushed transitions and their count."""
+        config = ConfigManager()
+        with patch.dict(config.get_model_config(), {"OBSERVATION_MODE": "GRID"}):
+            env = FrameStack(SnakeEnv(app_config=config), frame_stack)
+        rng = random.Random(0)
+        transitions, pushes = set(), 0
+        for episode in range(episodes):
+            obs, _ = env.reset(seed=episode)
+            for step in range(max_steps):
+                action = rng.choice([0, 1, 2, 3, 4])
+                next_obs, reward, terminated, _, _ = env.step(action)
+                # Odd episodes end as terminal, even ones are truncated
+                terminated = terminated or (episode % 2 == 1 and step == max_steps - 1)
+                buffer.push(obs, action, next_obs, reward, terminated)
+                pushes += 1
+                next_state = np.zeros(obs.shape, np.float32) if terminated else np.asarray(next_obs)
+                transitions.add((np.asarray(obs).tobytes(), action, float(np.float32(reward)),
+                                 next_state.tobytes(), terminated))
+                obs = next_obs
+                if terminated:
+                    break
+            buffer.end_episode()
+        env.close()
+        return transitions, pushes
+
+    def _assert_rebuilds(self, buffer, transitions):
+        indices = np.nonzero(buffer.valid)[0]
+        self.assertEqual(len(indices), len(buffer))
+        batch = buffer.gather(indices)
+        for i in range(len(indices)):
+            transition = (batch.states[i].numpy().tobytes(), int(batch.actions[i]), float(batch.rewards[i]),
+                          batch.next_states[i].numpy().tobytes(), bool(batch.dones[i]))
+            self.assertTrue(transition in transitions, f"Slot {indices[i]} does not match a pushed transition")
+
+    def test_rebuilds_transitions(self):
+        """Test that sampled transitions match the pushed ones, across episodes and stacks."""
+        for frame_stack in (1, 3):
+            board_dim = ConfigManager().get_game_config()["BOARD_DIM"]
+            buffer = FrameReplayBuffer(capacity=1000, observation_shape=(5 * frame_stack, board_dim, board_dim),
+                                       observation_dtype=np.float32, frame_stack=frame_stack)
+            transitions, pushes = self._play(buffer, frame_stack)
+            self.assertEqual(len(buffer), pushes)
+            self._assert_rebuilds(buffer, transitions)
+            self.assertTrue(buffer.dones[buffer.valid].any())
+
+    def test_wrap_around(self):
+        """Test that overwritten frame history is never sampled."""
+        board_dim = ConfigManager().get_game_config()["BOARD_DIM"]
+        buffer = FrameReplayBuffer(capacity=37, observation_shape=(10, board_dim, board_dim),
+                                   observation_dtype=np.float32, frame_stack=2, seed=1)
+        transitions, _ = self._play(buffer, frame_stack=2)
+        self.assertLess(len(buffer), 37)
+        self._assert_rebuilds(buffer, transitions)
+        batch = buffer.sample(64)
+        self.assertEqual(batch.states.shape, (64, 10, board_dim, board_dim))
+
+    def test_stores_each_frame_once(self):
+        """Test that a continuing episode writes one frame per push."""
+        buffer = FrameReplayBuffer(capacity=10, observation_shape=(1, 2, 2))
+        frames = [np.full((1, 2, 2), value, dtype=np.uint8) for value in range(5)]
+        for step in range(4):
+            buffer.push(frames[step], 1, frames[step + 1], 0.0, False)
+        self.assertEqual(buffer._filled, 5)
+        self.assertEqual(len(buffer), 4)
+        with self.assertRaises(ValueError):
+            FrameReplayBuffer(capacity=10, observation_shape=(3, 2, 2), frame_stack=2)
+
+
+class TestPrioritizedReplayBuffer(unittest.TestCase):
+    """Test cases for the sum tree and the prioritized replay buffers."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.shape = (1, 2, 2)
+
+    def _obs(self, value):
+        return np.full(self.shape, value, dtype=np.uint8)
+
+    def _fill(self, buffer, count):
+        for i in range(count):
+            buffer.push(self._obs(i), 0, self._obs(i + 1), float(i), False)
+
+    def test_sum_tree(self):
+        """Test that batched updates keep the sums and prefix searches find the right leaves."""
+        tree = SumTree(5)
+        tree.update(np.arange(5), np.array([1.0, 2.0, 0.0, 3.0, 4.0]))
+        self.assertEqual(tree.total, 10.0)
+        np.testing.assert_array_equal(tree.find(np.array([0.5, 1.5, 2.9, 3.5, 6.0, 6.5, 9.99])),
+                                      [0, 1, 1, 3, 3, 4, 4])
+        tree.update(np.array([0, 0, 4]), np.array([5.0, 5.0, 0.0]))
+        self.assertEqual(tree.total, 10.0)
+        np.testing.assert_array_equal(tree.get(np.arange(5)), [5.0, 2.0, 0.0, 3.0, 0.0])
+
+    def test_samples_in_proportion_to_priority(self):
+        """Test that sampling frequencies follow the priorities."""
+        buffer = PrioritizedArrayReplayBuffer(capacity=4, observation_shape=self.shape, alpha=1.0,
+                                              epsilon=0.0, seed=0)
+        self._fill(buffer, 4)
+        buffer.update_priorities(np.arange(4), np.array([1.0, 2.0, 3.0, 4.0]))
+        counts = np.bincount(buffer.sample_indices(100_000), minlength=4)
+        np.testing.assert_allclose(counts / counts.sum(), [0.1, 0.2, 0.3, 0.4], atol=0.01)
+
+    def test_importance_weights_and_annealing(self):
+        """Test the importance-sampling weights and the annealing of beta."""
+        buffer = PrioritizedArrayReplayBuffer(capacity=8, observation_shape=self.shape, alpha=1.0, epsilon=0.0,
+                                              beta_start=0.5, beta_steps=2, seed=0)
+        self._fill(buffer, 2)
+        buffer.update_priorities(np.arange(2), np.array([1.0, 3.0]))
+        batch = buffer.sample(64)
+        self.assertEqual(len(batch.indices), 64)
+        ids = batch.states[:, 0, 0, 0].long().numpy()
+        np.testing.assert_array_equal(ids, batch.indices)
+        # P = (0.25, 0.75), N = 2: weights (0.5 ** -0.5, 1.5 ** -0.5) normalized by the largest
+        expected = np.where(ids == 0, 1.0, np.sqrt(0.5 / 1.5))
+        np.testing.assert_allclose(batch.weights.numpy(), expected, rtol=1e-6)
+        self.assertEqual(buffer.beta, 0.75)
+        buffer.sample(1)
+        buffer.sample(1)
+        self.assertEqual(buffer.beta, 1.0)
+
+    def test_new_transitions_get_max_priority(self):
+        """Test that new transitions get the largest priority seen so far."""
+        buffer = PrioritizedArrayReplayBuffer(capacity=4, observation_shape=self.shape, alpha=1.0, epsilon=0.0)
+        self._fill(buffer, 2)
+        buffer.update_priorities(np.array([0, 1]), np.array([-5.0, 0.5]))
+        self._fill(buffer, 1)
+        np.testing.assert_array_equal(buffer.tree.get(np.arange(4)), [5.0, 0.5, 5.0, 0.0])
+
+    def test_frame_buffer_skips_overwritten_history(self):
+        """Test that transitions whose frames were overwritten lose their priority."""
+        buffer = PrioritizedFrameReplayBuffer(capacity=6, observation_shape=(2, 2, 2), frame_stack=2, seed=0)
+        frames = [np.full((1, 2, 2), value, dtype=np.uint8) for value in range(10)]
+        for step in range(8):
+            buffer.push(LazyFrames(frames[step:step + 2]), 1, LazyFrames(frames[step + 1:step + 3]), 0.0, False)
+        np.testing.assert_array_equal(buffer.tree.get(np.arange(6)) > 0, buffer.valid)
+        indices = buffer.sample_indices(1000)
+        self.assertTrue(buffer.valid[indices].all())
+
+
+class TestMemmapReplayBuffer(unittest.TestCase):
+    """Test cases for the MemmapReplayBuffer class."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.shape = (3, 4, 4)
+
+    def tearDown(self):
+        """Clean up after tests."""
+        self.tmp_dir.cleanup()
+
+    def _obs(self, value):
+        return np.full(self.shape, value, dtype=np.uint8)
+
+    def _buffer(self, buffer_class=MemmapReplayBuffer, **kwargs):
+        return buffer_class(capacity=8, observation_shape=self.shape, folder=self.tmp_dir.name, seed=0, **kwargs)
+
+    def _fill(self, buffer, count):
+        for i in range(count):
+            buffer.push(self._obs(i), i % 5, self._obs(i + 1), float(i), i == count - 1)
+        buffer.end_episode()
+
+    def test_matches_array_buffer(self):
+        """Test that the memory-mapped buffer stores and samples like the in-memory one."""
+        buffer = self._buffer()
+        reference = ArrayReplayBuffer(capacity=8, observation_shape=self.shape, seed=0)
+        for i in range(11):
+            for b in (buffer, reference):
+                b.push(self._obs(i), i % 5, self._obs(i + 1), float(i), i % 4 == 3)
+        self.assertEqual(len(buffer), len(reference))
+        indices = np.array([7, 0, 3, 3, 5, 1])
+        for field, expected in zip(buffer.gather(indices), reference.gather(indices)):
+            torch.testing.assert_close(field, expected)
+        self.assertEqual(buffer.sample(16).states.shape, (16, *self.shape))
+
+    def test_survives_restart(self):
+        """Test that a reopened folder resumes the saved transitions."""
+        buffer = self._buffer()
+        self._fill(buffer, 5)
+        expected = buffer.gather(np.arange(5))
+        buffer.close()
+        del buffer
+
+        reopened = self._buffer()
+        self.assertEqual(len(reopened), 5)
+        for field, value in zip(reopened.gather(np.arange(5)), expected):
+            torch.testing.assert_close(field, value)
+        reopened.push(self._obs(9), 1, self._obs(10), 1.0, False)
+        self.assertEqual(reopened.states[5, 0, 0, 0], 9)
+
+    def test_rejects_other_layout(self):
+        """Test that a folder written with another layout is not overwritten."""
+        self._fill(self._buffer(), 2)
+        with self.assertRaises(ValueError):
+            MemmapReplayBuffer(capacity=16, observation_shape=self.shape, folder=self.tmp_dir.name)
+
+    def test_prioritized_resume(self):
+        """Test that restored transitions can be sampled with priorities."""
+        self._fill(self._buffer(), 4)
+        buffer = self._buffer(PrioritizedMemmapReplayBuffer)
+        self.assertEqual(buffer.tree.total, 4.0)
+        batch = buffer.sample(32)
+        np.testing.assert_array_equal(batch.states[:, 0, 0, 0].long().numpy(), batch.indices)
+
+
+class TestNStepReturns(unittest.TestCase):
+    """Test cases for n-step returns computed at sample time."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.gamma = 0.5
+        # (episode length, ends terminal): truncated, terminal, truncated, then one still running
+        self.episodes = [(5, False), (2, True), (1, False), (3, None)]
+
+    def tearDown(self):
+        """Clean up after tests."""
+        self.tmp_dir.cleanup()
+
+    def _fill(self, buffer):
+        """Push the episodes, frame values counting up, returning (reward, terminal, episode end) per push."""
+        pushes, value = [], 0
+        for length, terminal in self.episodes:
+            frames = [np.full((1, 2, 2), value + step, dtype=np.uint8) for step in range(length + 1)]
+            for step in range(length):
+                done = bool(terminal) and step == length - 1
+                reward = float(value + step + 1)
+                buffer.push(frames[step], 0, frames[step + 1], reward, done)
+                pushes.append((reward, done, step == length - 1 and terminal is not None))
+            if terminal is not None:
+                buffer.end_episode()
+            value += length + 1
+        return pushes
+
+    def _expected(self, pushes, start, n_step):
+        """Reference n-step return, bootstrap discount and terminal flag of the push at ``start``."""
+        total, discount = 0.0, 1.0
+        for reward, done, episode_end in pushes[start:start + n_step]:
+            total += discount * reward
+            discount *= self.gamma
+            if done or episode_end:
+                break
+        return total, discount, done
+
+    def _assert_n_step(self, buffer, n_step):
+        pushes = self._fill(buffer)
+        # The frame buffer leaves a slot for each episode's last frame, so go by occupied slots in push order
+        indices = buffer.occupied_slots()
+        self.assertEqual(len(indices), len(pushes))
+        batch = buffer.gather(indices)
+        for i in range(len(pushes)):
+            reward, discount, done = self._expected(pushes, i, n_step)
+            self.assertAlmostEqual(float(batch.rewards[i]), reward, places=5)
+            self.assertAlmostEqual(float(batch.discounts[i]), discount)
+            self.assertEqual(bool(batch.dones[i]), done)
+        return batch
+
+    def test_array_buffer(self):
+        """Test that returns stop at terminal transitions, episode ends and the newest push."""
+        for n_step in (2, 3, 6):
+            buffer = ArrayReplayBuffer(capacity=16, observation_shape=(1, 2, 2), n_step=n_step, gamma=self.gamma)
+            batch = self._assert_n_step(buffer, n_step)
+            # Next state of the first transition is n steps ahead within its 5-step episode
+            self.assertEqual(int(batch.next_states[0, 0, 0, 0]), min(n_step, 5))
+
+    def test_frame_and_memmap_buffers(self):
+        """Test that the frame and memory-mapped buffers give the same returns."""
+        frame_buffer = FrameReplayBuffer(capacity=32, observation_shape=(1, 2, 2), n_step=3, gamma=self.gamma)
+        frame_batch = self._assert_n_step(frame_buffer, 3)
+        memmap_buffer = MemmapReplayBuffer(capacity=16, observation_shape=(1, 2, 2), n_step=3, gamma=self.gamma,
+                                           folder=self.tmp_dir.name)
+        memmap_batch = self._assert_n_step(memmap_buffer, 3)
+        torch.testing.assert_close(frame_batch.next_states, memmap_batch.next_states)
+
+    def test_one_step_default(self):
+        """Test that one-step buffers leave the discount to the agent."""
+        buffer = ArrayReplayBuffer(capacity=16, observation_shape=(1, 2, 2))
+        pushes = self._fill(buffer)
+        batch = buffer.gather(np.arange(len(pushes)))
+        self.assertIsNone(batch.discounts)
+        torch.testing.assert_close(batch.rewards, torch.tensor([reward for reward, _, _ in pushes]))
+
+
+if __name__ == '__main__':
+    unittest.main()
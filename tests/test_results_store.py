@@ -0,0 +1,86 @@
+"""
+Unit tests for the ResultsStore class.
+"""
+import sqlite3
+import tempfile
+import unittest
+from pathlib import Path
+from src.game.results_store import ResultsStore, results_db_path, read_high_score
+
+
+class TestResultsStore(unittest.TestCase):
+    """Test cases for the ResultsStore class."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.db_path = Path(self.tmp_dir.name) / "results.db"
+        self.high_score_path = Path(self.tmp_dir.name) / "high_score.txt"
+        self.store = ResultsStore(self.db_path, high_score_path=self.high_score_path,
+                                  run_id="run_a", flush_interval=0.05)
+
+    def tearDown(self):
+        """Clean up after tests."""
+        self.store.close()
+        self.tmp_dir.cleanup()
+
+    def _record(self, store, score, steps=10):
+        store.record({"steps_elapsed": steps, "food_count": int(score // 10), "score": score})
+
+    def test_nothing_written_before_first_result(self):
+        """Test that a store without results creates no files."""
+        self.assertEqual(self.store.high_score, 0)
+        self.assertEqual(self.store.last_n(), [])
+        self.assertEqual(self.store.percentiles(), {})
+        self.assertFalse(self.db_path.exists())
+
+    def test_record_and_last_n(self):
+        """Test that results are written in order and returned newest first."""
+        for score in [10.0, 30.0, 20.0]:
+            self._record(self.store, score)
+        last = self.store.last_n(2)
+        self.assertEqual([row["score"] for row in last], [20.0, 30.0])
+        self.assertEqual(last[0]["run_id"], "run_a")
+        with sqlite3.connect(self.db_path) as connection:
+            self.assertEqual(connection.execute("SELECT COUNT(*) FROM results").fetchone()[0], 3)
+
+    def test_high_score_cached_and_persisted(self):
+        """Test the in-memory high score and its write-back to the legacy file."""
+        self.high_score_path.write_text("15.0", encoding="utf-8")
+        store = ResultsStore(self.db_path, high_score_path=self.high_score_path, flush_interval=0.05)
+        self.assertEqual(store.high_score, 15.0)
+        self._record(store, 40.0)
+        self.assertEqual(store.high_score, 40.0)
+        store.flush()
+        self.assertEqual(read_high_score(self.high_score_path), 40.0)
+        store.close()
+        # A new store picks up the best score already in the database
+        self.high_score_path.unlink()
+        reopened = ResultsStore(self.db_path)
+        self.assertEqual(reopened.high_score, 40.0)
+
+    def test_percentiles_and_best_by_run(self):
+        """Test the query API across runs."""
+        for score in range(0, 110, 10):
+            self._record(self.store, float(score))
+        other = ResultsStore(self.db_path, run_id="run_b", flush_interval=0.05)
+        self._record(other, 500.0)
+        other.close()
+        self.assertEqual(self.store.percentiles((50,), run_id="run_a"), {50: 50.0})
+        self.assertEqual(self.store.best_by_run(), {"run_a": 100.0, "run_b": 500.0})
+
+    def test_shared_per_path(self):
+        """Test that games using one database share one store."""
+        first = ResultsStore.for_path(self.db_path)
+        self.assertIs(ResultsStore.for_path(str(self.db_path)), first)
+        first.close()
+
+    def test_results_db_path(self):
+        """Test the database path fallback to the scores file."""
+        self.assertEqual(results_db_path({"SCORES_FILE_PATH": "data/scores.txt"}), Path("data/scores.db"))
+        self.assertEqual(results_db_path({"SCORES_FILE_PATH": "data/scores.txt", "RESULTS_DB_PATH": "r.db"}),
+                         Path("r.db"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -36,6 +36,12 @@ class TestSnake(unittest.TestCase):
         self.assertEqual(self.snake.get_body()[0], self.init_pos)
         self.assertEqual(self.snake.get_body()[1], (self.init_pos[0] - 1, self.init_pos[1]))
         self.assertEqual(self.snake.get_body()[2], (self.init_pos[0] - 2, self.init_pos[1]))
+        # The property is a copy, so in-place edits must fail instead of being lost
+        self.assertEqual(self.snake.body, tuple(self.snake.get_body()))
+        with self.assertRaises((AttributeError, TypeError)):
+            self.snake.body.append((0, 0))
+        with self.assertRaises(TypeError):
+            self.snake.body[0] = (0, 0)
     
     def test_movement(self):
         """Test snake movement."""
@@ -83,6 +89,70 @@ class TestSnake(unittest.TestCase):
         self.snake.body = [(0, 0), (1, 0), (1, 1), (0, 1), (0, 0)]
         self.assertTrue(self.snake.check_collision())
     
+    def test_no_collision_with_vacated_tail(self):
+        """Test that moving into the cell the tail just left is not a collision."""
+        self.snake.body = [(1, 0), (1, 1), (0, 1), (0, 0)]
+        self.snake.direction = Direction.LEFT
+        self.snake.move()
+        self.assertEqual(self.snake.get_head(), (0, 0))
+        self.assertFalse(self.snake.check_collision())
+
+    def test_collision_when_growing_into_tail(self):
+        """Test that the tail cell stays occupied while the snake grows."""
+        self.snake.body = [(1, 0), (1, 1), (0, 1), (0, 0)]
+        self.snake.direction = Direction.LEFT
+        self.snake.growth_pending = True
+        self.snake.move()
+        self.assertTrue(self.snake.check_collision())
+        self.assertEqual(len(self.snake), 5)
+
+    def test_occupancy_tracks_body(self):
+        """Test that the occupancy grid matches the body after many moves."""
+        for i in range(50):
+            self.snake.growth_pending = i % 7 == 0
+            self.snake.set_direction([Direction.UP, Direction.RIGHT, Direction.DOWN][i % 3])
+            self.snake.move()
+        occupied = {(cell // self.board_dim, cell % self.board_dim)
+                    for cell, count in enumerate(self.snake.occupancy) if count}
+        self.assertEqual(occupied, set(self.snake.get_body()))
+        self.assertEqual(sum(self.snake.occupancy), len(self.snake))
+        free = {(cell // self.board_dim, cell % self.board_dim)
+                for cell in range(self.board_dim ** 2) if cell in self.snake.free_cells}
+        self.assertEqual(len(self.snake.free_cells), self.board_dim ** 2 - len(occupied))
+        self.assertFalse(free & occupied)
+
+    def test_changed_since(self):
+        """Test that the changed cells cover the moved head, old head and vacated tail."""
+        version = self.snake.body_version()
+        self.assertEqual(self.snake.changed_since(version), [])
+        before = set(self.snake.get_body())
+        for i in range(4):
+            self.snake.growth_pending = i == 1
+            self.snake.set_direction([Direction.UP, Direction.RIGHT][i % 2])
+            self.snake.move()
+        changed = set(self.snake.changed_since(version))
+        self.assertEqual(changed, (before ^ set(self.snake.get_body())) | {self.init_pos})
+        self.snake.body = self.snake.get_body()
+        self.assertIsNone(self.snake.changed_since(version))
+
+    def test_snapshot_restore(self):
+        """Test that restoring a snapshot rewinds body, grids and flags."""
+        snapshot = self.snake.snapshot()
+        body = self.snake.get_body()
+        free = len(self.snake.free_cells)
+        self.snake.growth_pending = True
+        self.snake.set_direction(Direction.UP)
+        for _ in range(3):
+            self.snake.move()
+        self.snake.restore(snapshot)
+        self.assertEqual(self.snake.get_body(), body)
+        self.assertEqual(self.snake.direction, self.init_direction)
+        self.assertFalse(self.snake.growth_pending)
+        self.assertEqual(len(self.snake.free_cells), free)
+        self.assertEqual(sum(self.snake.occupancy), len(body))
+        self.snake.move()
+        self.assertEqual(len(self.snake), len(body))
+    
     def test_kill(self):
         """Test killing the snake."""
         self.snake.kill()
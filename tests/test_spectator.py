@@ -0,0 +1,80 @@
+"""
+Unit tests for the out-of-process spectator.
+"""
+import unittest
+from unittest.mock import MagicMock, patch
+from src.config import ConfigManager
+from src.game.env import SnakeEnv
+from src.game.game import Game
+from src.game.spectator import Spectator, SpectatorFrame, _frame_food
+
+
+class TestSpectator(unittest.TestCase):
+    """Test cases for the Spectator class."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.config = ConfigManager()
+        self.game_config = self.config.get_game_config()
+        self.ui_config = self.config.get_ui_config()
+        self.game = Game(game_config=self.game_config,
+                         data_config={"HIGH_SCORE_FILE_PATH": None},
+                         record_results=False)
+        self.game.reset(seed=3)
+
+    def test_frame_from_game(self):
+        """Test that a frame carries the board state and rebuilds the food."""
+        self.assertFalse(_frame_food(SpectatorFrame.from_game(self.game, episode=4), self.game_config).active)
+        # Food appears from the third step on
+        for _ in range(3):
+            self.game.fast_step(1)
+        frame = SpectatorFrame.from_game(self.game, episode=4)
+        self.assertEqual(frame.episode, 4)
+        self.assertEqual(list(frame.body), self.game.snake.get_body())
+        food = _frame_food(frame, self.game_config)
+        self.assertEqual(food.active, self.game.current_food.active)
+        self.assertEqual(food.position, self.game.current_food.position)
+        self.assertEqual(type(food), type(self.game.current_food))
+
+    def test_drops_frames_when_full(self):
+        """Test that a stalled viewer makes publish drop new frames, never block."""
+        spectator = Spectator(self.ui_config, self.game_config, queue_size=2)
+        spectator._process = MagicMock(is_alive=MagicMock(return_value=True))
+        put = spectator._queue.put
+        with patch.object(spectator._queue, "put", wraps=put) as mock_put, \
+                patch.object(spectator._queue, "get", side_effect=AssertionError("publish must not wait")):
+            for episode in range(1, 6):
+                spectator.publish(SpectatorFrame.from_game(self.game, episode))
+        self.assertTrue(all(call.args[1:] == (False,) for call in mock_put.call_args_list))
+        self.assertEqual(spectator.dropped, 3)
+        episodes = [spectator._queue.get(timeout=1).episode for _ in range(2)]
+        self.assertEqual(episodes, [1, 2])
+        spectator._process = None
+        spectator._queue.close()
+
+    def test_viewer_process(self):
+        """Test that the viewer process starts with the first frame and stops on close."""
+        spectator = Spectator(self.ui_config, self.game_config, fps=0)
+        for _ in range(5):
+            spectator.publish(SpectatorFrame.from_game(self.game, episode=1))
+            self.game.fast_step(0)
+        self.assertTrue(spectator.alive)
+        spectator.close()
+        self.assertFalse(spectator.alive)
+
+    def test_env_publishes_in_spectator_mode(self):
+        """Test that SPECTATOR mode never opens a window in the learner process."""
+        with patch.dict(self.game_config, {"RENDER_MODE": "SPECTATOR"}):
+            env = SnakeEnv(app_config=self.config)
+        self.assertTrue(env.headless)
+        with patch.object(env.spectator, "publish") as publish:
+            env.reset(seed=1)
+            env.step(1)
+            env.render()
+        publish.assert_called_once()
+        self.assertTrue(env.ui is None or env.ui.headless)
+        env.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,85 @@
+"""
+Unit tests for the SubprocVecEnv class.
+"""
+import unittest
+from unittest.mock import patch
+from multiprocessing import shared_memory
+import numpy as np
+from src.config import ConfigManager
+from src.game.subproc_vec_env import SubprocVecEnv
+
+
+class TestSubprocVecEnv(unittest.TestCase):
+    """Test cases for the SubprocVecEnv class."""
+
+    @classmethod
+    def setUpClass(cls):
+        """Set up class fixtures before any tests are run."""
+        cls.config = ConfigManager()
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.env = SubprocVecEnv(self.config, num_envs=3, seed=0, start_method="fork")
+
+    def tearDown(self):
+        """Clean up after tests."""
+        self.env.close()
+
+    def test_reset(self):
+        """Test that reset returns one observation per worker from shared memory."""
+        obs, infos = self.env.reset()
+        self.assertEqual(obs.shape, (3,) + self.env.observation_space.shape)
+        self.assertEqual(obs.dtype, self.env.observation_space.dtype)
+        self.assertEqual(len(infos), 3)
+        self.assertTrue(all(info["score"] == 0 for info in infos))
+        self.assertTrue(obs.any(axis=(1, 2, 3)).all())
+
+    def test_step(self):
+        """Test a batched step and that the previous batch stays intact."""
+        obs, _ = self.env.reset()
+        first = obs.copy()
+        next_obs, rewards, terminated, truncated, infos = self.env.step(np.ones(3, dtype=np.int64))
+        self.assertFalse(np.shares_memory(obs, next_obs))
+        np.testing.assert_array_equal(obs, first)
+        self.assertFalse(np.array_equal(next_obs, first))
+        self.assertEqual(rewards.shape, (3,))
+        self.assertFalse(terminated.any() or truncated.any())
+        self.assertEqual([info["steps_elapsed"] for info in infos], [1, 1, 1])
+
+    def test_workers_are_seeded_independently(self):
+        """Test that workers do not replay the same game."""
+        self.env.reset()
+        # Snakes move alike, so only food placed after the third step tells boards apart
+        for _ in range(5):
+            obs, _, _, _, _ = self.env.step(np.zeros(3, dtype=np.int64))
+        boards = {obs[env_idx].tobytes() for env_idx in range(3)}
+        self.assertGreater(len(boards), 1)
+
+    def test_auto_reset_with_episode_stats(self):
+        """Test truncation at MAX_TIMESTEPS_PER_EPISODE and the episode stats."""
+        self.env.close()
+        with patch.dict(self.config.get_training_config(), {"MAX_TIMESTEPS_PER_EPISODE": 2}):
+            self.env = SubprocVecEnv(self.config, num_envs=2, seed=0, start_method="fork")
+        self.env.reset()
+        _, _, _, truncated, infos = self.env.step(np.zeros(2, dtype=np.int64))
+        self.assertFalse(truncated.any())
+        self.assertNotIn("episode", infos[0])
+        _, rewards, terminated, truncated, infos = self.env.step(np.zeros(2, dtype=np.int64))
+        self.assertTrue(truncated.all())
+        self.assertFalse(terminated.any())
+        self.assertEqual(infos[0]["episode"]["l"], 2)
+        _, _, _, _, infos = self.env.step(np.zeros(2, dtype=np.int64))
+        self.assertEqual(infos[0]["steps_elapsed"], 1)
+
+    def test_close_releases_shared_memory(self):
+        """Test that close stops the workers and unlinks the shared block."""
+        name = self.env._shm.name
+        processes = self.env.processes
+        self.env.close()
+        self.assertTrue(all(not process.is_alive() for process in processes))
+        with self.assertRaises(FileNotFoundError):
+            shared_memory.SharedMemory(name=name)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -104,6 +104,112 @@ class TestUI(unittest.TestCase):
         """Test full rendering."""
         self.ui.full_render()
         mock_flip.assert_called_once()
+    
+    @patch('pygame.display.update')
+    @patch('pygame.display.flip')
+    def test_full_render_updates_dirty_cells(self, mock_flip, mock_update):
+        """Test that later frames only update the cells that changed."""
+        self.food.position = (0, 0)
+        self.ui.full_render()
+        self.snake.move()
+        self.ui.full_render()
+        mock_flip.assert_called_once()
+        dirty_rects = mock_update.call_args[0][0]
+        # New head, old head (now body) and old tail
+        self.assertEqual(len(dirty_rects), 3)
+        for rect in dirty_rects:
+            self.assertEqual(rect.size, (self.ui.cell_size, self.ui.cell_size))
+    
+    def test_incremental_render_matches_full_render(self):
+        """Test that dirty-cell frames match a frame drawn from scratch."""
+        self.ui.headless_render()
+        for action in [1, 2, 2, 3, 4, 4]:
+            self.snake.set_direction([Direction.RIGHT, Direction.DOWN, Direction.LEFT, Direction.UP][action - 1])
+            self.snake.move()
+        self.food.position = (1, 1)
+        self.ui.update_components(new_score=30, new_snake=self.snake, new_food=self.food)
+        window_rgb_array, _ = self.ui.headless_render()
+        
+        fresh_ui = UI(ui_config=self.ui_config, snake=self.snake, episode=1,
+                      food=self.food, score=30, high_score=0)
+        fresh_window_rgb_array, _ = fresh_ui.headless_render()
+        np.testing.assert_array_equal(window_rgb_array, fresh_window_rgb_array)
+
+    def test_incremental_board_matches_fresh_board(self):
+        """Test that dirty-cell board frames stay identical to fresh ones over a long game."""
+        game = Game(game_config=self.game_config, data_config={"HIGH_SCORE_FILE_PATH": None}, record_results=False)
+        game.reset(seed=3)
+        self.ui.reset(snake=game.snake, food=game.current_food, score=0, high_score=0, episode=2)
+        rng = np.random.default_rng(0)
+        for step in range(300):
+            game.fast_step(int(rng.integers(0, 5)))
+            if game.is_game_over:
+                break
+            self.ui.update_components(new_score=game.score, new_snake=game.snake, new_food=game.current_food)
+            board = self.ui.render_board()
+            if step % 50 == 0:
+                fresh_ui = UI(ui_config=self.ui_config, snake=game.snake, episode=2,
+                              food=game.current_food, score=game.score, high_score=0, headless=True)
+                np.testing.assert_array_equal(board, fresh_ui.render_board(), f"Step {step} differs")
+        self.assertGreater(game.food_count, 0)
+
+    def test_reset(self):
+        """Test that a reset renderer draws the new episode like a fresh UI."""
+        self.ui.headless_render()
+        new_snake = Snake(board_dim=self.game_config["BOARD_DIM"], init_pos=(2, 7), init_length=4,
+                          init_direction=Direction.UP)
+        self.ui.reset(snake=new_snake, food=None, score=0, high_score=50, episode=2)
+        window_rgb_array, board_rgb_array = self.ui.headless_render()
+        
+        fresh_ui = UI(ui_config=self.ui_config, snake=new_snake, episode=2,
+                      food=None, score=0, high_score=50)
+        fresh_window_rgb_array, _ = fresh_ui.headless_render()
+        np.testing.assert_array_equal(window_rgb_array, fresh_window_rgb_array)
+        np.testing.assert_array_equal(self.ui.render_board(), board_rgb_array)
+    
+    @patch('pygame.display.flip')
+    @patch('pygame.display.set_mode')
+    def test_headless_never_opens_window(self, mock_set_mode, mock_flip):
+        """Test that a headless UI renders without creating a display window."""
+        ui = UI(ui_config=self.ui_config, snake=self.snake, episode=1,
+                food=self.food, headless=True)
+        window_rgb_array, _ = ui.headless_render()
+        ui.render_board()
+        ui.full_render()
+        mock_set_mode.assert_not_called()
+        mock_flip.assert_not_called()
+        self.assertEqual(window_rgb_array.shape, (3, ui.window_height, ui.window_width))
+    
+    def test_render_board_matches_headless_crop(self):
+        """Test that the board-only render matches the board crop of the full window."""
+        for _ in range(4):
+            self.snake.move()
+            _, board_rgb_array = self.ui.headless_render()
+            np.testing.assert_array_equal(self.ui.render_board(), board_rgb_array)
+        self.food.position = (1, 1)
+        _, board_rgb_array = self.ui.headless_render()
+        np.testing.assert_array_equal(self.ui.render_board(), board_rgb_array)
+    
+    def test_render_board_into_buffer(self):
+        """Test rendering the board into a caller-provided buffer."""
+        out = np.zeros((3, self.ui.board_pixel_height, self.ui.board_pixel_width), dtype=np.uint8)
+        self.assertIs(self.ui.render_board(out=out), out)
+        _, board_rgb_array = self.ui.headless_render()
+        np.testing.assert_array_equal(out, board_rgb_array)
+        with self.assertRaises(ValueError):
+            self.ui.render_board(out=np.zeros((3, 10, 10), dtype=np.uint8))
+    
+    def test_glyphs_rendered_once(self):
+        """Test that fonts and food glyphs are cached across frames."""
+        with patch('pygame.font.SysFont', wraps=pygame.font.SysFont) as mock_sysfont:
+            for _ in range(5):
+                self.snake.move()
+                self.ui.render_board()
+                self.ui.headless_render()
+        font_keys = {call.args for call in mock_sysfont.call_args_list}
+        self.assertEqual(mock_sysfont.call_count, len(font_keys))
+        self.assertIs(self.ui._render_text("#", {"NAME": "Arial", "SIZE": 8}, "WHITE"),
+                      self.ui._render_text("#", {"NAME": "Arial", "SIZE": 8}, "WHITE"))
 
 
 def main():
@@ -0,0 +1,168 @@
+"""
+Unit tests for the VecSnakeEnv class.
+"""
+import random
+import unittest
+from unittest.mock import MagicMock
+import numpy as np
+from src.game.game import Game
+from src.game.grid import HEAD, BODY, SIMPLE_FOOD, SUPER_FOOD
+from src.game.vec_env import VecSnakeEnv
+
+
+class TestVecSnakeEnv(unittest.TestCase):
+    """Test cases for the VecSnakeEnv class."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.game_config = {
+            "BOARD_DIM": 10,
+            "SNAKE": {
+                "SNAKE_INIT_POS": (5, 5),
+                "SNAKE_INIT_LENGTH": 3,
+                "SNAKE_INIT_DIRECTION": "RIGHT"
+            },
+            "FOOD": {
+                "SUPERFOOD_PROBABILITY": 0.2,
+                "SUPERFOOD_LIFETIME": 15
+            },
+            "SCORE": {
+                "EAT_FOOD": 10.0,
+                "XPLIER_EAT_SUPERFOOD": 10.0
+            }
+        }
+        self.data_config = {
+            "HIGH_SCORE_FILE_PATH": "high_score.txt",
+            "SCORES_FILE_PATH": "scores.txt"
+        }
+        self.training_config = {
+            "MAX_TIMESTEPS_PER_EPISODE": 500,
+            "REWARDS": {
+                "NOTHING": 0.05,
+                "MOVE": -0.1,
+                "COLLIDE": -100.0
+            }
+        }
+        self.config = MagicMock()
+        self.config.get_game_config.return_value = self.game_config
+        self.config.get_training_config.return_value = self.training_config
+        self.env = VecSnakeEnv(self.config, num_envs=4, seed=0)
+
+    def test_reset(self):
+        """Test that reset puts every board in the initial Game state."""
+        obs, info = self.env.reset()
+        game = Game(game_config=self.game_config, data_config=self.data_config)
+        self.assertEqual(obs.shape, (4, 10, 10))
+        self.assertEqual(obs.dtype, np.uint8)
+        for env_idx in range(4):
+            self.assertEqual(self.env.get_body(env_idx), game.snake.get_body())
+        self.assertTrue(np.all(info["score"] == 0))
+        self.assertEqual(int((obs[0] == HEAD).sum()), 1)
+        self.assertEqual(int((obs[0] == BODY).sum()), 2)
+        # Head (5, 5) is drawn at row BOARD_DIM - 1 - y
+        self.assertEqual(obs[0, 4, 5], HEAD)
+
+    def test_moves_match_game(self):
+        """Test that boards move exactly like Game while no food is eaten."""
+        self.env.reset()
+        game = Game(game_config=self.game_config, data_config=self.data_config)
+        rng = random.Random(3)
+        for _ in range(40):
+            action = rng.randrange(5)
+            game.step(action)
+            self.env.step(np.full(4, action))
+            if game.score or game.is_game_over or self.env.scores[0] or self.env.steps_elapsed[0] == 0:
+                break
+            self.assertEqual(self.env.get_body(0), game.snake.get_body())
+
+    def test_opposite_action_ignored(self):
+        """Test that reversing onto the body is ignored, like Snake.set_direction."""
+        self.env.reset()
+        self.env.step(np.full(4, 3))  # LEFT while moving RIGHT
+        self.assertEqual(self.env.get_body(0)[0], (6, 5))
+
+    def test_eat_simple_food(self):
+        """Test score, reward and growth after eating simple food."""
+        self.env.reset()
+        self.env.food_active[:] = True
+        self.env.food_is_super[:] = False
+        self.env.food_pos[:] = (6, 5)
+        _, rewards, terminated, _, info = self.env.step(np.ones(4, dtype=np.int64))
+        self.assertTrue(np.all(info["score"] == 10.0))
+        self.assertTrue(np.allclose(rewards, 10.0 + self.training_config["REWARDS"]["MOVE"]))
+        self.assertFalse(terminated.any())
+        self.assertEqual(len(self.env.get_body(0)), 3)
+        self.env.step(np.ones(4, dtype=np.int64))
+        self.assertEqual(len(self.env.get_body(0)), 4)
+
+    def test_eat_super_food(self):
+        """Test the SuperFood score multiplier and countdown."""
+        self.env.reset()
+        self.env.steps_elapsed[:] = 5
+        self.env.food_active[:] = True
+        self.env.food_is_super[:] = True
+        self.env.food_remaining[:] = 4
+        self.env.food_pos[:] = (6, 5)
+        self.env.step(np.ones(4, dtype=np.int64))
+        # Countdown runs before the move: 10 * (1 + 3)
+        self.assertTrue(np.all(self.env.scores == 40.0))
+
+    def test_super_food_expires(self):
+        """Test that expired SuperFood is replaced on the following step."""
+        self.env.reset()
+        self.env.steps_elapsed[:] = 5
+        self.env.food_active[:] = True
+        self.env.food_is_super[:] = True
+        self.env.food_remaining[:] = 0
+        self.env.food_pos[:] = (0, 0)
+        self.env.step(np.zeros(4, dtype=np.int64))
+        self.assertFalse(self.env.food_active.any())
+        obs, _, _, _, _ = self.env.step(np.zeros(4, dtype=np.int64))
+        self.assertTrue(self.env.food_active.all())
+        self.assertTrue(np.all(((obs == SIMPLE_FOOD) | (obs == SUPER_FOOD)).sum(axis=(1, 2)) == 1))
+
+    def test_food_never_on_snake(self):
+        """Test that food is only placed on free cells."""
+        self.env.reset()
+        for _ in range(3):
+            self.env.step(np.zeros(4, dtype=np.int64))
+        for env_idx in range(4):
+            self.assertTrue(self.env.food_active[env_idx])
+            self.assertNotIn(tuple(self.env.food_pos[env_idx]), self.env.get_body(env_idx))
+
+    def test_collision_auto_resets(self):
+        """Test that a collided board reports termination and is reset."""
+        self.env.reset()
+        # Grow board 0 so it can bite itself
+        for _ in range(2):
+            self.env.food_active[0] = True
+            self.env.food_is_super[0] = False
+            head = self.env.get_body(0)[0]
+            self.env.food_pos[0] = ((head[0] + 1) % 10, head[1])
+            self.env.step(np.array([1, 0, 0, 0]))
+        self.env.food_active[:] = False
+        self.env.step(np.array([2, 0, 0, 0]))  # DOWN
+        self.env.step(np.array([3, 0, 0, 0]))  # LEFT
+        _, rewards, terminated, truncated, info = self.env.step(np.array([4, 0, 0, 0]))  # UP
+        self.assertTrue(terminated[0])
+        self.assertFalse(terminated[1:].any())
+        self.assertFalse(truncated.any())
+        self.assertLess(rewards[0], self.training_config["REWARDS"]["COLLIDE"] + 1)
+        self.assertEqual(info["score"][0], 20.0)
+        self.assertEqual(self.env.steps_elapsed[0], 0)
+        self.assertEqual(len(self.env.get_body(0)), 3)
+
+    def test_truncation(self):
+        """Test that boards are truncated at MAX_TIMESTEPS_PER_EPISODE."""
+        self.training_config["MAX_TIMESTEPS_PER_EPISODE"] = 2
+        env = VecSnakeEnv(self.config, num_envs=2, seed=0)
+        env.reset()
+        env.step(np.zeros(2, dtype=np.int64))
+        _, _, terminated, truncated, _ = env.step(np.zeros(2, dtype=np.int64))
+        self.assertTrue(truncated.all())
+        self.assertFalse(terminated.any())
+        self.assertTrue(np.all(env.steps_elapsed == 0))
+
+
+if __name__ == '__main__':
+    unittest.main()
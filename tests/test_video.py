@@ -0,0 +1,121 @@
+"""
+Unit tests for the background video recorder.
+"""
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+import numpy as np
+from src.config import ConfigManager
+from src.game.env import SnakeEnv
+from src.game.game import Game
+from src.game.spectator import SpectatorFrame
+from src.game.video import VideoRecorder, EpisodeSummary, HeadlessFrameRenderer, is_new_high_score, write_frames
+
+
+class TestVideoRecorder(unittest.TestCase):
+    """Test cases for the VideoRecorder class."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.config = ConfigManager()
+        self.game_config = self.config.get_game_config()
+        self.ui_config = self.config.get_ui_config()
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.game = Game(game_config=self.game_config,
+                         data_config={"HIGH_SCORE_FILE_PATH": None},
+                         record_results=False)
+
+    def tearDown(self):
+        """Clean up after tests."""
+        self.tmp_dir.cleanup()
+
+    def _play(self, recorder, episode, steps=6):
+        self.game.reset(seed=episode)
+        recorder.start_episode(self.game, episode)
+        for _ in range(steps):
+            self.game.fast_step(0)
+            recorder.capture(self.game)
+        return recorder.end_episode(self.game)
+
+    def test_every_nth_episode(self):
+        """Test that only every Nth episode captures frames and is encoded."""
+        recorder = VideoRecorder(self.ui_config, self.game_config, self.tmp_dir.name, every_n_episodes=2)
+        with patch.object(recorder, "_encode") as encode:
+            queued = [self._play(recorder, episode) for episode in range(1, 5)]
+            recorder.flush()
+        recorder.close()
+        self.assertEqual(queued, [False, True, False, True])
+        self.assertEqual([call.args[1] for call in encode.call_args_list], [2, 4])
+        # The reset state plus one frame per step
+        self.assertEqual(len(encode.call_args_list[0].args[2]), 7)
+
+    def test_predicate_and_max_frames(self):
+        """Test predicate selection at the episode end and the frame cap."""
+        recorder = VideoRecorder(self.ui_config, self.game_config, self.tmp_dir.name,
+                                 predicate=lambda summary: summary.episode == 3, max_frames=4)
+        with patch.object(recorder, "_encode") as encode:
+            queued = [self._play(recorder, episode) for episode in range(1, 4)]
+            recorder.flush()
+        recorder.close()
+        self.assertEqual(queued, [False, False, True])
+        frames = encode.call_args.args[2]
+        self.assertEqual(len(frames), 4)
+        self.assertEqual(frames[-1].body, tuple(self.game.snake.iter_body()))
+
+    def test_full_queue_skips_episode(self):
+        """Test that a busy encoder makes episodes be skipped, not waited for."""
+        recorder = VideoRecorder(self.ui_config, self.game_config, self.tmp_dir.name,
+                                 every_n_episodes=1, queue_size=1)
+        with patch.object(recorder, "_run"):
+            self._play(recorder, 1)
+            self.assertFalse(self._play(recorder, 2))
+        self.assertEqual(recorder.skipped, 1)
+
+    def test_is_new_high_score(self):
+        """Test the high score predicate."""
+        self.assertTrue(is_new_high_score(EpisodeSummary(1, 10, 20.0, 10.0)))
+        self.assertFalse(is_new_high_score(EpisodeSummary(1, 10, 10.0, 10.0)))
+        self.assertFalse(is_new_high_score(EpisodeSummary(1, 10, 0.0, 0.0)))
+
+    def test_write_frames(self):
+        """Test drawing frames headless to PNG files."""
+        self.game.reset(seed=1)
+        frames = [SpectatorFrame.from_game(self.game, 1)]
+        for _ in range(3):
+            self.game.fast_step(1)
+            frames.append(SpectatorFrame.from_game(self.game, 1))
+        renderer = HeadlessFrameRenderer(self.ui_config, self.game_config)
+        image = renderer.render(frames[-1])
+        self.assertEqual(image.dtype, np.uint8)
+        self.assertEqual(image.shape[2], 3)
+        frames_dir = Path(self.tmp_dir.name) / "frames"
+        self.assertEqual(write_frames(renderer, frames, frames_dir=frames_dir), 4)
+        self.assertEqual(len(list(frames_dir.glob("frame_*.png"))), 4)
+
+    def test_env_records_video(self):
+        """Test that SnakeEnv writes selected episodes in the background."""
+        data_config = dict(self.config.get_data_config(), VIDEOS_FOLDER_PATH=Path(self.tmp_dir.name))
+        with patch.dict(self.game_config, {"VIDEO": {"EVERY_N_EPISODES": 2}, "RENDER_MODE": "HEADLESS"}), \
+                patch.object(self.config, "get_data_config", return_value=data_config):
+            env = SnakeEnv(app_config=self.config)
+        for episode in range(2):
+            env.reset(seed=episode)
+            for action in [1, 1, 4]:
+                env.step(action)
+        env.close()
+        self.assertEqual(len(env.video.written), 1)
+        self.assertTrue(env.video.written[0].name.startswith("episode_000002"))
+        self.assertTrue(env.video.written[0].exists())
+
+
+    def test_env_skips_video_in_window_mode(self):
+        """Test that SnakeEnv never records videos while it may draw a window."""
+        with patch.dict(self.game_config, {"VIDEO": {"EVERY_N_EPISODES": 1}, "RENDER_MODE": "WINDOW"}):
+            env = SnakeEnv(app_config=self.config)
+        self.assertIsNone(env.video)
+        env.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,184 @@
+"""
+Unit tests for the environment wrappers.
+"""
+import unittest
+from unittest.mock import patch
+import numpy as np
+from src.config import ConfigManager
+from src.game.env import SnakeEnv
+from src.game.observation import ObservationPreprocessor, model_input_shape
+from src.game.wrappers import ActionRepeat, FrameStack, PreprocessObservation, make_env
+from src.utils.lazy_frames import LazyFrames
+
+
+class TestActionRepeat(unittest.TestCase):
+    """Test cases for the ActionRepeat wrapper."""
+
+    @classmethod
+    def setUpClass(cls):
+        """Set up class fixtures before any tests are run."""
+        cls.config = ConfigManager()
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.env = SnakeEnv(app_config=self.config)
+        self.reference = SnakeEnv(app_config=self.config)
+
+    def tearDown(self):
+        """Clean up after tests."""
+        self.env.close()
+        self.reference.close()
+
+    def test_repeat_matches_plain_steps(self):
+        """Test that one repeated step equals k plain steps, rewards summed."""
+        wrapped = ActionRepeat(self.env, repeat=3)
+        wrapped.reset(seed=4)
+        self.reference.reset(seed=4)
+        for action in [1, 4, 0, 3]:
+            obs, reward, terminated, truncated, info = wrapped.step(action)
+            expected_reward = 0.0
+            for _ in range(3):
+                expected_obs, step_reward, *_ = self.reference.step(action)
+                expected_reward += step_reward
+            self.assertEqual(info["ticks"], 3)
+            self.assertAlmostEqual(reward, expected_reward)
+            np.testing.assert_array_equal(obs, expected_obs)
+            self.assertFalse(terminated or truncated)
+
+    def test_stops_on_termination(self):
+        """Test that repetition stops on the tick the game ends."""
+        wrapped = ActionRepeat(self.env, repeat=4)
+        wrapped.reset(seed=0)
+        ticks = [(-1.0, False), (-100.0, True), (-1.0, False)]
+        with patch.object(self.env, "tick", side_effect=ticks) as tick, \
+                patch.object(self.env, "_get_obs", wraps=self.env._get_obs) as get_obs:
+            _, reward, terminated, _, info = wrapped.step(1)
+        self.assertTrue(terminated)
+        self.assertEqual(info["ticks"], 2)
+        self.assertEqual(tick.call_count, 2)
+        self.assertEqual(reward, -101.0)
+        get_obs.assert_called_once()
+
+    def test_truncates_at_tick_limit(self):
+        """Test that the episode is cut at the tick budget, mid-repeat."""
+        wrapped = ActionRepeat(self.env, repeat=4, max_episode_ticks=6)
+        wrapped.reset(seed=1)
+        _, _, _, truncated, info = wrapped.step(0)
+        self.assertFalse(truncated)
+        _, _, _, truncated, info = wrapped.step(0)
+        self.assertTrue(truncated)
+        self.assertEqual(info["ticks"], 2)
+        wrapped.reset(seed=1)
+        self.assertEqual(wrapped.episode_ticks, 0)
+
+    def test_make_env(self):
+        """Test that make_env only wraps when ACTION_REPEAT is above 1."""
+        training_config = self.config.get_training_config()
+        with patch.dict(training_config, {"ACTION_REPEAT": 1}):
+            self.assertIsInstance(make_env(self.config), SnakeEnv)
+        with patch.dict(training_config, {"ACTION_REPEAT": 2}):
+            env = make_env(self.config)
+        self.assertIsInstance(env, ActionRepeat)
+        self.assertEqual(env.max_episode_ticks, training_config["MAX_TIMESTEPS_PER_EPISODE"])
+        with self.assertRaises(ValueError):
+            ActionRepeat(self.env, repeat=0)
+
+
+class TestPreprocessObservation(unittest.TestCase):
+    """Test cases for the PreprocessObservation wrapper."""
+
+    @classmethod
+    def setUpClass(cls):
+        """Set up class fixtures before any tests are run."""
+        cls.config = ConfigManager()
+
+    def test_preprocessed_observations(self):
+        """Test that observations and the observation space are preprocessed."""
+        env = SnakeEnv(app_config=self.config)
+        preprocessor = ObservationPreprocessor(self.config.get_ui_config(), pixels_per_cell=3, palette=True)
+        wrapped = PreprocessObservation(env, preprocessor)
+        obs, _ = wrapped.reset(seed=3)
+        self.assertEqual(obs.shape, wrapped.observation_space.shape)
+        obs, *_ = wrapped.step(1)
+        np.testing.assert_array_equal(obs, preprocessor.apply(env._get_obs()))
+        wrapped.close()
+
+    def test_make_env_matches_input_shape(self):
+        """Test that the wrapped env produces the model input shape derived from the config."""
+        model_config = self.config.get_model_config()
+        ui_config = self.config.get_ui_config()
+        for overrides in ({}, {"PIXELS_PER_CELL": 3, "PALETTE": True, "FRAME_STACK": 2},
+                          {"OBSERVATION_MODE": "GRID", "FRAME_STACK": 3}):
+            with patch.dict(model_config, overrides):
+                env = make_env(self.config)
+                obs, _ = env.reset(seed=0)
+                self.assertEqual(np.asarray(obs).shape, model_input_shape(model_config, ui_config))
+                env.close()
+        with patch.dict(model_config, {"PIXELS_PER_CELL": 3, "PALETTE": True, "FRAME_STACK": 2}):
+            self.assertEqual(model_input_shape(model_config, ui_config), (2, 30, 30))
+
+
+class TestFrameStack(unittest.TestCase):
+    """Test cases for the FrameStack wrapper and LazyFrames."""
+
+    @classmethod
+    def setUpClass(cls):
+        """Set up class fixtures before any tests are run."""
+        cls.config = ConfigManager()
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.env = SnakeEnv(app_config=self.config)
+        self.wrapped = FrameStack(self.env, k=3)
+
+    def tearDown(self):
+        """Clean up after tests."""
+        self.wrapped.close()
+
+    def test_stacked_observation(self):
+        """Test the stacked shape and that the newest frame comes last."""
+        channels = self.env.observation_space.shape[0]
+        obs, _ = self.wrapped.reset(seed=2)
+        self.assertIsInstance(obs, LazyFrames)
+        self.assertEqual(obs.shape, self.wrapped.observation_space.shape)
+        self.assertEqual(obs.shape[0], 3 * channels)
+        first = np.asarray(obs)
+        np.testing.assert_array_equal(first[:channels], first[-channels:])
+        obs, *_ = self.wrapped.step(1)
+        np.testing.assert_array_equal(np.asarray(obs)[-channels:], self.env._get_obs())
+        np.testing.assert_array_equal(np.asarray(obs)[:channels], first[:channels])
+
+    def test_frames_shared_between_stacks(self):
+        """Test that consecutive stacks share frames instead of copying them."""
+        previous, _ = self.wrapped.reset(seed=2)
+        for action in [1, 1, 4]:
+            obs, *_ = self.wrapped.step(action)
+            for shared, old in zip(obs.frames[:-1], previous.frames[1:]):
+                self.assertIs(shared, old)
+            previous = obs
+        # Frames survive the env reusing its observation buffers
+        self.env.set_observation_buffers([np.zeros(self.env.observation_space.shape, np.uint8) for _ in range(2)])
+        obs, *_ = self.wrapped.step(0)
+        kept = np.asarray(obs).copy()
+        for _ in range(2):
+            self.wrapped.step(0)
+        np.testing.assert_array_equal(np.asarray(obs), kept)
+
+    def test_copy_to(self):
+        """Test materializing LazyFrames into a preallocated row."""
+        self.wrapped.reset(seed=5)
+        obs, *_ = self.wrapped.step(2)
+        row = np.empty(obs.shape, dtype=obs.dtype)
+        obs.copy_to(row)
+        np.testing.assert_array_equal(row, np.asarray(obs))
+
+    def test_make_env_stacks_frames(self):
+        """Test that make_env stacks frames when FRAME_STACK is above 1."""
+        with patch.dict(self.config.get_model_config(), {"FRAME_STACK": 4}):
+            env = make_env(self.config)
+        self.assertIsInstance(env, FrameStack)
+        self.assertEqual(env.k, 4)
+
+
+if __name__ == '__main__':
+    unittest.main()